@@ -1,49 +1,58 @@
+import os
 import streamlit as st
 from utils.session_state import initialize_session_state
-from utils.llm_handler import process_user_message
 from components.chat_interface import render_chat_interface
+from components.profiler_panel import render_profiler_panel
 from components.styling import apply_custom_styling
+from utils.metrics import start_metrics_server
+from utils.llm_backends import load_environment, warm_backend
+from utils.profiler import rerun_profiler
 
 def main():
-    # Set page configuration
-    st.set_page_config(
-        page_title="TalentScout Hiring Assistant",
-        page_icon="👨‍💼",
-        layout="centered",
-        initial_sidebar_state="collapsed"
-    )
+    # Read settings from .env (once per process)
+    load_environment()
     
-    # Apply custom styling to improve UI
-    apply_custom_styling()
-    
-    # Initialize session state for conversation management
-    initialize_session_state()
-    
-    # Page header
-    st.markdown("# 🤖 TalentScout Hiring Assistant")
-    st.markdown("""
-    Welcome to TalentScout's AI-powered Hiring Assistant. I'm here to help with the initial screening process 
-    for technology positions. Let's get started!
-    """)
-    
-    # Display chat interface
-    render_chat_interface()
-    
-    # Handle user input
-    if user_input := st.chat_input("Type your message here..."):
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": user_input})
+    # Time each phase of the rerun when profiling is enabled (TALENTSCOUT_PROFILE=1)
+    with rerun_profiler.rerun("full"):
+        with rerun_profiler.phase("page_setup"):
+            # Set page configuration
+            st.set_page_config(
+                page_title="TalentScout Hiring Assistant",
+                page_icon="👨‍💼",
+                layout="centered",
+                initial_sidebar_state="collapsed"
+            )
+            
+            # Expose LLM metrics for Prometheus if configured (started once per process)
+            metrics_port = os.getenv("TALENTSCOUT_METRICS_PORT")
+            if metrics_port:
+                start_metrics_server(int(metrics_port))
         
-        # Display user message
-        with st.chat_message("user"):
-            st.markdown(user_input)
+        # Apply custom styling to improve UI
+        with rerun_profiler.phase("styling"):
+            apply_custom_styling()
         
-        # Process user message and get AI response
-        with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                message_placeholder = st.empty()
-                # Process the message and display with typing effect
-                process_user_message(user_input, message_placeholder)
+        # Initialize session state for conversation management
+        with rerun_profiler.phase("session_state"):
+            initialize_session_state()
+        
+        # Page header
+        with rerun_profiler.phase("header"):
+            st.markdown("# 🤖 TalentScout Hiring Assistant")
+            st.markdown("""
+            Welcome to TalentScout's AI-powered Hiring Assistant. I'm here to help with the initial screening process 
+            for technology positions. Let's get started!
+            """)
+        
+        # Display chat interface and handle user input (the conversation reruns as a fragment)
+        render_chat_interface()
+        
+        # Load the LLM client in the background now that the page is up
+        with rerun_profiler.phase("warm_backend"):
+            warm_backend()
+    
+    # Rolling rerun percentiles, when profiling
+    render_profiler_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
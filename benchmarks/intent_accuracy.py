@@ -0,0 +1,110 @@
+"""Measure the local intent classifier against a labeled set of messages.
+
+Every message in the labeled set (JSONL with "message" and "intent", where
+intent is null for messages that belong to the normal conversation flow, and
+optionally the "state" it was sent in) is classified, and the overall accuracy, per-intent precision and recall, and
+every misclassified message are reported. The old substring exit check is
+scored on the same set for comparison.
+
+Usage:
+    python -m benchmarks.intent_accuracy
+    python -m benchmarks.intent_accuracy --samples my_samples.jsonl --min-accuracy 0.95
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from utils.constants import EXIT_KEYWORDS, INTENT_PRIORITY
+from utils.intents import classify_intent
+
+DEFAULT_SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_samples.jsonl")
+
+def load_samples(path: str) -> List[Dict]:
+    """Read labeled messages from a JSONL file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def substring_exit_check(message: str) -> Optional[str]:
+    """The substring matching check_exit_keywords used before the intent classifier."""
+    return "exit" if any(keyword in message.lower() for keyword in EXIT_KEYWORDS) else None
+
+def evaluate(samples: List[Dict]) -> Dict:
+    """Classify every sample and compute accuracy, precision and recall.
+
+    Args:
+        samples: Dictionaries with "message", "intent" and optionally "state"
+
+    Returns:
+        Overall and per-intent results plus the misclassified samples
+    """
+    started = time.perf_counter()
+    predictions = [classify_intent(sample["message"], sample.get("state")) for sample in samples]
+    elapsed = time.perf_counter() - started
+
+    per_intent = {}
+    for intent in INTENT_PRIORITY + [None]:
+        true_positives = sum(1 for sample, predicted in zip(samples, predictions) if predicted == intent == sample["intent"])
+        predicted_count = sum(1 for predicted in predictions if predicted == intent)
+        actual_count = sum(1 for sample in samples if sample["intent"] == intent)
+        per_intent[str(intent)] = {
+            "support": actual_count,
+            "precision": true_positives / predicted_count if predicted_count else None,
+            "recall": true_positives / actual_count if actual_count else None,
+        }
+
+    # Exit is the only intent the old check detected; any other label counts as "not exit"
+    legacy_errors = sum(
+        1 for sample in samples if substring_exit_check(sample["message"]) != ("exit" if sample["intent"] == "exit" else None)
+    )
+    errors = [
+        {"message": sample["message"], "expected": sample["intent"], "predicted": predicted}
+        for sample, predicted in zip(samples, predictions)
+        if predicted != sample["intent"]
+    ]
+    return {
+        "samples": len(samples),
+        "accuracy": 1 - len(errors) / len(samples),
+        "microseconds_per_message": elapsed / len(samples) * 1e6,
+        "per_intent": per_intent,
+        "legacy_exit_error_rate": legacy_errors / len(samples),
+        "errors": errors,
+    }
+
+def print_report(results: Dict) -> None:
+    """Print the evaluation results."""
+    print(f"{results['samples']} samples, accuracy {results['accuracy']:.1%}, "
+          f"{results['microseconds_per_message']:.1f}µs per message")
+    print(f"{'intent':<14} {'support':>7} {'precision':>9} {'recall':>7}")
+    for intent, scores in results["per_intent"].items():
+        precision = f"{scores['precision']:.1%}" if scores["precision"] is not None else "-"
+        recall = f"{scores['recall']:.1%}" if scores["recall"] is not None else "-"
+        print(f"{intent:<14} {scores['support']:>7} {precision:>9} {recall:>7}")
+    print(f"Old substring exit check: {results['legacy_exit_error_rate']:.1%} of samples misclassified for exit")
+    for error in results["errors"]:
+        print(f"MISCLASSIFIED {error['message']!r}: expected {error['expected']}, got {error['predicted']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", default=DEFAULT_SAMPLES, help="labeled JSONL messages")
+    parser.add_argument("--output", help="save the results as JSON")
+    parser.add_argument("--min-accuracy", type=float, help="exit with an error below this accuracy (0-1)")
+    args = parser.parse_args()
+
+    results = evaluate(load_samples(args.samples))
+    print_report(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.min_accuracy is not None and results["accuracy"] < args.min_accuracy:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Load test driving simulated candidates through the full screening flow.
+
+Each simulated candidate is a ScreeningSession taken from the greeting to
+conversation_end on a shared asyncio event loop, against the offline stub LLM
+backend with injected latency. Part of the candidates list stacks the question
+bank doesn't cover, so question generation is measured alongside bank lookups.
+Per-turn and per-session latency percentiles, throughput, LLM call counts,
+token usage and per-route model escalations are printed and saved as JSON. The run fails if any session doesn't reach
+conversation_end, since its turns would skew the per-state latencies.
+
+Usage:
+    python -m benchmarks.load_test --candidates 200 --latency lognormal:0.8:0.3
+    python -m benchmarks.load_test --generated-stack-ratio 1  # every candidate needs generated questions
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from utils import llm_handler
+from utils.cache import QuestionCache
+from utils.constants import TECH_POSITIONS, TECH_STACK_EXAMPLES
+from utils.engine import ScreeningSession
+from utils.llm_backends import LLMBackend, StubBackend, set_backend
+from utils.metrics import llm_metrics
+from utils.scheduler import LLMScheduler, set_scheduler
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+FIRST_NAMES = ["Aarav", "Priya", "Jane", "Carlos", "Mei", "Omar", "Sofia", "Liam"]
+LAST_NAMES = ["Sharma", "Doe", "Garcia", "Chen", "Haddad", "Rossi", "Smith", "Khan"]
+LOCATIONS = ["Bangalore, India", "Berlin, Germany", "New York, USA", "London, UK", "Toronto, Canada"]
+
+# Stacks the question bank covers not at all or only in part, so their questions are generated
+GENERATED_TECH_STACKS = [
+    "Kotlin, Ktor, Exposed", "Elixir, Phoenix, Ecto", "Rust, Actix, Tokio", "Scala, Akka, Cassandra",
+    "Swift, SwiftUI, Core Data", "Dart, Flutter, Firebase", "Python, Django, Elixir", "React, TypeScript, Kotlin",
+]
+
+class CountingBackend(LLMBackend):
+    """Wrap a backend and count calls and tokens."""
+
+    def __init__(self, inner: LLMBackend):
+        self.inner = inner
+        self.name = inner.name
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, model, temperature, max_tokens, **options):
+        response = self.inner.complete(messages, model, temperature, max_tokens, **options)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += response.prompt_tokens
+            self.completion_tokens += response.completion_tokens
+        return response
+
+    def stream(self, messages, model, temperature, max_tokens, **options):
+        with self._lock:
+            self.calls += 1
+        yield from self.inner.stream(messages, model, temperature, max_tokens, **options)
+
+def candidate_script(rng: random.Random, multi_field: bool, generated_stack: bool = False) -> List[str]:
+    """Build the messages one simulated candidate sends, from greeting to the end.
+
+    Args:
+        rng: Random generator for picking candidate details
+        multi_field: Whether the candidate pastes all their details in one message
+        generated_stack: Whether the candidate's stack is one the question bank
+            doesn't fully cover, so their questions need the LLM
+
+    Returns:
+        Messages in the order they are sent
+    """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    email = f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com"
+    phone = f"+{rng.randint(1, 99)} {rng.randint(1000, 9999)} {rng.randint(100000, 999999)}"
+    experience = f"{rng.randint(1, 15)} years"
+    position = rng.choice(TECH_POSITIONS)
+    location = rng.choice(LOCATIONS)
+    tech_stack = rng.choice(GENERATED_TECH_STACKS if generated_stack else TECH_STACK_EXAMPLES)
+    answers = [f"My answer to question {i + 1} would cover the trade-offs involved." for i in range(5)]
+
+    if multi_field:
+        intake = [f"I'm {first} {last}, {email}, {phone}, {experience}, {position}, {location}"]
+    else:
+        intake = [f"My name is {first} {last}", email, phone, experience, position, location]
+    return intake + [tech_stack] + answers
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Summarize latencies in seconds with nearest-rank percentiles."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": ordered[-1],
+    }
+
+async def run_candidate(messages: List[str], semaphore: asyncio.Semaphore, turn_latencies: Dict[str, List[float]]) -> Dict:
+    """Drive one session through its script and time every turn."""
+    async with semaphore:
+        session = ScreeningSession()
+        started = time.perf_counter()
+        for message in messages:
+            state = session.conversation_state
+            turn_started = time.perf_counter()
+            await session.handle(message)
+            turn_latencies.setdefault(state, []).append(time.perf_counter() - turn_started)
+        return {
+            "duration": time.perf_counter() - started,
+            "turns": len(messages),
+            "final_state": session.conversation_state,
+        }
+
+async def run_load_test(args: argparse.Namespace) -> Dict:
+    """Run the load test described by the command-line arguments."""
+    rng = random.Random(args.seed)
+    backend = CountingBackend(StubBackend(latency=args.latency, seed=args.seed))
+    set_backend(backend)
+    scheduler = LLMScheduler(args.rpm, args.tpm, args.llm_concurrency)
+    set_scheduler(scheduler)
+    llm_metrics.reset()
+    if args.question_cache:
+        llm_handler.question_cache = QuestionCache(path=None)
+    else:
+        # Variants never fill up, so every lookup misses
+        llm_handler.question_cache = QuestionCache(path=None, variants=10 ** 9)
+
+    scripts = [
+        candidate_script(rng, rng.random() < args.multi_field_ratio, rng.random() < args.generated_stack_ratio)
+        for _ in range(args.candidates)
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    turn_latencies: Dict[str, List[float]] = {}
+
+    started = time.perf_counter()
+    sessions = await asyncio.gather(*(run_candidate(script, semaphore, turn_latencies) for script in scripts))
+    elapsed = time.perf_counter() - started
+
+    all_turns = [latency for latencies in turn_latencies.values() for latency in latencies]
+    total_turns = sum(session["turns"] for session in sessions)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": vars(args),
+        "elapsed_seconds": elapsed,
+        "completed_sessions": sum(session["final_state"] == "conversation_end" for session in sessions),
+        "incomplete_final_states": dict(Counter(
+            session["final_state"] for session in sessions if session["final_state"] != "conversation_end"
+        )),
+        "throughput": {
+            "sessions_per_second": len(sessions) / elapsed,
+            "turns_per_second": total_turns / elapsed,
+        },
+        "turn_latency": percentiles(all_turns),
+        "turn_latency_by_state": {state: percentiles(latencies) for state, latencies in sorted(turn_latencies.items())},
+        "session_latency": percentiles([session["duration"] for session in sessions]),
+        "llm": {
+            "calls": backend.calls,
+            "calls_per_session": backend.calls / max(len(sessions), 1),
+            "prompt_tokens": backend.prompt_tokens,
+            "completion_tokens": backend.completion_tokens,
+            "tokens_per_session": (backend.prompt_tokens + backend.completion_tokens) / max(len(sessions), 1),
+        },
+        "scheduler": dict(scheduler.stats),
+        "routes": llm_metrics.route_summary(),
+    }
+
+def print_report(results: Dict) -> None:
+    """Print a human-readable summary of the results."""
+    print(f"Sessions: {results['completed_sessions']}/{results['config']['candidates']} completed "
+          f"in {results['elapsed_seconds']:.2f}s")
+    if results["incomplete_final_states"]:
+        stuck = ", ".join(f"{count} in {state}" for state, count in results["incomplete_final_states"].items())
+        print(f"WARNING: sessions did not reach conversation_end ({stuck}); per-state latencies are skewed")
+    print(f"Throughput: {results['throughput']['sessions_per_second']:.1f} sessions/s, "
+          f"{results['throughput']['turns_per_second']:.1f} turns/s")
+    for label, summary in [("Turn", results["turn_latency"]), ("Session", results["session_latency"])]:
+        print(f"{label} latency: p50 {summary['p50'] * 1000:.1f}ms, p95 {summary['p95'] * 1000:.1f}ms, "
+              f"p99 {summary['p99'] * 1000:.1f}ms")
+    for state, summary in results["turn_latency_by_state"].items():
+        print(f"  {state:<24} p50 {summary['p50'] * 1000:8.1f}ms  p95 {summary['p95'] * 1000:8.1f}ms  n={summary['count']}")
+    llm = results["llm"]
+    print(f"LLM: {llm['calls']} calls ({llm['calls_per_session']:.2f}/session), "
+          f"{llm['prompt_tokens']} prompt + {llm['completion_tokens']} completion tokens")
+    scheduler = results["scheduler"]
+    print(f"Scheduler: {scheduler['queued']} calls queued, {scheduler['queue_wait_seconds']:.1f}s total queue wait, "
+          f"{scheduler['retries']} retries")
+    for route, stats in results["routes"].items():
+        print(f"  {route:<52} {stats['calls']:>5} calls  mean {stats['mean_seconds'] * 1000:8.1f}ms  "
+              f"escalated {stats['escalation_rate']:.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100, help="number of simulated candidates")
+    parser.add_argument("--concurrency", type=int, default=100, help="maximum sessions in flight at once")
+    parser.add_argument("--latency", default="lognormal:0.8:0.3", help="stub LLM latency spec")
+    parser.add_argument("--multi-field-ratio", type=float, default=0.2,
+                        help="share of candidates pasting all intake details in one message")
+    parser.add_argument("--generated-stack-ratio", type=float, default=0.5,
+                        help="share of candidates whose stack the question bank doesn't cover, so questions are generated")
+    parser.add_argument("--rpm", type=float, help="LLM requests per minute limit (default: unlimited)")
+    parser.add_argument("--tpm", type=float, help="LLM tokens per minute limit (default: unlimited)")
+    parser.add_argument("--llm-concurrency", type=int, help="maximum LLM calls in flight (default: unlimited)")
+    parser.add_argument("--question-cache", action="store_true", help="enable the technical question cache")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/load_test-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(args))
+    print_report(results)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load_test-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output}")
+    if results["incomplete_final_states"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
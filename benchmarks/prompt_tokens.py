@@ -0,0 +1,96 @@
+"""Report the token size of every prompt template to track prompt-size regressions.
+
+For each compiled template the fixed tokens (everything except the variable
+input), the total with the system prompt, the call site's token budget and the
+room left for user input are printed. Pass --baseline with an earlier --output
+file to fail when any template grew.
+
+Usage:
+    python -m benchmarks.prompt_tokens --output benchmarks/results/prompt_tokens.json
+    python -m benchmarks.prompt_tokens --baseline benchmarks/results/prompt_tokens.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict
+
+from utils.prompt_templates import PROMPT_TEMPLATE_VERSION, SYSTEM_PROMPT_TOKENS, all_templates
+from utils.constants import PROMPT_TOKEN_BUDGETS
+
+def measure_templates() -> Dict:
+    """Count the tokens of every compiled prompt template."""
+    templates = {}
+    for name, template in sorted(all_templates().items()):
+        budget = PROMPT_TOKEN_BUDGETS.get(template.call_site)
+        total = SYSTEM_PROMPT_TOKENS + template.fixed_tokens
+        templates[name] = {
+            "fixed_tokens": template.fixed_tokens,
+            "with_system_prompt": total,
+            "budget": budget,
+            "input_tokens_available": budget - total if budget is not None else None,
+        }
+    return {
+        "prompt_template_version": PROMPT_TEMPLATE_VERSION,
+        "system_prompt_tokens": SYSTEM_PROMPT_TOKENS,
+        "templates": templates,
+    }
+
+def print_report(results: Dict) -> None:
+    """Print the template sizes as a table."""
+    print(f"Prompt template version {results['prompt_template_version']}, "
+          f"system prompt {results['system_prompt_tokens']} tokens")
+    print(f"{'template':<34} {'fixed':>6} {'+system':>8} {'budget':>7} {'input':>6}")
+    for name, sizes in results["templates"].items():
+        print(f"{name:<34} {sizes['fixed_tokens']:>6} {sizes['with_system_prompt']:>8} "
+              f"{sizes['budget'] if sizes['budget'] is not None else '-':>7} "
+              f"{sizes['input_tokens_available'] if sizes['input_tokens_available'] is not None else '-':>6}")
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: int) -> bool:
+    """Print templates that grew since the baseline.
+
+    Args:
+        results: Current measurements
+        baseline: Earlier measurements
+        tolerance: Growth in tokens allowed per template
+
+    Returns:
+        True if no template grew by more than the tolerance
+    """
+    ok = True
+    for name, sizes in results["templates"].items():
+        before = baseline["templates"].get(name)
+        if before is None:
+            continue
+        growth = sizes["with_system_prompt"] - before["with_system_prompt"]
+        if growth > tolerance:
+            ok = False
+            print(f"REGRESSION {name}: {before['with_system_prompt']} -> {sizes['with_system_prompt']} tokens (+{growth})")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="save the measurements as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier --output run to compare against")
+    parser.add_argument("--tolerance", type=int, default=0, help="tokens a template may grow before failing")
+    args = parser.parse_args()
+
+    results = measure_templates()
+    print_report(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare_to_baseline(results, baseline, args.tolerance):
+            sys.exit(1)
+        print("No prompt-size regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measure diversity selection speed and how often candidates get repeated questions.
+
+Speed: the recent-question index is filled to capacity (every question
+still recent enough to be penalized) with synthetic questions (bank
+questions with varied subjects) and the time to pick a diverse subset of
+`--pool` questions for one candidate is reported, for questions whose
+embeddings are cached (bank questions) and for new ones (generated questions).
+
+Repeats: candidates with stacks drawn from a few popular technologies get
+questions from the bank, with the recent-question index and without it
+(a fresh index per candidate), and the share of questions that an earlier
+candidate already got among the last `--window` candidates is reported.
+
+Usage:
+    python -m benchmarks.question_diversity --candidates 500 --window 1
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+from utils.constants import MAX_TECH_QUESTIONS
+from utils.question_bank import question_bank
+from utils.question_diversity import RecentQuestionIndex, embed, select_diverse
+from utils import question_diversity
+
+POPULAR_TECHNOLOGIES = ["Python", "JavaScript", "React", "Node.js", "SQL", "Docker", "AWS", "Java"]
+
+def bank_questions() -> List[str]:
+    return [entry["question"] for pool in question_bank.technologies.values() for entry in pool]
+
+def synthetic_questions(count: int, rng: random.Random) -> List[str]:
+    """Questions shaped like the bank's, each with a made-up subject."""
+    questions = bank_questions()
+    return [f"{rng.choice(questions)} Consider component {rng.randrange(10 ** 6)}." for _ in range(count)]
+
+def measure_speed(pool: int, repeats: int, rng: random.Random) -> Dict:
+    """Time select_diverse for one candidate against a full index."""
+    index = RecentQuestionIndex()
+    started = time.perf_counter()
+    index.add(synthetic_questions(index.capacity, rng))
+    fill_seconds = time.perf_counter() - started
+
+    cached = rng.sample(bank_questions(), pool)
+    embed(cached)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        select_diverse(cached, MAX_TECH_QUESTIONS, index)
+    cached_ms = (time.perf_counter() - started) / repeats * 1000
+
+    new_ms = []
+    for _ in range(repeats):
+        fresh = synthetic_questions(pool, rng)
+        started = time.perf_counter()
+        select_diverse(fresh, MAX_TECH_QUESTIONS, index)
+        new_ms.append((time.perf_counter() - started) * 1000)
+    return {
+        "index_size": len(index),
+        "pool": pool,
+        "fill_seconds": fill_seconds,
+        "ms_per_candidate_cached": cached_ms,
+        "ms_per_candidate_new": sum(new_ms) / len(new_ms),
+    }
+
+def repeat_rate(candidates: int, window: int, with_index: bool, seed: int) -> float:
+    """Share of questions already given to one of the previous `window` candidates."""
+    rng = random.Random(seed)
+    question_diversity.recent_questions = RecentQuestionIndex()
+    history: List[set] = []
+    repeated = total = 0
+    for _ in range(candidates):
+        if not with_index:
+            question_diversity.recent_questions.clear()
+        tech_stack = ", ".join(rng.sample(POPULAR_TECHNOLOGIES, rng.randint(2, 3)))
+        questions = question_bank.plan(tech_stack, f"{rng.randint(1, 10)} years", rng=rng).bank_questions
+        question_diversity.recent_questions.add(questions)
+        seen = set().union(*history[-window:]) if history else set()
+        repeated += sum(1 for question in questions if question in seen)
+        total += len(questions)
+        history.append(set(questions))
+    return repeated / total
+
+def print_report(results: Dict) -> None:
+    """Print the measurements."""
+    speed = results["speed"]
+    print(f"Index of {speed['index_size']} questions filled in {speed['fill_seconds']:.1f}s")
+    print(f"select_diverse per candidate, picking from {speed['pool']} questions: "
+          f"{speed['ms_per_candidate_cached']:.3f}ms with cached embeddings, "
+          f"{speed['ms_per_candidate_new']:.3f}ms with new questions")
+    repeats = results["repeats"]
+    print(f"Questions already given to one of the previous {repeats['window']} candidate(s): "
+          f"{repeats['without_index']:.1%} without the recent-question index, "
+          f"{repeats['with_index']:.1%} with it")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, default=10, help="candidate questions per selection")
+    parser.add_argument("--repeats", type=int, default=20, help="selections to time")
+    parser.add_argument("--candidates", type=int, default=500, help="simulated candidates for the repeat rate")
+    parser.add_argument("--window", type=int, default=1, help="previous candidates a repeat is counted against")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    results = {
+        "speed": measure_speed(args.pool, args.repeats, random.Random(args.seed)),
+        "repeats": {
+            "window": args.window,
+            "without_index": repeat_rate(args.candidates, args.window, False, args.seed),
+            "with_index": repeat_rate(args.candidates, args.window, True, args.seed),
+        },
+    }
+    print_report(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Profile Streamlit reruns while replaying candidate transcripts through the app.
+
+The app is driven with Streamlit's AppTest against the stub LLM backend and
+the rerun profiler enabled. Every message of every transcript is a rerun
+(the conversation fragment, or a full run when the sidebar changes), and the
+report gives rolling percentiles of each phase with LLM wait time split out.
+Transcripts are simulated candidates unless a JSONL file is given with one
+{"messages": [...]} object per line, e.g. exported production conversations.
+
+Usage:
+    python -m benchmarks.rerun_profile --candidates 5 --latency lognormal:0.8:0.3
+    python -m benchmarks.rerun_profile --transcripts transcripts.jsonl --dumps 3
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from typing import Dict, List
+
+def load_transcripts(args: argparse.Namespace) -> List[List[str]]:
+    """Read transcripts from a file or simulate candidates."""
+    if args.transcripts:
+        with open(args.transcripts, "r", encoding="utf-8") as f:
+            return [json.loads(line)["messages"] for line in f if line.strip()]
+    from benchmarks.load_test import candidate_script
+    rng = random.Random(args.seed)
+    return [candidate_script(rng, multi_field=rng.random() < 0.3) for _ in range(args.candidates)]
+
+def run(args: argparse.Namespace) -> Dict:
+    """Replay the transcripts through the app and return the profiler summary."""
+    os.environ.update({
+        "TALENTSCOUT_LLM_BACKEND": "stub",
+        "TALENTSCOUT_STUB_LATENCY": args.latency,
+        "TALENTSCOUT_METRICS_LOG": "",
+        "TALENTSCOUT_PROFILE": "1",
+        "TALENTSCOUT_PROFILE_DUMPS": str(args.dumps),
+    })
+    from streamlit.testing.v1 import AppTest
+    from utils.profiler import rerun_profiler
+
+    for transcript in load_transcripts(args):
+        app = AppTest.from_file("app.py", default_timeout=args.timeout).run()
+        for message in transcript:
+            app.chat_input[0].set_value(message).run()
+    return rerun_profiler.summary()
+
+def print_report(summary: Dict) -> None:
+    """Print the profiler summary."""
+    kinds = ", ".join(f"{count} {kind}" for kind, count in summary["kinds"].items())
+    print(f"{summary['reruns']} reruns ({kinds}), {summary['llm_share']:.1%} of the time waiting on the LLM")
+    print(f"{'':<24} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for row in summary["rows"]:
+        print(f"{row['name']:<24} {row['count']:>5} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+              f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+    for path in summary["dumps"]:
+        print(f"cProfile dump: {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=5, help="simulated candidates (without --transcripts)")
+    parser.add_argument("--transcripts", help="JSONL file of {\"messages\": [...]} transcripts to replay")
+    parser.add_argument("--latency", default="fixed:0", help="stub LLM latency spec, e.g. lognormal:0.8:0.3")
+    parser.add_argument("--dumps", type=int, default=0, help="keep cProfile dumps of this many slowest reruns")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--output", help="save the summary as JSON")
+    args = parser.parse_args()
+
+    # Keep candidate data and spilled histories out of the working tree
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ.setdefault("TALENTSCOUT_DB_PATH", os.path.join(data_dir, "candidates.db"))
+        os.environ.setdefault("TALENTSCOUT_HISTORY_DIR", os.path.join(data_dir, "history"))
+        summary = run(args)
+    print_report(summary)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
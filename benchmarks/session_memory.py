@@ -0,0 +1,95 @@
+"""Report per-session memory for simulated candidates, before and after idle eviction.
+
+Candidates are driven through the full flow against the stub LLM backend (no
+latency), then the engine's memory report is printed: bytes per session with
+the chat history in memory, the same after every session is evicted, and the
+bytes the history would take as the plain list of dicts it used to be.
+
+Usage:
+    python -m benchmarks.session_memory --candidates 200
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+from typing import Dict, List
+
+from benchmarks.load_test import candidate_script
+from utils.engine import ScreeningSession, evict_idle_sessions, memory_report
+from utils.llm_backends import StubBackend, set_backend
+from utils.scheduler import LLMScheduler, set_scheduler
+
+def dict_history_bytes(session: ScreeningSession) -> int:
+    """Bytes the session's history would take as a list of {"role", "content"} dicts."""
+    messages = [message.to_dict() for message in session.messages]
+    return sys.getsizeof(messages) + sum(
+        sys.getsizeof(message) + sys.getsizeof(message["role"]) + sys.getsizeof(message["content"])
+        for message in messages
+    )
+
+def summarize(report: Dict) -> Dict:
+    """Reduce a memory report to per-session statistics."""
+    sizes = sorted(session["bytes"] for session in report["sessions"])
+    return {
+        "sessions": len(sizes),
+        "mean_bytes": statistics.mean(sizes),
+        "p95_bytes": sizes[int(len(sizes) * 0.95)],
+        "max_bytes": sizes[-1],
+        "in_memory_messages": sum(session["in_memory_messages"] for session in report["sessions"]),
+        "spilled_messages": sum(session["spilled_messages"] for session in report["sessions"]),
+        "shared_response_bytes": report["shared_response_bytes"],
+    }
+
+def run(args: argparse.Namespace) -> Dict:
+    """Simulate the candidates and measure their sessions."""
+    set_backend(StubBackend(latency="fixed:0", seed=args.seed))
+    set_scheduler(LLMScheduler(None, None, None))
+    rng = random.Random(args.seed)
+
+    sessions: List[ScreeningSession] = []
+    for _ in range(args.candidates):
+        session = ScreeningSession()
+        for message in candidate_script(rng, multi_field=rng.random() < 0.3):
+            session.respond(message)
+        sessions.append(session)
+
+    in_memory = summarize(memory_report())
+    in_memory["dict_history_mean_bytes"] = statistics.mean(dict_history_bytes(session) for session in sessions)
+    evict_idle_sessions(idle_timeout=0)
+    return {"candidates": args.candidates, "in_memory": in_memory, "evicted": summarize(memory_report())}
+
+def print_report(results: Dict) -> None:
+    """Print the measurements."""
+    for phase in ("in_memory", "evicted"):
+        summary = results[phase]
+        print(f"{phase:<10} {summary['sessions']} sessions: mean {summary['mean_bytes']:.0f} B, "
+              f"p95 {summary['p95_bytes']} B, max {summary['max_bytes']} B per session; "
+              f"{summary['in_memory_messages']} messages in memory, {summary['spilled_messages']} on disk")
+    print(f"Chat history as a list of dicts: {results['in_memory']['dict_history_mean_bytes']:.0f} B per session")
+    print(f"Assistant responses shared by all sessions: {results['in_memory']['shared_response_bytes']} B")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=200, help="simulated candidates")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    # Keep spilled histories out of the working tree unless a directory was chosen
+    with tempfile.TemporaryDirectory() as spill_dir:
+        os.environ.setdefault("TALENTSCOUT_HISTORY_DIR", spill_dir)
+        results = run(args)
+    print_report(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
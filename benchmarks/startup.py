@@ -0,0 +1,183 @@
+"""Measure cold start time and HTTP connection reuse of the LLM client.
+
+Cold start: the app is loaded in fresh Python processes and rendered once
+with Streamlit's AppTest, reporting the time from process start to the
+first render and to the LLM backend being ready (it is warmed in the
+background after the render).
+
+Connection reuse: chat completions are sent through the Groq SDK to a local
+server mimicking the Groq API, once over the shared keep-alive pool and once
+with keep-alive disabled, reporting how many requests reused a connection.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --requests 200 --threads 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from utils.constants import DEFAULT_MODEL
+from utils.llm_backends import ConnectionPoolStats, GroqBackend, get_http_client, http_pool_stats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints the timings as JSON
+COLD_START_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+first_render = time.perf_counter() - started
+from utils import llm_backends
+if llm_backends._warm_thread is not None:
+    llm_backends._warm_thread.join()
+print(json.dumps({
+    "first_render": first_render,
+    "backend_ready": time.perf_counter() - started,
+    "backend": type(llm_backends._backend).__name__,
+}))
+"""
+
+def measure_cold_start(runs: int) -> Dict:
+    """Start the app in `runs` fresh processes and time the first render."""
+    env = dict(os.environ, GROQ_API_KEY=os.getenv("GROQ_API_KEY", "benchmark"), TALENTSCOUT_METRICS_LOG="")
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START_SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample["process"] = time.perf_counter() - started
+        samples.append(sample)
+    return {
+        "runs": runs,
+        "backend": samples[0]["backend"],
+        "first_render_median": statistics.median(sample["first_render"] for sample in samples),
+        "backend_ready_median": statistics.median(sample["backend_ready"] for sample in samples),
+        "process_median": statistics.median(sample["process"] for sample in samples),
+    }
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests like the Groq API, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    # Otherwise small responses on a kept-alive connection stall on delayed ACKs
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        body = json.dumps({
+            "id": "benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": DEFAULT_MODEL,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "NOT_FOUND"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def send_requests(backend: GroqBackend, requests: int, threads: int) -> List[float]:
+    """Send chat completions from `threads` threads and return each call's latency."""
+    def call(_):
+        started = time.perf_counter()
+        backend.complete([{"role": "user", "content": "ping"}], DEFAULT_MODEL, 0.0, 5)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(call, range(requests)))
+
+def measure_connection_reuse(requests: int, threads: int, server_latency: float) -> Dict:
+    """Compare connection reuse of the shared pool against a client without keep-alive."""
+    import groq
+    import httpx
+
+    FakeGroqHandler.latency = server_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroqHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    results = {}
+    try:
+        no_keepalive_stats = ConnectionPoolStats()
+        no_keepalive_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=0),
+            event_hooks={"request": [no_keepalive_stats.on_request]},
+        )
+        clients = {
+            "shared_pool": (http_pool_stats, get_http_client()),
+            "no_keepalive": (no_keepalive_stats, no_keepalive_client),
+        }
+        for name, (stats, http_client) in clients.items():
+            backend = GroqBackend(groq.Client(api_key="benchmark", base_url=base_url, max_retries=0, http_client=http_client))
+            stats.reset()
+            started = time.perf_counter()
+            latencies = sorted(send_requests(backend, requests, threads))
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                **stats.snapshot(),
+                "requests_per_second": requests / elapsed,
+                "p50_ms": latencies[len(latencies) // 2] * 1000,
+                "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+            }
+        no_keepalive_client.close()
+    finally:
+        server.shutdown()
+    return results
+
+def print_report(results: Dict) -> None:
+    """Print the measurements."""
+    cold_start = results.get("cold_start")
+    if cold_start:
+        print(f"Cold start ({cold_start['runs']} runs, {cold_start['backend']}): "
+              f"first render {cold_start['first_render_median']:.2f}s, "
+              f"backend ready {cold_start['backend_ready_median']:.2f}s, "
+              f"process total {cold_start['process_median']:.2f}s (medians)")
+    for name, reuse in results.get("connection_reuse", {}).items():
+        print(f"{name:<14} {reuse['requests']} requests, {reuse['connections']} connections, "
+              f"reuse {reuse['reuse_rate']:.1%}, {reuse['requests_per_second']:.0f} req/s, "
+              f"p50 {reuse['p50_ms']:.1f}ms, p95 {reuse['p95_ms']:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure (0 to skip)")
+    parser.add_argument("--requests", type=int, default=200, help="chat completions for the reuse test (0 to skip)")
+    parser.add_argument("--threads", type=int, default=8, help="threads sending completions concurrently")
+    parser.add_argument("--server-latency", type=float, default=0.01, help="seconds the fake API takes per request")
+    parser.add_argument("--output", help="save the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    if args.runs:
+        results["cold_start"] = measure_cold_start(args.runs)
+    if args.requests:
+        results["connection_reuse"] = measure_connection_reuse(args.requests, args.threads, args.server_latency)
+    print_report(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Screen a batch of candidate profiles offline, without the chat UI.
+
+Records are streamed from a CSV or JSONL file. Each record may carry
+candidate fields as columns (full_name, email, phone, experience,
+desired_position, location, tech_stack) and/or a free-text intro. Missing
+fields are extracted from the intro with the app's extraction prompts, then
+technical questions are assembled from the question bank, generating them only
+for technologies the bank doesn't cover. Results are appended to a
+JSONL file as they complete.
+
+At most --concurrency records are in flight, so memory stays constant however
+large the input is. A checkpoint next to the output records how far the run
+got; rerunning the same command after a crash resumes where it stopped without
+duplicating output. Records that failed (written as error lines) are kept in
+the checkpoint too, and rerunning the command retries them, appending their
+results after the error lines.
+
+Usage:
+    python bulk_screen.py candidates.csv --output screened.jsonl --concurrency 16
+"""
+
+import argparse
+import asyncio
+import contextvars
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from utils.constants import (
+    COLLECTION_STEPS,
+    BULK_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_CONCURRENCY,
+)
+from utils.engine import assemble_technical_questions
+from utils.llm_handler import extract_information, extract_all_information
+from utils.metrics import conversation_state_var
+from utils.scheduler import LLMScheduler, set_scheduler
+from utils.tech_stack import canonicalize_tech_stack
+
+CANDIDATE_FIELDS = [field for _, _, field in COLLECTION_STEPS]
+
+# Column names accepted for the free-text intro, in order of preference
+TEXT_FIELDS = ["intro", "text", "message", "summary", "description"]
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Stream records from a CSV (with a header row) or JSONL file.
+
+    Args:
+        path: Input file; ".csv" files are read as CSV, anything else as JSONL
+
+    Yields:
+        One dictionary per record
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def screen_record(record: Dict, text_field: Optional[str]) -> Dict:
+    """Extract candidate information from a record and generate technical questions.
+
+    Args:
+        record: Input record
+        text_field: Column holding the free-text intro, or None to try TEXT_FIELDS
+
+    Returns:
+        Candidate information, canonical tech stack and generated questions
+    """
+    candidate_info = {field: (str(record.get(field) or "").strip() or None) for field in CANDIDATE_FIELDS}
+    text = record.get(text_field) if text_field else next((record[name] for name in TEXT_FIELDS if record.get(name)), None)
+
+    if text and not all(candidate_info.values()):
+        for field, value in extract_all_information(text).items():
+            candidate_info[field] = candidate_info[field] or value
+        # Questions need a tech stack, so fall back to the dedicated prompt
+        if not candidate_info["tech_stack"]:
+            candidate_info["tech_stack"] = extract_information(text, "tech_stack")
+
+    questions = []
+    if candidate_info["tech_stack"]:
+        # Assembled as in the chat: from the bank where it covers the stack, generating the rest
+        questions = assemble_technical_questions(
+            candidate_info["tech_stack"], candidate_info["experience"], candidate_info["desired_position"]
+        )
+        if not questions:
+            raise RuntimeError("Question generation failed")
+
+    return {
+        "candidate_info": candidate_info,
+        "tech_stack": list(canonicalize_tech_stack(candidate_info["tech_stack"] or "")),
+        "questions": questions,
+    }
+
+class Checkpoint:
+    """Progress of a run, saved atomically next to the output.
+
+    Records are numbered by their position in the input. `next_index` is the
+    first record not yet written, and `done` holds the records after it that
+    completed out of order (at most the number in flight). `failed` holds the
+    written records that failed, which are screened again on resume.
+    `output_bytes` is the size of the output covered by the checkpoint;
+    anything written after it is discarded on resume.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.next_index = 0
+        self.done: Set[int] = set()
+        self.failed: Set[int] = set()
+        self.output_bytes = 0
+
+    def load(self) -> bool:
+        """Read the saved checkpoint, returning False if there is none."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.next_index = state["next_index"]
+        self.done = set(state["done"])
+        self.failed = set(state.get("failed", []))
+        self.output_bytes = state["output_bytes"]
+        return True
+
+    def is_done(self, index: int) -> bool:
+        return (index < self.next_index or index in self.done) and index not in self.failed
+
+    def mark_done(self, index: int, output_bytes: int, failed: bool = False) -> None:
+        """Record a written record, successful or failed, and save the checkpoint."""
+        if failed:
+            self.failed.add(index)
+        else:
+            self.failed.discard(index)
+        # Retried records lie below next_index already
+        if index >= self.next_index:
+            self.done.add(index)
+        while self.next_index in self.done:
+            self.done.remove(self.next_index)
+            self.next_index += 1
+        self.output_bytes = output_bytes
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "next_index": self.next_index,
+                "done": sorted(self.done),
+                "failed": sorted(self.failed),
+                "output_bytes": self.output_bytes,
+            }, f)
+        os.replace(temp_path, self.path)
+
+async def run_bulk_screening(args: argparse.Namespace) -> Tuple[int, int]:
+    """Screen every record of the input that the checkpoint doesn't cover.
+
+    Returns:
+        Numbers of records screened and failed in this run
+    """
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint")
+    if not args.restart and os.path.exists(args.output) and checkpoint.load():
+        print(f"Resuming from record {checkpoint.next_index}", file=sys.stderr)
+        output = open(args.output, "r+b")
+        # Drop results written after the last checkpoint; those records are screened again
+        output.truncate(checkpoint.output_bytes)
+        output.seek(0, os.SEEK_END)
+    else:
+        checkpoint = Checkpoint(checkpoint.path)
+        output = open(args.output, "wb")
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="bulk-screen")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency)
+    counts = {"screened": 0, "failed": 0}
+    started = time.perf_counter()
+
+    async def produce():
+        for index, record in enumerate(read_records(args.input)):
+            if not checkpoint.is_done(index):
+                await queue.put((index, record))
+        for _ in range(args.concurrency):
+            await queue.put(None)
+
+    async def work():
+        while (item := await queue.get()) is not None:
+            index, record = item
+            record_id = record.get(args.id_field, index)
+            failed = False
+            try:
+                # Each call gets a fresh copy of the context so metrics label the calls as bulk screening
+                result = await loop.run_in_executor(
+                    executor, contextvars.copy_context().run, screen_record, record, args.text_field
+                )
+                line = {"id": record_id, "index": index, **result}
+                counts["screened"] += 1
+            except Exception as e:
+                line = {"id": record_id, "index": index, "error": str(e)}
+                counts["failed"] += 1
+                failed = True
+
+            # Writes and checkpoints happen on the event loop thread, one record at a time
+            output.write((json.dumps(line) + "\n").encode("utf-8"))
+            output.flush()
+            checkpoint.mark_done(index, output.tell(), failed)
+
+            done = counts["screened"] + counts["failed"]
+            if done % args.progress_every == 0:
+                print(f"{done} records in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    conversation_state_var.set("bulk_screening")
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(args.concurrency)))
+    finally:
+        output.close()
+        executor.shutdown(wait=False)
+
+    if checkpoint.failed:
+        # Kept so rerunning the command retries the failed records
+        print(f"{len(checkpoint.failed)} failed records are retried when the same command is run again",
+              file=sys.stderr)
+    elif os.path.exists(checkpoint.path):
+        os.remove(checkpoint.path)
+    return counts["screened"], counts["failed"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSONL file of candidate records")
+    parser.add_argument("--output", required=True, help="JSONL file receiving one result per record")
+    parser.add_argument("--concurrency", type=int, default=BULK_CONCURRENCY, help="records processed at once")
+    parser.add_argument("--id-field", default="id", help="column identifying a record (default: its position)")
+    parser.add_argument("--text-field", help=f"column with the free-text intro (default: first of {', '.join(TEXT_FIELDS)})")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and start over")
+    parser.add_argument("--progress-every", type=int, default=100, help="report progress every N records")
+    parser.add_argument("--rpm", type=float, default=LLM_REQUESTS_PER_MINUTE,
+                        help="LLM requests per minute limit (0 for unlimited)")
+    parser.add_argument("--tpm", type=float, default=LLM_TOKENS_PER_MINUTE,
+                        help="LLM tokens per minute limit (0 for unlimited)")
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_MAX_CONCURRENCY,
+                        help="maximum LLM calls in flight (0 for unlimited)")
+    args = parser.parse_args()
+
+    set_scheduler(LLMScheduler(args.rpm or None, args.tpm or None, args.llm_concurrency or None))
+
+    started = time.perf_counter()
+    screened, failed = asyncio.run(run_bulk_screening(args))
+    print(f"Screened {screened} records ({failed} failed) in {time.perf_counter() - started:.1f}s; "
+          f"results in {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,147 @@
+import time
 import streamlit as st
+from typing import Any, Callable, Tuple
+from utils.constants import STREAM_UPDATE_INTERVAL, STREAM_CURSOR, CHAT_HISTORY_WINDOW
+from utils.engine import ScreeningSession
+from utils.history import ChatHistory
+from utils.profiler import rerun_profiler
+from utils.scheduler import queue_position_listener
+from utils.session_state import get_session
+
+# Sidebar labels for the collected candidate fields, in display order
+SIDEBAR_LABELS = {
+    "full_name": "Name",
+    "email": "Email",
+    "phone": "Phone",
+    "experience": "Experience",
+    "desired_position": "Desired Position",
+    "location": "Location",
+    "tech_stack": "Tech Stack",
+}
 
 def render_chat_interface():
-    """Render the chat interface with message history."""
-    
-    # Create a container for the chat messages
-    chat_container = st.container()
-    
-    # Display chat history
-    with chat_container:
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-    
-    # Add a progress bar for the interview stages
-    progress_container = st.container()
-    with progress_container:
-        # Calculate progress based on conversation state
-        progress_percentage = calculate_progress_percentage()
-        
-        if progress_percentage < 100:
-            interview_progress = st.progress(progress_percentage / 100.0)
-            st.caption(f"Interview Progress: {progress_percentage}%")
-        else:
-            interview_progress = st.progress(1.0)
-            st.caption("Interview Complete! 100%")
-            
-        # Add a divider
-        st.divider()
-        
+    """Render the chat interface with message history.
+
+    The sidebar is drawn on full reruns only; the conversation itself is a
+    fragment, so a new turn re-renders just the chat. A turn that changes the
+    candidate information triggers a full rerun to refresh the sidebar.
+    """
     # Display candidate information (if available)
-    display_candidate_info()
+    with rerun_profiler.phase("sidebar"):
+        display_candidate_info()
+
+    render_conversation()
+
+def session_signature(session: ScreeningSession) -> Tuple:
+    """Summarize everything the progress bar and sidebar depend on.
+
+    Args:
+        session: Screening session being rendered
+
+    Returns:
+        Hashable value that changes whenever the candidate information or conversation state does
+    """
+    return (
+        session.session_id,
+        tuple(session.candidate_info.values()),
+        session.conversation_state,
+        session.questions_answered,
+    )
+
+def cached_for_session(name: str, compute: Callable[[ScreeningSession], Any]) -> Any:
+    """Return compute(session), recomputing only when the session signature changes.
+
+    Args:
+        name: Key of the cached value in st.session_state
+        compute: Function deriving the value from the session
+
+    Returns:
+        The cached or freshly computed value
+    """
+    session = get_session()
+    signature = session_signature(session)
+    cached = st.session_state.get(name)
+    if cached is None or cached[0] != signature:
+        cached = (signature, compute(session))
+        st.session_state[name] = cached
+    return cached[1]
+
+@st.fragment
+def render_conversation():
+    """Render the windowed chat history, progress bar and chat input, and handle new messages."""
+    # Reruns of the fragment alone are profiled as reruns of their own
+    with rerun_profiler.rerun("conversation"):
+        session = get_session()
+
+        # Create a container for the chat messages
+        chat_container = st.container()
+
+        # Display the most recent part of the chat history
+        with chat_container, rerun_profiler.phase("history"):
+            render_message_window(session.messages)
+
+        # Add a progress bar for the interview stages
+        progress_container = st.container()
+        with progress_container, rerun_profiler.phase("progress"):
+            # Calculate progress based on conversation state
+            progress_percentage = cached_for_session("progress_cache", calculate_progress_percentage)
+
+            if progress_percentage < 100:
+                st.progress(progress_percentage / 100.0)
+                st.caption(f"Interview Progress: {progress_percentage}%")
+            else:
+                st.progress(1.0)
+                st.caption("Interview Complete! 100%")
+
+            # Add a divider
+            st.divider()
+
+        # Handle user input
+        if user_input := st.chat_input("Type your message here..."):
+            sidebar_before = cached_for_session("sidebar_cache", candidate_info_lines)
+
+            # Display user message
+            with st.chat_message("user"):
+                st.markdown(user_input)
+
+            # Process user message and get AI response
+            with st.chat_message("assistant"), rerun_profiler.phase("process_message"):
+                with st.spinner("Thinking..."):
+                    message_placeholder = st.empty()
+                    # Process the message (recording both sides in the chat history) and stream the response
+                    process_user_message(user_input, message_placeholder)
+
+            # The sidebar lives outside the fragment, so refresh the whole page when it changed
+            if cached_for_session("sidebar_cache", candidate_info_lines) != sidebar_before:
+                st.rerun()
+
+def render_message_window(messages: ChatHistory):
+    """Render the last messages of the chat history with a control to reveal earlier ones.
+
+    Args:
+        messages: Full chat history
+    """
+    window = st.session_state.setdefault("history_window", CHAT_HISTORY_WINDOW)
+    hidden = max(len(messages) - window, 0)
+
+    if hidden:
+        # A fixed label keeps the widget identity stable while the history grows
+        st.button("Show earlier messages", key="show_earlier_messages", on_click=show_earlier_messages)
 
-def calculate_progress_percentage() -> int:
+    for message in messages[hidden:]:
+        with st.chat_message(message.role):
+            st.markdown(message.content)
+
+def show_earlier_messages():
+    """Widen the chat history window; runs as a button callback before the fragment reruns."""
+    st.session_state.history_window += CHAT_HISTORY_WINDOW
+
+def calculate_progress_percentage(session: ScreeningSession) -> int:
     """Calculate the percentage of interview completion.
-    
+
+    Args:
+        session: Screening session to measure
+
     Returns:
         Progress percentage (0-100)
     """
@@ -41,51 +149,92 @@ def calculate_progress_percentage() -> int:
     # 1. Name, 2. Email, 3. Phone, 4. Experience, 5. Position, 6. Location, 7. Tech Stack, 8. Tech Questions
     total_steps = 8
     current_step = 0
-    
+
     # Count filled fields in candidate_info
-    for field, value in st.session_state.candidate_info.items():
+    for field, value in session.candidate_info.items():
         if value:
             current_step += 1
-    
+
     # Add progress for technical questions
-    if st.session_state.conversation_state == "asking_tech_questions":
-        question_percentage = (st.session_state.questions_answered / max(len(st.session_state.tech_questions), 1))
+    if session.conversation_state == "asking_tech_questions":
+        question_percentage = (session.questions_answered / max(len(session.tech_questions), 1))
         current_step += question_percentage
-    elif st.session_state.conversation_state == "conversation_end":
+    elif session.conversation_state == "conversation_end":
         current_step = total_steps
-    
+
     # Calculate percentage
     return min(int((current_step / total_steps) * 100), 100)
 
+def candidate_info_lines(session: ScreeningSession) -> Tuple[str, ...]:
+    """Build the sidebar lines for the collected candidate information.
+
+    Args:
+        session: Screening session to describe
+
+    Returns:
+        One markdown line per filled field
+    """
+    info = session.candidate_info
+    return tuple(f"**{label}:** {info[field]}" for field, label in SIDEBAR_LABELS.items() if info[field])
+
 def display_candidate_info():
     """Display collected candidate information in a sidebar."""
-    
+
+    lines = cached_for_session("sidebar_cache", candidate_info_lines)
+
     # Only show info when some fields are filled
-    has_info = any(value for value in st.session_state.candidate_info.values())
-    
-    if has_info:
+    if lines:
         with st.sidebar:
             st.header("Candidate Information")
-            
-            info = st.session_state.candidate_info
-            
-            if info["full_name"]:
-                st.markdown(f"**Name:** {info['full_name']}")
-            if info["email"]:
-                st.markdown(f"**Email:** {info['email']}")
-            if info["phone"]:
-                st.markdown(f"**Phone:** {info['phone']}")
-            if info["experience"]:
-                st.markdown(f"**Experience:** {info['experience']}")
-            if info["desired_position"]:
-                st.markdown(f"**Desired Position:** {info['desired_position']}")
-            if info["location"]:
-                st.markdown(f"**Location:** {info['location']}")
-            if info["tech_stack"]:
-                st.markdown(f"**Tech Stack:** {info['tech_stack']}")
-            
+
+            for line in lines:
+                st.markdown(line)
+
             # Add a restart button
             if st.button("Restart Interview", type="primary"):
                 from utils.session_state import clear_session
                 clear_session()
-                st.rerun()
\ No newline at end of file
+                st.rerun()
+
+class StreamingPlaceholder:
+    """Render streamed text into a Streamlit placeholder, throttled by time.
+
+    Re-rendering markdown on every token makes long messages quadratic to draw,
+    so intermediate updates are only pushed every STREAM_UPDATE_INTERVAL seconds.
+    """
+
+    def __init__(self, placeholder, interval: float = STREAM_UPDATE_INTERVAL):
+        self.placeholder = placeholder
+        self.interval = interval
+        self._last_render = 0.0
+
+    def __call__(self, partial_text: str):
+        """Show the partial text with a cursor if the throttle interval has elapsed."""
+        now = time.monotonic()
+        if now - self._last_render >= self.interval:
+            self.placeholder.markdown(partial_text + STREAM_CURSOR)
+            self._last_render = now
+
+def process_user_message(user_message: str, message_placeholder):
+    """Run a conversation turn for the user message and render the response.
+
+    LLM-generated text is streamed into the placeholder as it arrives; canned
+    responses are rendered immediately. While the LLM scheduler is holding the
+    call back, the candidate's queue position is shown instead. The screening
+    session records both messages in the chat history.
+
+    Args:
+        user_message: Message from the user
+        message_placeholder: Streamlit placeholder to render the response into
+    """
+    def show_queue_position(position: int):
+        message_placeholder.markdown(
+            f"⏳ We're experiencing high demand right now. You're number {position} in the queue, "
+            "I'll be with you in a moment..."
+        )
+
+    with queue_position_listener(show_queue_position):
+        response = get_session().respond(user_message, on_token=StreamingPlaceholder(message_placeholder))
+
+    # Display the final response without cursor
+    message_placeholder.markdown(response)
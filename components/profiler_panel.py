@@ -0,0 +1,37 @@
+import streamlit as st
+from utils.constants import PROFILE_PANEL_REFRESH
+from utils.profiler import rerun_profiler
+
+def render_profiler_panel():
+    """Show rolling rerun percentiles in the sidebar when profiling is enabled."""
+    if not rerun_profiler.enabled:
+        return
+    with st.sidebar:
+        with st.expander("Rerun profile", expanded=False):
+            profiler_summary()
+
+@st.fragment(run_every=PROFILE_PANEL_REFRESH)
+def profiler_summary():
+    """Render the profiler summary, refreshing on its own so fragment reruns show up too."""
+    summary = rerun_profiler.summary()
+    if not summary["reruns"]:
+        st.caption("No reruns recorded yet.")
+        return
+
+    kinds = ", ".join(f"{count} {kind}" for kind, count in summary["kinds"].items())
+    st.caption(f"Last {summary['reruns']} reruns ({kinds}); {summary['llm_share']:.0%} of the time waiting on the LLM")
+    st.table([
+        {
+            "": row["name"],
+            "n": row["count"],
+            "p50 ms": f"{row['p50_ms']:.1f}",
+            "p95 ms": f"{row['p95_ms']:.1f}",
+            "p99 ms": f"{row['p99_ms']:.1f}",
+            "max ms": f"{row['max_ms']:.1f}",
+        }
+        for row in summary["rows"]
+    ])
+    if summary["dumps"]:
+        st.caption("Slowest reruns (cProfile):")
+        for path in summary["dumps"]:
+            st.code(path, language=None)
@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+import pytest
+
+# Keep metrics logs, spilled histories and candidate records of test sessions out of the working tree
+os.environ["TALENTSCOUT_METRICS_LOG"] = ""
+os.environ["TALENTSCOUT_HISTORY_DIR"] = tempfile.mkdtemp(prefix="talentscout-history-")
+os.environ["TALENTSCOUT_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="talentscout-db-"), "candidates.db")
+
+@pytest.fixture(autouse=True)
+def conversation_state_label():
+    """Undo conversation states that screening turns leave behind on the metrics label."""
+    from utils.metrics import conversation_state_var
+
+    token = conversation_state_var.set(conversation_state_var.get())
+    yield
+    conversation_state_var.reset(token)
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    """Answer LLM calls with the instant stub backend, unthrottled, and start from empty LLM caches."""
+    from utils import llm_handler
+    from utils.cache import QuestionCache
+    from utils.llm_backends import StubBackend, set_backend
+    from utils.scheduler import LLMScheduler, set_scheduler
+
+    backend = StubBackend(latency="fixed:0")
+    set_backend(backend)
+    set_scheduler(LLMScheduler(None, None, None, backoff_base=0, backoff_max=0))
+    monkeypatch.setattr(llm_handler, "question_cache", QuestionCache(path=None))
+    llm_handler.extraction_cache.clear()
+    yield backend
+    set_backend(None)
+    set_scheduler(None)
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+
+from bulk_screen import Checkpoint, run_bulk_screening
+from utils.llm_backends import stub_responder
+
+RECORDS = [
+    {"id": "a", "full_name": "Jane Doe", "experience": "3 years", "tech_stack": "Python, Django"},
+    {"id": "b", "full_name": "Omar Haddad", "experience": "8 years", "tech_stack": "Kotlin"},
+    {"id": "c", "intro": "I'm Mei Chen, 5 years of experience, I work with React and TypeScript"},
+]
+
+def run(tmp_path, **options):
+    input_path = tmp_path / "candidates.jsonl"
+    input_path.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+    args = argparse.Namespace(
+        input=str(input_path), output=str(tmp_path / "screened.jsonl"), checkpoint=None, restart=False,
+        concurrency=2, id_field="id", text_field=None, progress_every=100, **options,
+    )
+    counts = asyncio.run(run_bulk_screening(args))
+    lines = [json.loads(line) for line in (tmp_path / "screened.jsonl").read_text().splitlines()]
+    return counts, lines
+
+def test_screens_every_record(stub_backend, tmp_path):
+    counts, lines = run(tmp_path)
+    assert counts == (3, 0)
+    assert sorted(line["id"] for line in lines) == ["a", "b", "c"]
+    assert all(line["questions"] for line in lines)
+    assert not (tmp_path / "screened.jsonl.checkpoint").exists()
+
+def test_resume_skips_checkpointed_records_and_drops_later_output(stub_backend, tmp_path):
+    _, lines = run(tmp_path)
+    output = tmp_path / "screened.jsonl"
+    kept = "".join(json.dumps(line) + "\n" for line in lines[:2])
+    # A crash after two checkpointed records, halfway through writing the third
+    output.write_text(kept + '{"id": "partial')
+    checkpoint = Checkpoint(str(tmp_path / "screened.jsonl.checkpoint"))
+    for index in sorted(line["index"] for line in lines[:2]):
+        checkpoint.mark_done(index, len(kept.encode("utf-8")))
+
+    counts, resumed = run(tmp_path)
+    assert counts == (1, 0)
+    assert resumed[:2] == lines[:2]
+    assert sorted(line["id"] for line in resumed) == ["a", "b", "c"]
+
+def test_failed_records_are_retried_on_resume(stub_backend, tmp_path):
+    def responder(messages):
+        if "Kotlin" in messages[-1]["content"]:
+            raise RuntimeError("question generation down")
+        return stub_responder(messages)
+    stub_backend.responder = responder
+    counts, lines = run(tmp_path)
+    assert counts == (2, 1)
+    assert [line["id"] for line in lines if "error" in line] == ["b"]
+    assert (tmp_path / "screened.jsonl.checkpoint").exists()
+
+    stub_backend.responder = stub_responder
+    counts, lines = run(tmp_path)
+    assert counts == (1, 0)
+    assert lines[-1]["id"] == "b" and lines[-1]["questions"]
+    assert not (tmp_path / "screened.jsonl.checkpoint").exists()
+
+def test_checkpoint_tracks_out_of_order_records(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint"))
+    checkpoint.mark_done(1, 10)
+    checkpoint.mark_done(2, 20, failed=True)
+    assert (checkpoint.next_index, checkpoint.done) == (0, {1, 2})
+    checkpoint.mark_done(0, 30)
+
+    loaded = Checkpoint(checkpoint.path)
+    assert loaded.load()
+    assert (loaded.next_index, loaded.done, loaded.failed, loaded.output_bytes) == (3, set(), {2}, 30)
+    assert loaded.is_done(0) and loaded.is_done(1) and not loaded.is_done(2) and not loaded.is_done(3)
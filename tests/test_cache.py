@@ -0,0 +1,71 @@
+import json
+import time
+
+from utils import llm_handler
+from utils.cache import LRUTTLCache, QuestionCache
+from utils.llm_backends import stub_responder
+from utils.tech_stack import canonicalize_tech_stack, split_tech_stack
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUTTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_entries_expire_after_ttl():
+    cache = LRUTTLCache(max_entries=10, ttl=60)
+    cache.set("old", 1, stored_at=time.time() - 61)
+    cache.set("new", 2)
+    assert cache.get("old") is None
+    assert [key for key, _, _ in cache.items()] == ["new"]
+
+def test_question_cache_misses_until_every_variant_is_stored():
+    cache = QuestionCache(path=None, variants=2)
+    key = ("django", "python")
+    cache.put(key, ["q1"])
+    assert cache.get(key) is None
+    cache.put(key, ["q2"])
+    assert cache.get(key) in (["q1"], ["q2"])
+
+def test_question_cache_keeps_only_the_newest_variants():
+    cache = QuestionCache(path=None, variants=2)
+    for questions in (["q1"], ["q2"], ["q3"]):
+        cache.put(("go",), questions)
+    assert {tuple(cache.get(("go",))) for _ in range(50)} == {("q2",), ("q3",)}
+
+def test_question_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "questions.json"
+    cache = QuestionCache(path=str(path), variants=1)
+    cache.put(("go",), ["q1"])
+    assert QuestionCache(path=str(path), variants=1).get(("go",)) == ["q1"]
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text("{not json")
+    assert QuestionCache(path=str(path)).get(("go",)) is None
+
+def test_persisted_entries_past_their_ttl_are_dropped(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps({"entries": [{"key": ["go"], "variants": [[time.time() - 120, ["q1"]]]}]}))
+    assert QuestionCache(path=str(path), ttl=60, variants=1).get(("go",)) is None
+
+def test_tech_stacks_are_canonicalized():
+    assert split_tech_stack("Python3, ReactJS and node / Python") == ["python", "react", "node.js"]
+    assert canonicalize_tech_stack("Django, py") == canonicalize_tech_stack("python; django.") == ("django", "python")
+
+def test_generated_question_sets_are_served_from_the_cache(stub_backend):
+    calls = []
+    def responder(messages):
+        calls.append(messages)
+        return stub_responder(messages)
+    stub_backend.responder = responder
+
+    for _ in range(llm_handler.question_cache.variants):
+        llm_handler.generate_technical_questions("Elixir")
+    assert len(calls) == llm_handler.question_cache.variants
+    assert llm_handler.generate_technical_questions(" elixir. ")
+    assert len(calls) == llm_handler.question_cache.variants
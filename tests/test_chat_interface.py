@@ -0,0 +1,45 @@
+from streamlit.testing.v1 import AppTest
+
+from components.chat_interface import calculate_progress_percentage, candidate_info_lines
+from utils.constants import CHAT_HISTORY_WINDOW
+from utils.engine import ScreeningSession
+
+def test_progress_counts_fields_and_answered_questions():
+    session = ScreeningSession()
+    assert calculate_progress_percentage(session) == 0
+    for field in session.candidate_info:
+        session.candidate_info[field] = "x"
+    session.conversation_state = "asking_tech_questions"
+    session.tech_questions = ["q1", "q2"]
+    session.questions_answered = 1
+    assert calculate_progress_percentage(session) == 93
+    session.conversation_state = "conversation_end"
+    assert calculate_progress_percentage(session) == 100
+
+def test_sidebar_lists_only_filled_fields():
+    session = ScreeningSession()
+    session.candidate_info["full_name"] = "Jane Doe"
+    session.candidate_info["tech_stack"] = "Python"
+    assert candidate_info_lines(session) == ("**Name:** Jane Doe", "**Tech Stack:** Python")
+
+def test_app_renders_a_turn_and_refreshes_the_sidebar(stub_backend):
+    app = AppTest.from_file("app.py", default_timeout=30).run()
+    assert not app.exception
+    assert len(app.chat_message) == 1 and not app.sidebar.markdown
+
+    app.chat_input[0].set_value("Jane Doe").run()
+    assert not app.exception
+    assert [message.role for message in app.session_state.screening.messages] == ["assistant", "user", "assistant"]
+    assert app.chat_message[1].markdown[0].value == "Jane Doe"
+    assert "**Name:** Jane Doe" in [element.value for element in app.sidebar.markdown]
+
+def test_only_the_latest_messages_are_rendered(stub_backend):
+    app = AppTest.from_file("app.py", default_timeout=30).run()
+    session = app.session_state.screening
+    for index in range(CHAT_HISTORY_WINDOW * 2):
+        session.messages.append("user", f"message {index}")
+    app.run()
+    assert len(app.chat_message) == CHAT_HISTORY_WINDOW
+
+    app.button(key="show_earlier_messages").click().run()
+    assert len(app.chat_message) == min(len(session.messages), CHAT_HISTORY_WINDOW * 2)
@@ -0,0 +1,22 @@
+import json
+import subprocess
+import sys
+
+from utils.llm_backends import GroqBackend, get_http_client
+
+# Heavy modules the app loads only in the background warm-up or on first use
+DEFERRED_MODULES = ["groq", "httpx", "numpy", "pydantic", "dotenv"]
+
+def test_app_modules_import_without_the_heavy_dependencies():
+    code = (
+        "import json, sys\n"
+        "import utils.engine, utils.llm_handler, utils.llm_backends, utils.session_state\n"
+        f"print(json.dumps([name for name in {DEFERRED_MODULES!r} if name in sys.modules]))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == []
+
+def test_groq_clients_share_one_http_pool(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    first, second = GroqBackend(), GroqBackend()
+    assert first.client._client is second.client._client is get_http_client()
@@ -0,0 +1,102 @@
+import asyncio
+
+from utils.constants import FIXED_RESPONSES, GREETING_MESSAGE, STATE_PROMPTS, STATE_RETRY_PROMPTS, STATES
+from utils.engine import ScreeningSession
+from utils.llm_backends import stub_responder
+
+INTAKE = ["Jane Doe", "jane@example.com", "+1 555 123 4567", "5 years", "Backend Engineer", "Berlin"]
+
+def run_intake(session, messages=INTAKE):
+    for message in messages:
+        session.respond(message)
+
+def test_no_questions_when_generation_fails(stub_backend):
+    def responder(messages):
+        if "TECH STACK:" in messages[-1]["content"]:
+            raise RuntimeError("question generation down")
+        return stub_responder(messages)
+    stub_backend.responder = responder
+
+    session = ScreeningSession()
+    run_intake(session)
+    # Neither technology is in the question bank, so every question has to be generated
+    response = session.respond("Kotlin, Elixir")
+
+    assert response == FIXED_RESPONSES["no_questions"]
+    assert session.conversation_state == STATES["conversation_end"]
+    assert session.tech_questions == []
+
+def test_multi_field_message_skips_satisfied_states(stub_backend):
+    session = ScreeningSession()
+    response = session.respond("I'm Jane Doe, jane@example.com, +1 555 123 4567, 5 years, Data Engineer, Berlin")
+    assert session.conversation_state == STATES["collecting_tech_stack"]
+    assert session.candidate_info["location"] == "Berlin"
+    assert response.endswith(STATE_PROMPTS["collecting_tech_stack"])
+
+def test_full_screening_reaches_the_end(stub_backend):
+    session = ScreeningSession()
+    run_intake(session)
+    first = session.respond("Python, Django")
+    assert session.conversation_state == STATES["asking_tech_questions"]
+    assert session.tech_questions[0] in first
+
+    for i in range(len(session.tech_questions)):
+        response = session.respond(f"My answer {i} covers the trade-offs.")
+    assert response == FIXED_RESPONSES["questions_done"]
+    assert session.conversation_state == STATES["conversation_end"]
+    assert [answer["question"] for answer in session.tech_answers] == session.tech_questions
+    assert len(session.assessment.result(timeout=10)["answers"]) == len(session.tech_questions)
+
+    assert session.respond("hello?") == FIXED_RESPONSES["after_end"]
+    # Greeting plus a user message and a response per turn
+    assert len(session.messages) == 1 + 2 * (len(INTAKE) + 1 + len(session.tech_questions) + 1)
+
+def test_invalid_answers_repeat_the_question(stub_backend):
+    session = ScreeningSession()
+    session.respond("Jane Doe")
+    assert session.respond("not an email") == STATE_RETRY_PROMPTS["collecting_email"]
+    assert session.conversation_state == STATES["collecting_email"]
+
+def test_answers_mentioning_quitting_are_not_exits(stub_backend):
+    session = ScreeningSession()
+    run_intake(session, INTAKE[:3])
+    session.respond("I quit my last job after 4 years")
+    assert session.conversation_state == STATES["collecting_position"]
+    assert session.candidate_info["experience"] == "4 years"
+
+def test_exit_ends_the_screening(stub_backend):
+    session = ScreeningSession()
+    run_intake(session, INTAKE[:2])
+    assert session.respond("I'm done") == FIXED_RESPONSES["exit"]
+    assert session.conversation_state == STATES["conversation_end"]
+
+def test_restart_starts_a_new_screening(stub_backend):
+    session = ScreeningSession()
+    run_intake(session, INTAKE[:2])
+    old_id = session.session_id
+    assert session.respond("start over") == GREETING_MESSAGE
+    assert session.conversation_state == STATES["collecting_name"]
+    assert session.session_id != old_id
+    assert session.candidate_info["full_name"] is None
+    assert [message.role for message in session.messages] == ["assistant"]
+
+def test_side_questions_keep_the_state(stub_backend):
+    session = ScreeningSession()
+    session.respond("Jane Doe")
+    response = session.respond("what can you do?")
+    assert session.conversation_state == STATES["collecting_email"]
+    assert response.endswith(STATE_PROMPTS["collecting_email"])
+
+def test_sessions_run_concurrently_on_an_event_loop(stub_backend):
+    async def screen(name):
+        session = ScreeningSession()
+        for message in [name, f"{name.split()[0].lower()}@example.com"]:
+            await session.handle(message)
+        return session
+
+    async def main():
+        return await asyncio.gather(screen("Jane Doe"), screen("Omar Haddad"))
+
+    sessions = asyncio.run(main())
+    assert [session.candidate_info["full_name"] for session in sessions] == ["Jane Doe", "Omar Haddad"]
+    assert all(session.conversation_state == STATES["collecting_phone"] for session in sessions)
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.extractors import extract_all_locally, extract_experience
+
+@pytest.mark.parametrize("message, expected", [
+    ("5 years", "5 years"),
+    ("I have 2.5 yrs of experience", "2.5 years"),
+    ("6+ years", "6+ years"),
+    ("3-5 years", "3-5 years"),
+    ("three to five years", "3-5 years"),
+    ("five years", "5 years"),
+    ("about a year", "1 year"),
+    ("7", "7 years"),
+    ("I'm a fresher", "0 years"),
+])
+def test_extract_experience(message, expected):
+    assert extract_experience(message) == expected
+
+@pytest.mark.parametrize("message", [
+    "I am 25 years old",
+    "I'm 30 years of age",
+    "I started coding 5 years ago",
+    "less than a year",
+    "fewer than two years",
+    "under 2 years",
+    "half a year",
+    "a year and a half",
+])
+def test_extract_experience_leaves_qualified_years_to_the_llm(message):
+    assert extract_experience(message) is None
+
+@pytest.mark.parametrize("message", [
+    "2 years and 4 years",
+    "I'm 25 years old with 3 years of experience",
+    "5 months",
+])
+def test_extract_experience_ambiguous_or_missing(message):
+    assert extract_experience(message) is None
+
+def test_extract_all_locally_skips_age():
+    found = extract_all_locally("I'm Jane, jane@example.com, 25 years old")
+    assert found == {"email": "jane@example.com"}
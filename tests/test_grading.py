@@ -0,0 +1,54 @@
+import json
+
+from utils.grading import grade_answers, submit_grading
+from utils.llm_handler import score_technical_answers
+from utils.metrics import conversation_state_var
+from utils.storage import CandidateStore
+
+ANSWERS = [
+    {"question": "What is a GIL?", "answer": "A lock"},
+    {"question": "What does asyncio do?", "answer": "It runs coroutines on an event loop with cooperative scheduling"},
+]
+
+def test_scores_are_clamped_and_averaged(stub_backend):
+    stub_backend.responder = lambda messages: json.dumps({"scores": [
+        {"score": 14, "feedback": "Great"}, {"score": -2},
+    ]})
+    assessment = score_technical_answers(ANSWERS)
+    assert [entry["score"] for entry in assessment["answers"]] == [10.0, 0.0]
+    assert assessment["answers"][1]["feedback"] == ""
+    assert assessment["answers"][0]["question"] == "What is a GIL?"
+    assert assessment["overall_score"] == 5.0
+
+def test_malformed_scores_fail(stub_backend):
+    for response in ('{"scores": [{"score": 5}]}', '{"scores": [{"score": "high"}, {"score": 1}]}', "not json"):
+        stub_backend.responder = lambda messages, response=response: response
+        assert score_technical_answers(ANSWERS) is None
+    assert score_technical_answers([]) is None
+
+def test_assessments_are_saved(stub_backend, tmp_path):
+    store = CandidateStore(path=str(tmp_path / "candidates.db"), flush_interval=0.01)
+    try:
+        assessment = grade_answers("s1", ANSWERS, store)
+        store.flush()
+        record = store.get("s1")
+        assert record["technical_score"] == assessment["overall_score"]
+        assert json.loads(record["technical_answers"]) == assessment["answers"]
+    finally:
+        store.close()
+
+def test_background_grading_copies_answers_and_keeps_the_state_label(stub_backend):
+    states = []
+    def responder(messages):
+        states.append(conversation_state_var.get())
+        return json.dumps({"scores": [{"score": 3}, {"score": 7}]})
+    stub_backend.responder = responder
+
+    answers = [dict(entry) for entry in ANSWERS]
+    conversation_state_var.set("asking_tech_questions")
+    future = submit_grading("s1", answers, None)
+    answers[0]["answer"] = "changed"
+    assessment = future.result(timeout=5)
+    assert assessment["overall_score"] == 5.0
+    assert assessment["answers"][0]["answer"] == "A lock"
+    assert states == ["asking_tech_questions"]
@@ -0,0 +1,67 @@
+import os
+
+from utils.constants import GREETING_MESSAGE
+from utils.engine import ScreeningSession, evict_idle_sessions
+from utils.history import ChatHistory, is_shared, share_response
+
+def contents(messages):
+    return [message.content for message in messages]
+
+def test_old_messages_spill_to_disk_and_read_back(tmp_path):
+    history = ChatHistory("s1", spill_dir=str(tmp_path), max_messages=4)
+    for index in range(10):
+        history.append("user", f"message {index}")
+    assert len(history) == 10
+    assert history.spilled > 0 and len(history.recent) <= 4
+    assert contents(history) == [f"message {index}" for index in range(10)]
+    assert contents(history[3:7]) == [f"message {index}" for index in range(3, 7)]
+    assert history[-1].content == "message 9" and history[0].content == "message 0"
+
+def test_byte_limit_keeps_the_latest_exchange(tmp_path):
+    history = ChatHistory("s1", spill_dir=str(tmp_path), max_bytes=10)
+    history.append("user", "x" * 50)
+    history.append("assistant", "y" * 50)
+    assert len(history.recent) == 2
+    history.append("user", "z" * 50)
+    assert len(history.recent) == 2 and contents(history) == ["x" * 50, "y" * 50, "z" * 50]
+
+def test_spill_all_and_restore(tmp_path):
+    history = ChatHistory("s1", spill_dir=str(tmp_path), max_messages=4)
+    for index in range(6):
+        history.append("user", f"message {index}")
+    history.spill_all()
+    assert history.recent == [] and len(history) == 6
+    history.restore()
+    assert len(history.recent) == 4
+    assert contents(history) == [f"message {index}" for index in range(6)]
+
+def test_clear_removes_the_spill_file(tmp_path):
+    history = ChatHistory("s1", spill_dir=str(tmp_path), max_messages=2)
+    for index in range(5):
+        history.append("user", f"message {index}")
+    assert os.path.exists(history.spill_path)
+    history.clear()
+    assert len(history) == 0 and not os.path.exists(history.spill_path)
+
+def test_only_canned_assistant_responses_are_shared(tmp_path):
+    history = ChatHistory("s1", spill_dir=str(tmp_path))
+    history.append("assistant", "".join(GREETING_MESSAGE))
+    history.append("user", "".join(GREETING_MESSAGE))
+    history.append("assistant", "Nice to meet you, Jane!")
+    assert is_shared(history[0].content)
+    assert not is_shared(history[1].content)
+    assert not is_shared(history[2].content)
+    assert share_response("Nice to meet you, Jane!") == "Nice to meet you, Jane!"
+
+def test_idle_sessions_are_evicted_and_reloaded(stub_backend):
+    session = ScreeningSession()
+    session.respond("Jane Doe")
+    before = contents(session.messages)
+    session.last_active -= 10 ** 6
+    assert evict_idle_sessions(idle_timeout=60) >= 1
+    assert session.evicted and session.messages.recent == []
+
+    session.touch()
+    assert not session.evicted and contents(session.messages) == before
+    session.respond("jane@example.com")
+    assert len(session.messages) == len(before) + 2
@@ -0,0 +1,38 @@
+import json
+import os
+
+import pytest
+
+from utils.intents import classify_intent
+
+SAMPLES_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "intent_samples.jsonl")
+
+with open(SAMPLES_PATH, "r", encoding="utf-8") as f:
+    SAMPLES = [json.loads(line) for line in f if line.strip()]
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[sample["message"] for sample in SAMPLES])
+def test_intent_samples(sample):
+    assert classify_intent(sample["message"], sample.get("state")) == sample["intent"]
+
+@pytest.mark.parametrize("state, message", [
+    ("collecting_experience", "I quit my last job after 4 years"),
+    ("collecting_position", "I'm done with frontend, looking for backend roles"),
+    ("collecting_location", "Leave the interview in Berlin"),
+    ("collecting_tech_stack", "Python, and I restart services with systemd"),
+    ("asking_tech_questions", "I'd stop the worker thread and restart it"),
+])
+def test_free_text_answers_are_not_intents(state, message):
+    assert classify_intent(message, state) is None
+
+@pytest.mark.parametrize("state", [
+    "collecting_name", "collecting_experience", "collecting_tech_stack", "asking_tech_questions",
+])
+def test_whole_message_requests_are_intents_in_every_state(state):
+    assert classify_intent("I'm done", state) == "exit"
+    assert classify_intent("can we start over?", state) == "restart"
+
+def test_phrases_match_anywhere_in_contact_states():
+    assert classify_intent("Jane here, I quit", "collecting_name") == "exit"
+
+def test_long_messages_are_answers():
+    assert classify_intent("exit " + "word " * 20) is None
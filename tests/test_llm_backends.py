@@ -0,0 +1,68 @@
+import json
+import random
+
+import pytest
+
+from utils.llm_backends import (
+    CassetteBackend, CassetteMissError, StubBackend, create_backend, parse_latency_spec, stub_responder,
+)
+
+def user(prompt):
+    return [{"role": "system", "content": "system"}, {"role": "user", "content": prompt}]
+
+@pytest.mark.parametrize("spec, low, high", [
+    ("fixed:0.5", 0.5, 0.5),
+    ("uniform:0.1:0.2", 0.1, 0.2),
+    ("normal:0.5:0.1", 0.0, float("inf")),
+    ("lognormal:0.8:0.3", 0.0, float("inf")),
+])
+def test_latency_specs(spec, low, high):
+    sample = parse_latency_spec(spec)
+    rng = random.Random(0)
+    assert all(low <= sample(rng) <= high for _ in range(100))
+
+@pytest.mark.parametrize("spec", ["fixed", "uniform:1", "gamma:1:2"])
+def test_invalid_latency_specs(spec):
+    with pytest.raises(ValueError):
+        parse_latency_spec(spec)
+
+def test_stub_answers_the_apps_prompts():
+    questions = json.loads(stub_responder(user("Respond in JSON. TECH STACK: Go, Rust")))["questions"]
+    assert len(questions) == 5 and "Go" in questions[0] and "Rust" in questions[1]
+    assert stub_responder(user("Extract the email from the message. USER MESSAGE: mail me at a@b.co")) == "a@b.co"
+    assert stub_responder(user("Extract the name from the message. USER MESSAGE: My name is Jane Doe.")) == "Jane Doe"
+    scores = json.loads(stub_responder(user("Score these. ANSWERS:\nA1: short answer\nA2: x")))["scores"]
+    assert [score["score"] for score in scores] == [2, 1]
+
+def test_stub_latency_and_timeouts():
+    slept = []
+    backend = StubBackend(latency="fixed:2", sleep=slept.append)
+    response = backend.complete(user("USER MESSAGE: Jane"), "model", 0.2, 10)
+    assert response.content == "Jane" and response.prompt_tokens > 0
+    assert slept == [2.0]
+    with pytest.raises(TimeoutError):
+        backend.complete(user("USER MESSAGE: Jane"), "model", 0.2, 10, timeout=1)
+
+def test_stub_streams_word_by_word():
+    backend = StubBackend(latency="fixed:0")
+    assert list(backend.stream(user("USER MESSAGE: Jane Doe"), "model", 0.2, 10)) == ["Jane", " Doe"]
+
+def test_cassette_replays_recorded_responses(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = CassetteBackend(path, mode="record", inner=StubBackend(latency="fixed:0"))
+    recorded = recorder.complete(user("USER MESSAGE: Jane"), "model", 0.2, 10, timeout=5)
+    assert "".join(recorder.stream(user("USER MESSAGE: Omar"), "model", 0.2, 10)) == "Omar"
+
+    player = CassetteBackend(path, mode="replay")
+    # The timeout doesn't change the response, so it isn't part of the request key
+    assert player.complete(user("USER MESSAGE: Jane"), "model", 0.2, 10).to_dict() == recorded.to_dict()
+    assert list(player.stream(user("USER MESSAGE: Omar"), "model", 0.2, 10)) == ["Omar"]
+    with pytest.raises(CassetteMissError):
+        player.complete(user("USER MESSAGE: Jane"), "other-model", 0.2, 10)
+
+def test_backend_names():
+    assert isinstance(create_backend("stub"), StubBackend)
+    with pytest.raises(ValueError):
+        create_backend("nope")
+    with pytest.raises(ValueError):
+        CassetteBackend(mode="record")
@@ -0,0 +1,69 @@
+from utils.llm_backends import stub_responder
+from utils.llm_handler import (
+    call_llm, extract_all_information, extract_information, generate_technical_questions, looks_like_multi_field,
+    normalize_message, complete_technical_questions,
+)
+
+def count_calls(backend):
+    calls = []
+    def responder(messages):
+        calls.append(messages[-1]["content"])
+        return stub_responder(messages)
+    backend.responder = responder
+    return calls
+
+def test_normalize_message():
+    assert normalize_message("  Jane   Doe. ") == "jane doe"
+    assert normalize_message("  Jane   Doe. ", casefold=False) == "Jane Doe"
+
+def test_extraction_answers_are_memoized(stub_backend):
+    calls = count_calls(stub_backend)
+    assert extract_information("Senior  Backend Engineer", "position") == "Senior Backend Engineer"
+    assert extract_information("Senior Backend Engineer.", "position") == "Senior Backend Engineer"
+    assert len(calls) == 1
+
+def test_names_keep_each_sessions_capitalization(stub_backend):
+    assert extract_information("jane doe", "name") == "jane doe"
+    assert extract_information("Jane Doe", "name") == "Jane Doe"
+    assert extract_all_information("I'm jane doe, berlin")["full_name"] == "jane doe"
+    assert extract_all_information("I'm Jane Doe, Berlin")["full_name"] == "Jane Doe"
+
+def test_streamed_completion_is_passed_on_as_it_grows(stub_backend):
+    partials = []
+    completion = call_llm(
+        "Write anything. USER MESSAGE: Jane Doe", 0.2, 50, "extract_information", on_token=partials.append
+    )
+    assert completion == "Jane Doe"
+    assert partials == ["Jane", "Jane Doe"]
+
+def test_streamed_questions_arrive_one_by_one(stub_backend):
+    seen = []
+    questions = generate_technical_questions("Elixir", lambda so_far: seen.append(len(so_far)))
+    assert len(questions) == 5
+    assert seen == [1, 2, 3, 4, 5]
+
+def test_multi_field_messages_are_detected():
+    assert looks_like_multi_field("Jane Doe, jane@example.com", "collecting_name")
+    assert looks_like_multi_field("Jane Doe, Berlin, Backend Engineer", "collecting_name")
+    assert not looks_like_multi_field("jane@example.com", "collecting_email")
+    assert not looks_like_multi_field("Jane Doe", "collecting_name")
+
+def test_every_field_is_extracted_from_one_message(stub_backend):
+    calls = count_calls(stub_backend)
+    found = extract_all_information("I'm Jane Doe, jane@example.com, +1 555 123 4567, 5 years, Data Engineer, Berlin")
+    assert found == {
+        "full_name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": "+15551234567",
+        "experience": "5 years",
+        "desired_position": "Data Engineer",
+        "location": "Berlin",
+    }
+    assert len(calls) == 1
+
+def test_partial_speculative_questions_are_completed_for_the_missing_stack(stub_backend):
+    speculative = [f"Python question {i}?" for i in range(5)]
+    questions = complete_technical_questions(speculative, ("python",), ("elixir",))
+    assert len(questions) == 5
+    assert sum("elixir" in question.lower() for question in questions) == 2
+    assert questions[0] == speculative[0]
@@ -0,0 +1,29 @@
+import argparse
+import asyncio
+import random
+
+from benchmarks.load_test import candidate_script, percentiles, run_load_test
+
+def test_candidate_scripts_cover_the_whole_flow():
+    rng = random.Random(0)
+    script = candidate_script(rng, multi_field=False)
+    assert len(script) == 6 + 1 + 5
+    assert len(candidate_script(rng, multi_field=True)) == 1 + 1 + 5
+
+def test_percentiles():
+    summary = percentiles([0.1 * i for i in range(1, 101)])
+    assert summary["count"] == 100
+    assert round(summary["p50"], 6) == 5.0
+    assert round(summary["p99"], 6) == 9.9
+    assert percentiles([]) == {"count": 0}
+
+def test_every_simulated_session_completes(stub_backend):
+    args = argparse.Namespace(
+        candidates=6, concurrency=6, latency="fixed:0", multi_field_ratio=0.5, generated_stack_ratio=0.5,
+        rpm=None, tpm=None, llm_concurrency=None, question_cache=False, seed=1, output=None,
+    )
+    results = asyncio.run(run_load_test(args))
+    assert results["completed_sessions"] == 6
+    assert results["incomplete_final_states"] == {}
+    # Stacks the question bank doesn't cover keep generation in the measurement
+    assert any(route.startswith("generate_") for route in results["routes"])
@@ -0,0 +1,56 @@
+import json
+
+from utils.cache import LRUTTLCache
+from utils.metrics import Histogram, LLMMetrics, conversation_state_var
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([1, 5, 10])
+    for value in (0.5, 3, 7, 20):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 3]
+    assert (histogram.count, histogram.sum) == (4, 30.5)
+
+def test_calls_are_labelled_and_logged(tmp_path):
+    log_path = tmp_path / "calls.jsonl"
+    metrics = LLMMetrics(log_path=str(log_path))
+    token = conversation_state_var.set("collecting_name")
+    try:
+        metrics.record("extract_information", "name", "small", "ok", 0.25, 40, 3)
+        metrics.record("extract_information", "name", "small", "error", 0.5, error="boom")
+    finally:
+        conversation_state_var.reset(token)
+
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [record["outcome"] for record in records] == ["ok", "error"]
+    assert records[0]["state"] == "collecting_name" and records[0]["prompt_tokens"] == 40
+    assert records[1]["error"] == "boom"
+
+def test_prometheus_export():
+    metrics = LLMMetrics(log_path=None)
+    metrics.record("generate_technical_questions", None, "large", "ok", 1.5, 200, 100)
+    metrics.record_escalation("extract_information", "email", "small", "invalid")
+    cache = LRUTTLCache(10, 60)
+    cache.get("missing")
+    metrics.register_cache("extraction", cache)
+
+    text = metrics.render_prometheus()
+    labels = 'call_site="generate_technical_questions",info_type="",state="none",model="large",outcome="ok"'
+    assert f"talentscout_llm_request_duration_seconds_count{{{labels}}} 1" in text
+    assert f'talentscout_llm_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f"talentscout_llm_completion_tokens_sum{{{labels}}} 100" in text
+    assert ('talentscout_llm_escalations_total{call_site="extract_information",info_type="email",'
+            'model="small",reason="invalid"} 1') in text
+    assert 'talentscout_cache_misses_total{cache="extraction"} 1' in text
+
+def test_route_summary():
+    metrics = LLMMetrics(log_path=None)
+    metrics.record("extract_information", "email", "small", "ok", 0.2)
+    metrics.record("extract_information", "email", "small", "not_found", 0.4)
+    metrics.record_escalation("extract_information", "email", "small", "not_found")
+    route = metrics.route_summary()["extract_information:email:small"]
+    assert route["calls"] == 2
+    assert round(route["mean_seconds"], 6) == 0.3
+    assert route["escalation_rate"] == 0.5
+
+    metrics.reset()
+    assert metrics.route_summary() == {}
@@ -0,0 +1,63 @@
+import pytest
+
+from utils.constants import DEFAULT_MODEL, SMALL_MODEL
+from utils.llm_backends import LLMResponse, StubBackend, set_backend, stub_responder
+from utils.llm_handler import call_llm, extract_information, get_model_route
+from utils.metrics import llm_metrics
+
+@pytest.fixture
+def models(stub_backend, monkeypatch):
+    """Record the model of every request, and let tests script answers per model."""
+    answers = {}
+    requested = []
+    def complete(messages, model, temperature, max_tokens, **options):
+        requested.append(model)
+        return LLMResponse(answers.get(model) or stub_responder(messages), model)
+    monkeypatch.setattr(stub_backend, "complete", complete)
+    llm_metrics.reset()
+    yield answers, requested
+    llm_metrics.reset()
+
+def escalations(reason):
+    return llm_metrics.escalations.get(("extract_information", "email", SMALL_MODEL, reason), 0)
+
+def test_routes():
+    assert get_model_route("extract_information", "email") == [SMALL_MODEL, DEFAULT_MODEL]
+    assert get_model_route("score_technical_answers") == [DEFAULT_MODEL]
+
+def test_small_model_answers_are_used(models):
+    answers, requested = models
+    answers[SMALL_MODEL] = "Backend Engineer"
+    assert extract_information("I'd like the backend engineering role", "position") == "Backend Engineer"
+    assert requested == [SMALL_MODEL]
+
+def test_not_found_escalates(models):
+    answers, requested = models
+    answers[SMALL_MODEL] = "NOT_FOUND"
+    answers[DEFAULT_MODEL] = "jane@example.com"
+    assert extract_information("Reach me at jane at example dot com", "email") == "jane@example.com"
+    assert requested == [SMALL_MODEL, DEFAULT_MODEL]
+    assert escalations("not_found") == 1
+
+def test_invalid_answers_escalate(models):
+    answers, requested = models
+    answers[SMALL_MODEL] = "my email"
+    answers[DEFAULT_MODEL] = "jane@example.com"
+    assert extract_information("Reach me at jane at example dot com", "email") == "jane@example.com"
+    assert escalations("invalid") == 1
+
+def test_last_model_answer_is_final(models):
+    answers, requested = models
+    answers[SMALL_MODEL] = answers[DEFAULT_MODEL] = "NOT_FOUND"
+    assert call_llm("prompt", 0.0, 10, "extract_information", "email") == "NOT_FOUND"
+    assert requested == [SMALL_MODEL, DEFAULT_MODEL]
+
+def test_slow_models_escalate_on_timeout(stub_backend):
+    # Every request takes a minute, but only the models before the last have a deadline
+    set_backend(StubBackend(latency="fixed:60", sleep=lambda seconds: None))
+    llm_metrics.reset()
+    try:
+        assert call_llm("Reach me at jane@example.com", 0.0, 10, "extract_information", "email") != ""
+        assert escalations("timeout") == 1
+    finally:
+        llm_metrics.reset()
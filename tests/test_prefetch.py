@@ -0,0 +1,54 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.prefetch import resolve_speculative, submit_speculative
+
+def started(task):
+    """Wait until the task is running or finished."""
+    while not (task.future.running() or task.future.done()):
+        time.sleep(0.001)
+    return task
+
+def test_exact_match_uses_the_result():
+    task = started(submit_speculative(None, ("python",), lambda: ["q1"]))
+    assert resolve_speculative(task, ("python",)) == ["q1"]
+
+def test_same_key_keeps_the_running_task():
+    task = submit_speculative(None, ("python",), lambda: ["q1"])
+    assert submit_speculative(task, ("python",), lambda: ["q2"]) is task
+
+def test_partial_match_is_filled_in():
+    task = started(submit_speculative(None, ("go", "python"), lambda: ["go q", "python q"]))
+    filled = resolve_speculative(
+        task, ("go", "python", "rust"), lambda result, covered, missing: result + [f"{m} q" for m in missing]
+    )
+    assert filled == ["go q", "python q", "rust q"]
+
+def test_partial_match_without_fill_is_discarded():
+    task = started(submit_speculative(None, ("go", "python"), lambda: ["q"]))
+    assert resolve_speculative(task, ("go", "python", "rust")) is None
+
+def test_low_coverage_or_extra_items_are_discarded():
+    task = started(submit_speculative(None, ("go",), lambda: ["q"]))
+    assert resolve_speculative(task, ("go", "java", "python", "rust"), lambda *args: ["filled"]) is None
+    task = started(submit_speculative(None, ("go", "php"), lambda: ["q"]))
+    assert resolve_speculative(task, ("go", "python"), lambda *args: ["filled"]) is None
+
+def test_queued_task_is_cancelled_instead_of_waited_for():
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    try:
+        task = submit_speculative(None, ("python",), lambda: ["q1"], executor=executor)
+        assert resolve_speculative(task, ("python",)) is None
+        assert task.future.cancelled()
+    finally:
+        release.set()
+        executor.shutdown()
+
+def test_failed_task_resolves_to_none():
+    def fail():
+        raise RuntimeError("boom")
+    task = started(submit_speculative(None, ("python",), fail))
+    assert resolve_speculative(task, ("python",)) is None
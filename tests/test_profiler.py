@@ -0,0 +1,93 @@
+import contextvars
+import os
+import threading
+import time
+
+import pytest
+
+from utils.profiler import RerunProfiler, RerunRecord, percentile
+
+@pytest.fixture
+def profiler():
+    profiler = RerunProfiler(window=10)
+    profiler.configure(True)
+    return profiler
+
+def test_disabled_profiler_records_nothing():
+    profiler = RerunProfiler()
+    profiler.configure(False)
+    with profiler.rerun("full"), profiler.phase("history"), profiler.llm_wait():
+        pass
+    assert profiler.summary()["reruns"] == 0
+
+def test_phases_and_llm_waits_are_timed(profiler):
+    with profiler.rerun("full"):
+        with profiler.phase("history"):
+            time.sleep(0.01)
+        with profiler.phase("process_message"), profiler.llm_wait():
+            time.sleep(0.02)
+    record = profiler.records[0]
+    assert record.phases["history"] >= 0.01
+    assert record.llm_wait >= 0.02
+    assert record.render == pytest.approx(record.total - record.llm_wait)
+
+    summary = profiler.summary()
+    assert summary["kinds"] == {"full": 1}
+    assert 0 < summary["llm_share"] < 1
+    assert {row["name"] for row in summary["rows"]} == {
+        "total", "llm_wait", "render", "phase:history", "phase:process_message",
+    }
+
+def test_nested_reruns_are_phases(profiler):
+    with profiler.rerun("full"), profiler.rerun("conversation"):
+        pass
+    assert len(profiler.records) == 1 and "conversation" in profiler.records[0].phases
+
+def test_concurrent_llm_waits_count_once(profiler):
+    def branch():
+        with profiler.llm_wait():
+            time.sleep(0.05)
+    with profiler.rerun("conversation"):
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(branch,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    record = profiler.records[0]
+    assert 0.05 <= record.llm_wait <= record.total < 0.15
+
+def test_overlapping_intervals_are_merged():
+    record = RerunRecord("full")
+    record.started = start = time.perf_counter() - 1
+    record.add_llm_interval(start + 0.1, start + 0.3)
+    record.add_llm_interval(start + 0.2, start + 0.4)
+    record.add_llm_interval(start + 0.5, start + 0.6)
+    # Waits still running when the rerun finishes are cut at its end
+    record.add_llm_interval(start + 0.9, start + 5)
+    record.finish()
+    assert record.llm_wait == pytest.approx(0.3 + 0.1 + (record.total - 0.9), abs=1e-6)
+
+    # Waits reported after the rerun finished are ignored
+    record.add_llm_interval(start, start + 1)
+    assert len(record._llm_intervals) == 4
+
+def test_window_and_percentiles(profiler):
+    for _ in range(15):
+        with profiler.rerun("conversation"):
+            pass
+    assert profiler.summary()["reruns"] == 10
+    assert percentile([1, 2, 3, 4], 0.5) == 3 and percentile([1, 2, 3, 4], 0.99) == 4
+    profiler.reset()
+    assert profiler.summary()["reruns"] == 0
+
+def test_only_the_slowest_dumps_are_kept(tmp_path):
+    profiler = RerunProfiler()
+    profiler.configure(True, dumps=2, dump_dir=str(tmp_path))
+    for delay in (0.03, 0.0, 0.02, 0.01):
+        with profiler.rerun("full"):
+            time.sleep(delay)
+    dumps = profiler.summary()["dumps"]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in dumps)
+    # File names end with the rerun's duration; the 0 ms and 10 ms reruns were dropped
+    kept_ms = [int(path.rsplit("-", 1)[1][:-len("ms.prof")]) for path in dumps]
+    assert len(kept_ms) == 2 and min(kept_ms) >= 15 and kept_ms == sorted(kept_ms, reverse=True)
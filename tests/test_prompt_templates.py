@@ -0,0 +1,55 @@
+import pytest
+
+from utils.constants import GRADING_ANSWER_TOKEN_LIMIT, PROMPT_TOKEN_BUDGETS
+from utils.prompt_templates import (
+    SYSTEM_PROMPT_TOKENS, all_templates, compact, get_answer_scoring_prompt, get_information_extraction_prompt,
+    get_technology_questions_prompt,
+)
+from utils.tokens import count_tokens, truncate_to_tokens
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    assert count_tokens("hello world") == 2
+    assert count_tokens("2024") == 2
+    # Long rare words break into several sub-word tokens
+    assert count_tokens("supercalifragilistic") > 1
+
+def test_short_texts_are_not_truncated():
+    assert truncate_to_tokens("short answer", 10) == "short answer"
+
+def test_truncation_keeps_the_beginning_and_end():
+    text = " ".join(f"word{index}" for index in range(200))
+    truncated = truncate_to_tokens(text, 30)
+    assert count_tokens(truncated) <= 30
+    assert truncated.startswith("word0 word1") and truncated.endswith("word199")
+    assert " [...] " in truncated
+
+def test_compact_normalizes_whitespace():
+    assert compact("\n  Extract   the name.\n\n\tReturn it.  \n") == "Extract the name.\nReturn it."
+
+def test_templates_have_one_slot_and_fit_their_budgets():
+    for name, template in all_templates().items():
+        assert "{" + template.slot + "}" not in template.prefix + template.suffix, name
+        budget = PROMPT_TOKEN_BUDGETS[template.call_site]
+        assert SYSTEM_PROMPT_TOKENS + template.fixed_tokens < budget, name
+
+@pytest.mark.parametrize("info_type", ["name", "email", "tech_stack"])
+def test_long_messages_are_truncated_to_the_budget(info_type):
+    message = "I have worked with many things. " * 500
+    prompt = get_information_extraction_prompt(message, info_type)
+    assert SYSTEM_PROMPT_TOKENS + count_tokens(prompt) <= PROMPT_TOKEN_BUDGETS["extract_information"] + 2
+    assert get_information_extraction_prompt("My name is Jane", info_type).count("My name is Jane") == 1
+
+def test_explicit_budget_overrides_the_default():
+    prompt = get_technology_questions_prompt("Python " * 200, 2, budget=SYSTEM_PROMPT_TOKENS + 120)
+    assert count_tokens(prompt) <= 122
+
+def test_scoring_prompt_truncates_each_answer():
+    answers = [
+        {"question": "What is a GIL?", "answer": "A lock. " * 1000},
+        {"question": "What is   asyncio?", "answer": "An event loop"},
+    ]
+    prompt = get_answer_scoring_prompt(answers)
+    first_answer = prompt.split("A1: ")[1].split("\nQ2:")[0]
+    assert count_tokens(first_answer) <= GRADING_ANSWER_TOKEN_LIMIT
+    assert "Q2: What is asyncio?" in prompt and "A2: An event loop" in prompt
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from utils import question_diversity
+from utils.question_bank import QuestionBank, experience_to_difficulty
+from utils.question_diversity import RecentQuestionIndex
+
+TOPICS = [
+    "memory management", "concurrency primitives", "unit testing", "packaging and releases", "error handling",
+    "performance profiling", "security hardening", "deployment pipelines", "structured logging", "static typing",
+    "dependency injection", "database migrations",
+]
+
+def pool(technology, count):
+    return [
+        {"question": f"What do you know about {topic} when working with {technology}?", "difficulty": 1 + i % 3}
+        for i, topic in enumerate(TOPICS[:count])
+    ]
+
+@pytest.fixture
+def bank(monkeypatch):
+    monkeypatch.setattr(question_diversity, "recent_questions", RecentQuestionIndex())
+    return QuestionBank(
+        {"python": pool("python", 12), "django": pool("django", 12), "go": pool("go", 1)},
+        {"Backend Developer": {"keywords": ["backend"], "questions": pool("backend services", 6)}},
+    )
+
+@pytest.mark.parametrize("mention, expected", [
+    ("Python", "technology:python"),
+    ("python3", "technology:python"),
+    ("Django REST framework", "technology:django"),
+    ("Backend Python", "technology:python"),
+    ("Backend", None),
+    ("Kotlin", None),
+])
+def test_lookup_technology(bank, mention, expected):
+    assert bank.lookup_technology(mention) == expected
+
+def test_lookup_position(bank):
+    assert bank.lookup_position("Senior Backend Engineer") == "position:Backend Developer"
+    assert bank.lookup_position("Designer") is None
+
+@pytest.mark.parametrize("experience, difficulty", [
+    ("1 year", 1), ("3-5 years", 2), ("10 years", 3), (None, 2), ("a while", 2),
+])
+def test_experience_to_difficulty(experience, difficulty):
+    assert experience_to_difficulty(experience) == difficulty
+
+def test_covered_stack_is_answered_from_the_bank(bank):
+    plan = bank.plan("Python, Django", "5 years", rng=random.Random(0))
+    assert len(plan.bank_questions) == 5
+    assert plan.uncovered == []
+    assert any(question.endswith("python?") for question in plan.bank_questions)
+    assert any(question.endswith("django?") for question in plan.bank_questions)
+
+def test_uncovered_technologies_get_their_share(bank):
+    plan = bank.plan("Python, Kotlin", rng=random.Random(0))
+    assert plan.uncovered == ["kotlin"]
+    assert len(plan.bank_questions) == 3
+    merged = plan.merge(["What are Kotlin coroutines?", "How do Kotlin sealed classes work?"])
+    assert merged[:3] == plan.bank_questions
+    assert len(merged) == 5
+
+def test_short_pools_leave_their_slots_to_the_llm(bank):
+    plan = bank.plan("Go", rng=random.Random(0))
+    assert len(plan.bank_questions) == 1
+    assert plan.uncovered == ["go"]
+
+def test_position_pool_tops_up_short_pools(bank):
+    plan = bank.plan("Go", desired_position="Backend Engineer", rng=random.Random(0))
+    assert len(plan.bank_questions) == 5
+    assert plan.uncovered == []
+
+def test_merge_drops_generated_near_duplicates(bank):
+    plan = bank.plan("Python, Kotlin", rng=random.Random(0))
+    assert plan.merge([plan.bank_questions[0]]) == plan.bank_questions
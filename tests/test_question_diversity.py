@@ -0,0 +1,46 @@
+import pytest
+
+from utils.question_diversity import RecentQuestionIndex, deduplicate, drop_similar, embed, select_diverse
+
+QUESTIONS = [
+    "How does the Python garbage collector handle reference cycles?",
+    "How does the Python garbage collector deal with reference cycles?",
+    "Explain how you would index a PostgreSQL table for range queries.",
+    "What are React hooks and when would you write a custom one?",
+]
+
+def filler(count):
+    return [f"Describe component {i} of a distributed billing system in detail." for i in range(count)]
+
+def test_deduplicate_drops_rewordings():
+    assert deduplicate(QUESTIONS) == [QUESTIONS[0], QUESTIONS[2], QUESTIONS[3]]
+
+def test_drop_similar_keeps_new_questions():
+    assert drop_similar(QUESTIONS[1:], [QUESTIONS[0]]) == QUESTIONS[2:]
+
+def test_embeddings_are_normalized():
+    vectors = embed(QUESTIONS)
+    assert (abs((vectors ** 2).sum(axis=1) - 1) < 1e-5).all()
+
+def test_repeat_similarity_fades_with_age():
+    index = RecentQuestionIndex(half_life=10)
+    index.add([QUESTIONS[0]])
+    fresh = index.repeat_similarity(embed([QUESTIONS[0], QUESTIONS[3]]))
+    assert fresh[0] == pytest.approx(1.0)
+    assert fresh[1] == 0.0
+
+    index.add(filler(10))
+    assert index.repeat_similarity(embed([QUESTIONS[0]]))[0] == pytest.approx(0.5)
+
+def test_index_forgets_questions_no_longer_penalized():
+    index = RecentQuestionIndex(half_life=10, min_penalty=0.25)
+    assert index.capacity == 20
+    index.add([QUESTIONS[0]] + filler(20))
+    assert len(index) == 20
+    assert index.repeat_similarity(embed([QUESTIONS[0]]))[0] == 0.0
+
+def test_select_diverse_avoids_recent_questions():
+    index = RecentQuestionIndex()
+    assert select_diverse(QUESTIONS, 2, index) == [QUESTIONS[0], QUESTIONS[2]]
+    index.add([QUESTIONS[0]])
+    assert QUESTIONS[0] not in select_diverse(QUESTIONS, 2, index)
@@ -0,0 +1,82 @@
+import asyncio
+import re
+import time
+
+import pytest
+
+from utils import llm_handler
+from utils.cache import QuestionCache
+from utils.constants import MAX_TECH_QUESTIONS
+from utils.llm_backends import stub_responder
+from utils.llm_handler import (
+    QUESTION_ERROR_FALLBACK, allocate_questions, generate_questions_fanout, generate_technical_questions, merge_questions,
+)
+
+@pytest.fixture(autouse=True)
+def single_variant_cache(stub_backend, monkeypatch):
+    """Serve a question set from the cache as soon as one has been stored."""
+    monkeypatch.setattr(llm_handler, "question_cache", QuestionCache(path=None, variants=1))
+
+def technology(messages):
+    match = re.search(r"TECH STACK:\s*(.+)", messages[-1]["content"])
+    return match.group(1).strip().lower() if match else None
+
+def test_allocation_favours_earlier_technologies():
+    assert allocate_questions(["python", "go"], 5) == [("python", 3), ("go", 2)]
+    assert allocate_questions(list("abcdefg"), 5) == [(name, 1) for name in "abcde"]
+
+def test_merge_is_round_robin_without_exact_repeats():
+    merged = merge_questions([["p1", "p2", "p3"], [], ["g1", "p1"]], 4)
+    assert merged == ["p1", "g1", "p2", "p3"]
+
+def test_one_request_per_technology(stub_backend):
+    seen = []
+    def responder(messages):
+        seen.append(technology(messages))
+        return stub_responder(messages)
+    stub_backend.responder = responder
+
+    questions = generate_technical_questions("Python, Go, Rust")
+    assert len(questions) == MAX_TECH_QUESTIONS
+    assert sorted(seen) == ["go", "python", "rust"]
+    # Each technology is asked about within the first round
+    assert all(name in " ".join(questions[:3]).lower() for name in ("python", "go", "rust"))
+
+    # The complete set is cached for the stack, in any order or spelling
+    assert generate_technical_questions("rust, go, python") == questions
+    assert len(seen) == 3
+
+def test_partial_merges_are_used_but_not_cached(stub_backend):
+    failing = {"go"}
+    def responder(messages):
+        if technology(messages) in failing:
+            raise RuntimeError("branch down")
+        return stub_responder(messages)
+    stub_backend.responder = responder
+
+    questions = generate_technical_questions("Python, Go")
+    assert questions and questions != QUESTION_ERROR_FALLBACK
+    assert all("go" not in question.lower().split() for question in questions)
+
+    failing.clear()
+    retried = generate_technical_questions("Python, Go")
+    assert any("go" in question.lower() for question in retried)
+
+def test_every_branch_failing_falls_back(stub_backend):
+    def responder(messages):
+        raise RuntimeError("down")
+    stub_backend.responder = responder
+    assert generate_technical_questions("Python, Go") == QUESTION_ERROR_FALLBACK
+
+def test_slow_branches_are_abandoned(stub_backend):
+    def responder(messages):
+        if technology(messages) == "go":
+            time.sleep(0.5)
+        return stub_responder(messages)
+    stub_backend.responder = responder
+
+    started = time.perf_counter()
+    questions, complete = asyncio.run(generate_questions_fanout(["python", "go"], timeout=0.05))
+    assert time.perf_counter() - started < 0.4
+    assert questions and not complete
+    assert llm_handler.question_cache.get(("fanout:3", "python"))
@@ -0,0 +1,39 @@
+import json
+
+from utils.question_parsing import QuestionStreamParser, has_questions, parse_question_lines, parse_questions
+
+def test_json_questions_are_cleaned():
+    text = '```json\n{"questions": ["1. What is a  GIL?", "", "How does asyncio work?"]}\n```'
+    assert parse_questions(text) == ["What is a GIL?", "How does asyncio work?"]
+
+def test_plain_text_falls_back_to_lines():
+    text = "Here are two questions:\n1. What is a GIL?\n2) How does asyncio work?\nGood luck"
+    assert parse_questions(text) == ["What is a GIL?", "How does asyncio work?"]
+    assert parse_question_lines("Why use Rust?\n- Explain ownership") == ["Why use Rust?", "Explain ownership"]
+
+def test_json_without_questions_is_rejected():
+    assert parse_questions('{"questions": []}') == []
+    assert not has_questions('{"answers": ["x"]}')
+
+def test_stream_emits_each_question_once_its_string_closes():
+    completion = json.dumps({"questions": ['What is "duck typing"?', "How do\nthreads differ?", "Why?"]})
+    parser = QuestionStreamParser()
+    emitted = []
+    for end in range(1, len(completion) + 1):
+        emitted.append(parser.feed(completion[:end]))
+    flat = [question for batch in emitted for question in batch]
+    assert flat == ['What is "duck typing"?', "How do threads differ?", "Why?"]
+    assert parser.questions == flat
+    # The first question is available as soon as its closing quote arrives
+    first = next(index for index, batch in enumerate(emitted) if batch)
+    assert first == completion.index('?"') + 1
+
+def test_text_after_the_array_is_ignored():
+    parser = QuestionStreamParser()
+    assert parser.feed('{"questions": ["What is a GIL?"], "note": "done"}') == ["What is a GIL?"]
+
+def test_a_new_completion_restarts_the_parse():
+    parser = QuestionStreamParser()
+    parser.feed('{"questions": ["What is a GIL?", "Wha')
+    assert parser.feed('{"questions": ["Explain ownership"]}') == ["Explain ownership"]
+    assert parser.questions == ["Explain ownership"]
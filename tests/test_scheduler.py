@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from utils.scheduler import (
+    LLMScheduler, TokenBucket, background_context, is_retryable, queue_position_callback, queue_position_listener,
+    retry_after,
+)
+
+class APIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1, abs=0.05)
+    # Requests larger than the bucket only wait for a full bucket
+    assert bucket.wait_time(600) == pytest.approx(60, abs=0.05)
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(None)
+    bucket.take(10 ** 9)
+    assert bucket.wait_time(10 ** 9) == 0
+
+def test_retryable_errors():
+    assert is_retryable(APIError(429)) and is_retryable(APIError(503))
+    assert not is_retryable(APIError(400)) and not is_retryable(ValueError())
+    assert retry_after(APIError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(APIError(429)) is None
+
+def test_rate_limited_calls_are_retried():
+    scheduler = LLMScheduler(None, None, None, max_retries=3, backoff_base=0)
+    attempts = []
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise APIError(429)
+        return "ok"
+    assert scheduler.run(call, "extract_information") == "ok"
+    assert scheduler.stats["retries"] == 2
+
+def test_other_errors_fail_at_once():
+    scheduler = LLMScheduler(None, None, None, backoff_base=0)
+    def call():
+        raise APIError(400)
+    with pytest.raises(APIError):
+        scheduler.run(call, "extract_information")
+    assert (scheduler.stats["retries"], scheduler.stats["failures"]) == (0, 1)
+
+def test_waiting_calls_are_admitted_by_priority():
+    scheduler = LLMScheduler(None, None, max_concurrency=1)
+    release = threading.Event()
+    order = []
+
+    def submit(call_site, fn):
+        thread = threading.Thread(target=scheduler.run, args=(fn, call_site))
+        thread.start()
+        return thread
+
+    threads = [submit("generate_technical_questions", release.wait)]
+    while scheduler.stats["admitted"] < 1:
+        time.sleep(0.001)
+    threads.append(submit("score_technical_answers", lambda: order.append("score")))
+    while scheduler.queue_length() < 1:
+        time.sleep(0.001)
+    threads.append(submit("extract_information", lambda: order.append("extract")))
+    while scheduler.queue_length() < 2:
+        time.sleep(0.001)
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == ["extract", "score"]
+
+def test_queue_positions_are_reported_to_the_waiting_caller():
+    scheduler = LLMScheduler(None, None, max_concurrency=1)
+    release = threading.Event()
+    blocker = threading.Thread(target=scheduler.run, args=(release.wait, "extract_information"))
+    blocker.start()
+    while scheduler.stats["admitted"] < 1:
+        time.sleep(0.001)
+
+    positions = []
+    def waiting_call():
+        with queue_position_listener(positions.append):
+            scheduler.run(lambda: None, "extract_information")
+    waiter = threading.Thread(target=waiting_call)
+    waiter.start()
+    while not positions:
+        time.sleep(0.001)
+    release.set()
+    blocker.join(timeout=5)
+    waiter.join(timeout=5)
+    assert positions == [1]
+    assert scheduler.stats["queued"] == 1
+
+def test_background_contexts_do_not_report_queue_positions():
+    with queue_position_listener(print):
+        context = background_context()
+        assert queue_position_callback.get() is print
+    assert context.run(queue_position_callback.get) is None
@@ -0,0 +1,76 @@
+import json
+import sqlite3
+
+import pytest
+
+from utils.storage import CANDIDATE_FIELDS, CandidateStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = CandidateStore(path=str(tmp_path / "candidates.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+def test_fields_are_upserted_into_one_record(store):
+    store.save_field("s1", "full_name", "Jane Doe")
+    store.save_field("s1", "email", "jane@example.com")
+    store.save_field("s1", "full_name", "Jane Q. Doe")
+    store.flush()
+    record = store.get("s1")
+    assert (record["full_name"], record["email"]) == ("Jane Q. Doe", "jane@example.com")
+    assert record["completed_at"] is None
+
+def test_unknown_columns_are_ignored(store):
+    store.save_fields("s1", {"email": "jane@example.com", "session_id": "other", "bogus": 1})
+    store.flush()
+    assert store.get("s1")["email"] == "jane@example.com"
+    assert store.get("other") is None
+
+def test_completed_screenings_are_listed(store):
+    store.save_field("s1", "email", "a@example.com")
+    store.mark_completed("s2", {"email": "b@example.com", "desired_position": "Backend Engineer"}, 3)
+    store.flush()
+    completed = store.list_completed()
+    assert [record["session_id"] for record in completed] == ["s2"]
+    assert completed[0]["questions_answered"] == 3
+    assert [record["session_id"] for record in store.find_by_position("Backend")] == ["s2"]
+    assert [record["session_id"] for record in store.find_by_email("a@example.com")] == ["s1"]
+
+def test_answers_and_assessment(store):
+    answers = [{"question": "What is a GIL?", "answer": "A lock"}]
+    store.save_answers("s1", answers)
+    store.flush()
+    assert json.loads(store.get("s1")["technical_answers"]) == answers
+
+    scored = [{**answers[0], "score": 7, "feedback": "Brief"}]
+    store.save_assessment("s1", scored, 7.0)
+    store.flush()
+    record = store.get("s1")
+    assert json.loads(record["technical_answers"]) == scored
+    assert record["technical_score"] == 7.0 and record["scored_at"] is not None
+
+def test_writes_are_durable_after_close(tmp_path):
+    path = str(tmp_path / "candidates.db")
+    store = CandidateStore(path=path, batch_size=4, flush_interval=0.01)
+    for index in range(10):
+        store.save_field(f"s{index}", "email", f"c{index}@example.com")
+    store.close()
+    assert len(CandidateStore(path=path).list_completed(limit=100)) == 0
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT COUNT(*) FROM candidates").fetchone()[0] == 10
+    connection.close()
+
+def test_older_databases_gain_added_columns(tmp_path):
+    path = str(tmp_path / "candidates.db")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        f"CREATE TABLE candidates (session_id TEXT PRIMARY KEY, {', '.join(f'{field} TEXT' for field in CANDIDATE_FIELDS)}, "
+        "questions_answered INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+        "completed_at REAL)"
+    )
+    connection.commit()
+    connection.close()
+    store = CandidateStore(path=path)
+    store.save_assessment("s1", [], 5.0)
+    store.close()
+    assert store.get("s1")["technical_score"] == 5.0
@@ -0,0 +1,170 @@
+"""In-process caches for LLM results."""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from utils.constants import (
+    QUESTION_CACHE_PATH,
+    QUESTION_CACHE_MAX_ENTRIES,
+    QUESTION_CACHE_TTL,
+    QUESTION_CACHE_VARIANTS,
+)
+
+class LRUTTLCache:
+    """Thread-safe mapping with LRU eviction and a per-entry time-to-live."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        """Create an empty cache.
+
+        Args:
+            max_entries: Maximum number of keys kept before evicting the least recently used
+            ttl: Seconds an entry stays valid after it was stored
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, stored_at: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (stored_at if stored_at is not None else time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[Hashable, float, Any]]:
+        """Return (key, stored_at, value) for every live entry, oldest first."""
+        with self._lock:
+            now = time.time()
+            return [
+                (key, stored_at, value)
+                for key, (stored_at, value) in self._entries.items()
+                if now - stored_at <= self.ttl
+            ]
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+class QuestionCache:
+    """Cache of generated technical question sets keyed by canonical tech stack.
+
+    Each key holds up to `variants` independently generated question sets. Until a
+    key has all its variants, lookups report a miss so new candidates keep adding
+    fresh sets; after that a random variant is served, so candidates with the same
+    stack don't all get identical questions. Entries are persisted to a JSON file
+    so they survive Streamlit restarts.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = QUESTION_CACHE_PATH,
+        max_entries: int = QUESTION_CACHE_MAX_ENTRIES,
+        ttl: float = QUESTION_CACHE_TTL,
+        variants: int = QUESTION_CACHE_VARIANTS,
+    ):
+        """Create the cache and load any persisted entries.
+
+        Args:
+            path: JSON file used for persistence, or None to keep the cache in memory only
+            max_entries: Maximum number of tech stacks kept
+            ttl: Seconds a question set stays valid
+            variants: Number of question sets kept per tech stack
+        """
+        self.path = path
+        self.variants = variants
+        self.hits = 0
+        self.misses = 0
+        self._cache = LRUTTLCache(max_entries, ttl)
+        self._lock = threading.RLock()
+        self._load()
+
+    def get(self, key: Tuple[str, ...]) -> Optional[List[str]]:
+        """Return a cached question set for the tech stack, or None on a miss."""
+        with self._lock:
+            question_sets = self._live_variants(self._cache.get(key))
+            if len(question_sets) < self.variants:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return list(random.choice(question_sets)[1])
+
+    def put(self, key: Tuple[str, ...], questions: List[str]) -> None:
+        """Add a generated question set for the tech stack and persist the cache."""
+        if not key or not questions:
+            return
+        with self._lock:
+            question_sets = self._live_variants(self._cache.get(key))
+            question_sets.append((time.time(), list(questions)))
+            self._cache.set(key, question_sets[-self.variants:])
+            self._save()
+
+    def _live_variants(self, question_sets: Optional[List]) -> List[Tuple[float, List[str]]]:
+        """Drop question sets older than the TTL."""
+        now = time.time()
+        return [entry for entry in question_sets or [] if now - entry[0] <= self._cache.ttl]
+
+    def _load(self) -> None:
+        """Load persisted entries from disk, ignoring a missing or corrupt file."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in data.get("entries", []):
+                question_sets = self._live_variants(
+                    [(stored_at, questions) for stored_at, questions in entry["variants"]]
+                )
+                if question_sets:
+                    self._cache.set(tuple(entry["key"]), question_sets, stored_at=question_sets[-1][0])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading question cache: {e}")
+
+    def _save(self) -> None:
+        """Write all live entries to disk atomically."""
+        if not self.path:
+            return
+        data: Dict[str, Any] = {
+            "entries": [
+                {"key": list(key), "variants": [[stored_at, questions] for stored_at, questions in value]}
+                for key, _, value in self._cache.items()
+            ]
+        }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving question cache: {e}")
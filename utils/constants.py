@@ -19,6 +19,64 @@ MAX_TECH_QUESTIONS = 5
 # List of exit keywords that will end the conversation
 EXIT_KEYWORDS = ["exit", "quit", "end", "stop", "bye", "goodbye"]
 
+# Phrases signalling each locally handled intent, matched on whole words.
+# Single words and INTENT_STANDALONE_PHRASES only count when the rest of the
+# message is filler (see INTENT_FILLER_WORDS); other multi-word phrases count
+# anywhere in a short message.
+INTENT_PHRASES = {
+    "exit": EXIT_KEYWORDS + [
+        "end the interview", "end the conversation", "stop the interview", "end the chat",
+        "i quit", "i'm done", "i am done", "leave the interview", "no longer interested",
+        "not interested anymore", "cancel the interview",
+    ],
+    "restart": [
+        "restart", "reset", "start over", "start again", "begin again",
+        "restart the interview", "start a new interview", "start the interview over", "start the interview again",
+    ],
+    "help": [
+        "help", "i need help", "what can you do", "how does this work", "what is this", "what should i do",
+        "what do i do", "what happens next", "how long does this take", "how many questions",
+    ],
+    "clarification": [
+        "what do you mean", "what does that mean", "i don't understand", "i do not understand",
+        "don't understand the question", "clarify", "rephrase", "repeat the question", "can you repeat",
+        "say that again", "what was the question", "not sure what you mean", "pardon",
+    ],
+    "off_topic": [
+        "tell me a joke", "what's the weather", "what is the weather", "who are you", "are you a bot",
+        "are you human", "are you real", "what's your name", "what is your name", "meaning of life",
+        "who made you", "who built you", "sing a song",
+    ],
+}
+
+# Phrases common in technical answers ("start over the pod"), which like single
+# words only count as the whole message: "can we start over?"
+INTENT_STANDALONE_PHRASES = ["start over", "start again", "begin again"]
+
+# Intents whose phrases all count only as the whole message in a given state;
+# free-text answers are full of "restart", "quit" and "I'm done" ("I quit my
+# last job after 4 years", "I restart failed deployments")
+INTENT_STANDALONE_STATES = {
+    STATES[state]: ["exit", "restart"]
+    for state in (
+        "collecting_experience", "collecting_position", "collecting_location", "collecting_tech_stack",
+        "asking_tech_questions",
+    )
+}
+
+# When several intents match, the first in this order wins
+INTENT_PRIORITY = ["exit", "restart", "clarification", "help", "off_topic"]
+
+# Words that may surround a single-word intent keyword ("please stop", "ok bye")
+INTENT_FILLER_WORDS = {
+    "a", "again", "all", "and", "can", "could", "for", "i", "i'd", "i'm", "it", "just", "let's", "like",
+    "me", "now", "ok", "okay", "please", "so", "sorry", "thank", "thanks", "that", "the", "this", "to",
+    "us", "want", "we", "well", "would", "you", "interview", "conversation", "chat", "hmm", "um",
+}
+
+# Messages longer than this are treated as answers, never as intents
+INTENT_MAX_WORDS = 12
+
 # Regular expressions for validation
 EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 PHONE_REGEX = r'^\+?[0-9]{10,15}$'
@@ -46,5 +104,254 @@ TECH_POSITIONS = [
     "QA Engineer",
 ]
 
-# Typing effect configuration
-TYPING_SPEED = 0.01  # Seconds per character
\ No newline at end of file
+# Streaming display configuration
+STREAM_UPDATE_INTERVAL = 0.05  # Minimum seconds between placeholder re-renders
+STREAM_CURSOR = "▌"
+
+# Chat history rendering
+CHAT_HISTORY_WINDOW = 20  # Most recent messages shown; "Show earlier messages" reveals this many more
+
+# Per-session chat history memory; older messages spill to an on-disk log
+HISTORY_MAX_MESSAGES = 40  # Messages kept in memory per session
+HISTORY_MAX_BYTES = 32 * 1024  # Message text kept in memory per session
+HISTORY_SPILL_DIR = "data/history"  # Override with TALENTSCOUT_HISTORY_DIR
+
+# Idle sessions release their in-memory history after this many seconds
+SESSION_IDLE_TIMEOUT = 30 * 60
+SESSION_SWEEP_INTERVAL = 60  # Seconds between idle session sweeps
+
+# Canonical technology names keyed by common aliases (all lowercase)
+TECH_SYNONYMS = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "es6": "javascript",
+    "ts": "typescript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "springboot": "spring boot",
+    "spring-boot": "spring boot",
+    "ror": "rails",
+    "ruby on rails": "rails",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "dotnet": ".net",
+    "asp.net": ".net",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "microsoft azure": "azure",
+}
+
+# Technical question cache configuration
+QUESTION_CACHE_PATH = ".cache/tech_questions.json"
+QUESTION_CACHE_MAX_ENTRIES = 500
+QUESTION_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds
+QUESTION_CACHE_VARIANTS = 3  # Question sets kept per tech stack
+
+# Stacks with at least this many technologies get their questions from concurrent
+# per-technology requests, merged round-robin
+QUESTION_FANOUT_MIN_TECHNOLOGIES = 2
+QUESTION_FANOUT_TIMEOUT = 8.0  # Seconds before the merge goes ahead with the branches that finished
+QUESTION_FANOUT_MAX_WORKERS = 16
+QUESTION_FANOUT_TOKENS_PER_QUESTION = 120  # Completion tokens allowed per requested question
+
+# Question diversity: local hashed n-gram embeddings and an index of recently asked questions
+QUESTION_EMBEDDING_DIM = 256
+QUESTION_EMBEDDING_CACHE_SIZE = 4096  # Embeddings of recurring (e.g. bank) questions kept
+QUESTION_DUPLICATE_THRESHOLD = 0.8  # Cosine similarity from which two questions are near-duplicates
+QUESTION_REPEAT_HALF_LIFE = 25  # Questions asked since a repeat after which its penalty halves
+QUESTION_REPEAT_MIN_PENALTY = 1e-3  # Repeat penalties below this are ignored, bounding how many questions are remembered
+QUESTION_MMR_LAMBDA = 0.3  # Weight of relevance against similarity to chosen and recently asked questions
+QUESTION_DIVERSITY_CANDIDATES = 5  # Extra bank questions considered beyond those needed
+
+# Question bank: years of experience from which intermediate and advanced questions are asked
+DIFFICULTY_EXPERIENCE_YEARS = (2, 6)
+
+# Intake steps in order: (conversation state, info_type, candidate_info field)
+COLLECTION_STEPS = [
+    ("collecting_name", "name", "full_name"),
+    ("collecting_email", "email", "email"),
+    ("collecting_phone", "phone", "phone"),
+    ("collecting_experience", "experience", "experience"),
+    ("collecting_position", "position", "desired_position"),
+    ("collecting_location", "location", "location"),
+    ("collecting_tech_stack", "tech_stack", "tech_stack"),
+]
+
+# Question asked when entering each intake state
+STATE_PROMPTS = {
+    "collecting_name": "Could you please tell me your full name?",
+    "collecting_email": "Could you please provide your email address?",
+    "collecting_phone": "Now, could you please share your phone number?",
+    "collecting_experience": "How many years of experience do you have in your field?",
+    "collecting_position": "What position(s) are you interested in applying for?",
+    "collecting_location": "Where are you currently located?",
+    "collecting_tech_stack": "Now, please list your tech stack - the programming languages, frameworks, databases, and tools you're proficient in.",
+}
+
+# Explanation given when the candidate asks what an intake question means
+STATE_CLARIFICATIONS = {
+    "collecting_name": "I just need the name you'd like us to use in your application, e.g. \"Jane Doe\".",
+    "collecting_email": "I need an email address our recruiters can reach you at, e.g. jane.doe@example.com.",
+    "collecting_phone": "I need a phone number our recruiters can call you on. Any format works, including international numbers.",
+    "collecting_experience": "I'm asking how many years you have worked professionally in tech, e.g. \"5 years\" or \"3-5 years\".",
+    "collecting_position": "I'm asking which role(s) you'd like to be considered for, e.g. \"Backend Developer\" or \"Data Scientist\".",
+    "collecting_location": "I'm asking where you are based, ideally as city and country, e.g. \"Berlin, Germany\".",
+    "collecting_tech_stack": "I'm asking which technologies you work with, e.g. \"Python, Django, PostgreSQL, Docker\". I'll base the technical questions on them.",
+}
+
+# Asked again when the answer to an intake question couldn't be understood
+STATE_RETRY_PROMPTS = {
+    "collecting_name": "I didn't catch your full name. Could you please provide it again?",
+    "collecting_email": "That doesn't look like a valid email address. Could you please provide it in the format example@domain.com?",
+    "collecting_phone": "I couldn't recognize that as a valid phone number. Could you please provide it again?",
+    "collecting_experience": "I didn't catch your years of experience. Could you please provide it as a number or range?",
+    "collecting_position": "I didn't understand which position you're interested in. Could you please specify again?",
+    "collecting_location": "I didn't catch your location. Could you please specify your city and country?",
+    "collecting_tech_stack": "I didn't catch your tech stack. Please list programming languages, frameworks, databases, and tools you're proficient in.",
+}
+
+# Acknowledgement of an answered intake question (the name is acknowledged by name)
+STATE_ACKNOWLEDGEMENTS = {
+    "collecting_email": "Thank you!",
+    "collecting_phone": "Great!",
+    "collecting_experience": "Thank you!",
+    "collecting_position": "Excellent!",
+    "collecting_location": "Thanks!",
+    "collecting_tech_stack": "Great!",
+}
+
+# Replies that don't depend on the candidate
+FIXED_RESPONSES = {
+    "exit": "Thank you for your time! Your information has been recorded and our team will be in touch soon. Have a great day!",
+    "no_questions": "Thank you for providing your information. Unfortunately, I couldn't generate technical questions at this time. Our team will review your profile and get back to you soon!",
+    "questions_done": "Thank you for answering all the technical questions! We've collected all the necessary information for now. Our recruitment team will review your profile and get back to you shortly if there's a good match. Do you have any questions for us?",
+    "after_end": "Our team has received your information and will be in touch soon. Have a great day!",
+    "not_understood": "I apologize, but I didn't understand that. Could you please try again or rephrase your message?",
+}
+
+# Human-readable labels for candidate_info fields
+FIELD_LABELS = {
+    "full_name": "name",
+    "email": "email",
+    "phone": "phone number",
+    "experience": "experience",
+    "desired_position": "desired position",
+    "location": "location",
+    "tech_stack": "tech stack",
+}
+
+# Speculative question pre-generation
+PREFETCH_MAX_WORKERS = 4
+PREFETCH_MIN_COVERAGE = 0.5  # Share of the final tech stack a speculative result must cover to be completed, not discarded
+
+# LLM backend configuration (overridable with TALENTSCOUT_* environment variables)
+DEFAULT_MODEL = "llama3-70b-8192"
+SMALL_MODEL = "llama3-8b-8192"
+DEFAULT_LLM_BACKEND = "groq"
+CASSETTE_PATH = "cassettes/llm.jsonl"
+STUB_LATENCY = "lognormal:0.8:0.3"  # Median 0.8s, see llm_backends.parse_latency_spec
+STUB_SEED = 42
+
+# HTTP connection pool shared by every Groq client in the process
+LLM_HTTP_MAX_CONNECTIONS = 20  # Covers the scheduler's concurrency plus background grading and prefetch
+LLM_HTTP_MAX_KEEPALIVE = 10  # Idle connections kept open for reuse
+LLM_HTTP_KEEPALIVE_EXPIRY = 120.0  # Seconds an idle connection is kept
+LLM_HTTP_CONNECT_TIMEOUT = 5.0  # Seconds
+LLM_HTTP_READ_TIMEOUT = 60.0  # Seconds
+
+# First message shown to every candidate
+GREETING_MESSAGE = "Hello! I'm TalentScout's Hiring Assistant. I'll help assess your fit for our technology positions. Could you please tell me your full name to get started?"
+
+# Worker threads running conversation turns for asynchronous sessions
+ENGINE_MAX_WORKERS = 64
+# Worker threads generating question sets whose first question is asked before the rest arrive;
+# one per turn thread, so a turn never waits behind speculative prefetches for a free worker
+QUESTION_STREAM_MAX_WORKERS = ENGINE_MAX_WORKERS
+
+# LLM call instrumentation
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]  # Seconds
+TOKEN_BUCKETS = [10, 50, 100, 250, 500, 1000, 2000, 4000]
+METRICS_LOG_PATH = "logs/llm_calls.jsonl"  # Override with TALENTSCOUT_METRICS_LOG ("" disables)
+METRICS_LOG_MAX_BYTES = 10 * 1024 * 1024
+METRICS_LOG_BACKUP_COUNT = 5
+
+# Rerun profiler (enable with TALENTSCOUT_PROFILE=1)
+PROFILE_WINDOW = 500  # Most recent reruns the percentiles are computed over
+PROFILE_DUMP_DIR = "logs/profiles"  # cProfile dumps of the slowest reruns; override with TALENTSCOUT_PROFILE_DIR
+PROFILE_PANEL_REFRESH = 5.0  # Seconds between refreshes of the debug panel
+
+# Shared LLM scheduler limits (None disables a limit)
+LLM_REQUESTS_PER_MINUTE = 30
+LLM_TOKENS_PER_MINUTE = 6000
+LLM_MAX_CONCURRENCY = 8
+LLM_MAX_RETRIES = 4
+LLM_BACKOFF_BASE = 0.5  # Seconds, doubled on every retry
+LLM_BACKOFF_MAX = 20.0  # Seconds
+
+# Admission priority per call site (lower runs first)
+LLM_CALL_PRIORITIES = {
+    "extract_information": 0,
+    "extract_all_information": 0,
+    "generate_technical_questions": 1,
+    "generate_technology_questions": 1,
+    "score_technical_answers": 2,
+}
+
+# Memoized extraction answers shared across sessions
+EXTRACTION_CACHE_MAX_ENTRIES = 10000
+EXTRACTION_CACHE_TTL = 24 * 60 * 60  # Seconds
+# Info types whose answers don't depend on the message's case; the others (names,
+# locations, positions) are keyed as written so sessions get their own capitalization back
+EXTRACTION_CACHE_CASELESS_TYPES = {"phone", "experience"}
+
+# Durable candidate store
+CANDIDATE_DB_PATH = "data/candidates.db"  # Override with TALENTSCOUT_DB_PATH
+CANDIDATE_DB_BATCH_SIZE = 200  # Writes committed in one transaction
+CANDIDATE_DB_FLUSH_INTERVAL = 0.05  # Seconds the writer waits to fill a batch
+
+# Prompt token budgets per call site, covering the system prompt and the rendered prompt.
+# Oversized user input is truncated to fit.
+PROMPT_TOKEN_BUDGETS = {
+    "extract_information": 400,
+    "extract_all_information": 600,
+    "generate_technical_questions": 400,
+    "generate_technology_questions": 250,
+    "score_technical_answers": 2500,
+}
+
+# Model cascade per call site, optionally specialized per info_type as "<call_site>:<info_type>".
+# Later models are tried when an earlier one answers NOT_FOUND, gives an invalid answer or times out;
+# unlisted call sites use DEFAULT_MODEL alone.
+MODEL_ROUTES = {
+    "extract_information": [SMALL_MODEL, DEFAULT_MODEL],
+    "extract_all_information": [SMALL_MODEL, DEFAULT_MODEL],
+    "generate_technical_questions": [DEFAULT_MODEL],
+    "generate_technology_questions": [DEFAULT_MODEL],
+}
+
+# Seconds a model may take before the cascade escalates (the last model in a cascade is never cut short)
+MODEL_TIMEOUTS = {
+    SMALL_MODEL: 5.0,
+    DEFAULT_MODEL: 15.0,
+}
+
+# Background scoring of technical answers
+GRADING_MAX_WORKERS = 2
+GRADING_ANSWER_TOKEN_LIMIT = 300  # Longer answers are truncated before scoring
+
+# Offline bulk screening (bulk_screen.py)
+BULK_CONCURRENCY = 8  # Records processed at once
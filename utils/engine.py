@@ -0,0 +1,690 @@
+"""Headless conversation engine for candidate screening.
+
+`ScreeningSession` owns everything about one candidate's screening (chat
+history, collected information, conversation state and technical questions)
+and has no Streamlit dependency, so the same flow can be driven by the
+Streamlit app, scripts, or many concurrent sessions on an asyncio event loop.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.constants import (
+    STATES,
+    COLLECTION_STEPS,
+    STATE_PROMPTS,
+    STATE_CLARIFICATIONS,
+    STATE_RETRY_PROMPTS,
+    STATE_ACKNOWLEDGEMENTS,
+    FIXED_RESPONSES,
+    FIELD_LABELS,
+    MAX_TECH_QUESTIONS,
+    ENGINE_MAX_WORKERS,
+    QUESTION_STREAM_MAX_WORKERS,
+    GREETING_MESSAGE,
+    SESSION_IDLE_TIMEOUT,
+    SESSION_SWEEP_INTERVAL,
+)
+from utils.llm_handler import (
+    extract_information,
+    extract_all_information,
+    looks_like_multi_field,
+    generate_technical_questions,
+    generate_questions_speculatively,
+    complete_technical_questions,
+    QUESTION_ERROR_FALLBACK,
+)
+from utils.grading import submit_grading
+from utils.history import ChatHistory, shared_response_bytes
+from utils.intents import classify_intent
+from utils.metrics import conversation_state_var
+from utils.prefetch import SpeculativeTask, submit_speculative, resolve_speculative
+from utils.profiler import rerun_profiler
+from utils.question_bank import question_bank
+from utils.question_diversity import recent_questions
+from utils.storage import CandidateStore
+from utils.tech_stack import canonicalize_tech_stack, split_tech_stack, detect_technologies
+
+# Runs the blocking parts of turns (LLM calls) for all sessions in the process
+_executor = ThreadPoolExecutor(max_workers=ENGINE_MAX_WORKERS, thread_name_prefix="screening")
+
+# Generates question sets a turn is waiting on; kept apart from the prefetch pool, which
+# speculative work from other sessions can fill
+_question_executor = ThreadPoolExecutor(max_workers=QUESTION_STREAM_MAX_WORKERS, thread_name_prefix="question-stream")
+
+# Every session alive in the process, for idle eviction and memory reports
+_live_sessions: "weakref.WeakSet[ScreeningSession]" = weakref.WeakSet()
+_sweeper: Optional[threading.Thread] = None
+_sweeper_lock = threading.Lock()
+
+def new_candidate_info() -> Dict[str, Optional[str]]:
+    """Return an empty candidate information dictionary."""
+    return {field: None for _, _, field in COLLECTION_STEPS}
+
+def _deep_size(value: Any) -> int:
+    """Approximate memory of a value made of dicts, lists and strings."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(key) + _deep_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_size(item) for item in value)
+    return size
+
+def assemble_technical_questions(
+    tech_stack: str,
+    experience: Optional[str] = None,
+    desired_position: Optional[str] = None,
+    speculative: Optional[SpeculativeTask] = None,
+    generate: Callable[[str], List[str]] = generate_technical_questions,
+) -> List[str]:
+    """Assemble a candidate's technical questions from the bank, generating what it can't supply.
+
+    Args:
+        tech_stack: Candidate's technology stack
+        experience: Candidate's stated experience, used to pick the difficulty
+        desired_position: Candidate's desired position, used to top up bank questions
+        speculative: Questions being generated in the background for a tentative stack, if any
+        generate: Function generating questions for the whole stack when the bank covers none of it
+
+    Returns:
+        The questions, also recorded as recently asked; empty if the bank
+        covers none of the stack and generation failed
+    """
+    plan = question_bank.plan(tech_stack, experience, desired_position)
+    questions = plan.bank_questions
+    if not questions:
+        # Nothing in the bank: generate the whole set
+        with rerun_profiler.llm_wait():
+            questions = resolve_speculative(speculative, canonicalize_tech_stack(tech_stack), complete_technical_questions)
+        if not questions:
+            questions = generate(tech_stack)
+        if questions == QUESTION_ERROR_FALLBACK:
+            questions = []
+    elif plan.uncovered:
+        with rerun_profiler.llm_wait():
+            generated = resolve_speculative(speculative, tuple(sorted(plan.uncovered)), complete_technical_questions)
+        if not generated:
+            generated = generate_technical_questions(", ".join(plan.uncovered))
+        if generated == QUESTION_ERROR_FALLBACK:
+            generated = []
+        questions = plan.merge(generated)
+    # Later candidates with similar stacks are steered away from these
+    recent_questions.add(questions)
+    return questions
+
+class ScreeningSession:
+    """State and conversation logic for one candidate's screening."""
+
+    def __init__(self, session_id: Optional[str] = None, store: Optional[CandidateStore] = None):
+        """Start a new screening at the greeting.
+
+        Args:
+            session_id: Identifier for the session; a random one is generated if omitted
+            store: Durable store receiving candidate information, or None to keep it in memory only
+        """
+        self.store = store
+        self.question_prefetch = None
+        self.pending_questions = None
+        self.messages: Optional[ChatHistory] = None
+        self._turn_lock = threading.Lock()
+        self.reset(session_id)
+        _live_sessions.add(self)
+        start_idle_sweeper()
+
+    def reset(self, session_id: Optional[str] = None) -> None:
+        """Start the screening over at the greeting, as a new candidate.
+
+        Args:
+            session_id: Identifier for the new screening; a random one is generated if omitted
+        """
+        if self.question_prefetch is not None:
+            self.question_prefetch.cancel()
+        if self.pending_questions is not None:
+            self.pending_questions.cancel()
+        if self.messages is not None:
+            self.messages.clear()
+        self.session_id = session_id or uuid.uuid4().hex
+        self.messages = ChatHistory(self.session_id)
+        self.messages.append("assistant", GREETING_MESSAGE)
+        self.candidate_info = new_candidate_info()
+        self.conversation_state = STATES["collecting_name"]
+        self.tech_questions: List[str] = []
+        self.current_question_idx = 0
+        self.questions_answered = 0
+        self.tech_answers: List[Dict[str, str]] = []
+        self.assessment: Optional[Future] = None
+        self.question_prefetch = None
+        self.pending_questions = None
+        self.last_active = time.monotonic()
+        self.evicted = False
+
+    def update_candidate_info(self, field: str, value: Any) -> None:
+        """Update a specific field in the candidate information.
+
+        Args:
+            field: The field to update
+            value: The value to set
+        """
+        self.candidate_info[field] = value
+        if self.store is not None:
+            self.store.save_field(self.session_id, field, value)
+
+    def respond(self, user_message: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Run one conversation turn.
+
+        The user message and the response are appended to the chat history and
+        the conversation state is advanced. Turns of the same session are
+        serialized.
+
+        Args:
+            user_message: Message from the user
+            on_token: Optional callback receiving a partial response while
+                LLM-generated text streams in
+
+        Returns:
+            The assistant's response
+        """
+        with self._turn_lock:
+            self.touch()
+            conversation_state_var.set(self.conversation_state)
+            self.messages.append("user", user_message)
+            result = self.get_next_state_response(self.conversation_state, user_message, on_token)
+            if result["next_state"] == STATES["conversation_end"] and self.conversation_state != STATES["conversation_end"]:
+                self.finish()
+            self.conversation_state = result["next_state"]
+            self.messages.append("assistant", result["response"])
+            return result["response"]
+
+    def touch(self) -> None:
+        """Mark the session as in use, reloading its history if it was evicted."""
+        self.last_active = time.monotonic()
+        if self.evicted:
+            self.messages.restore()
+            self.evicted = False
+
+    def evict(self) -> None:
+        """Release the memory of an idle session; touch() brings it back."""
+        self.messages.spill_all()
+        if self.question_prefetch is not None:
+            self.question_prefetch.cancel()
+            self.question_prefetch = None
+        if self.conversation_state == STATES["conversation_end"] and self.store is not None:
+            # Finished and persisted; nothing reads the questions or answers again
+            self.tech_questions = []
+            self.tech_answers = []
+        self.evicted = True
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Describe the session's memory footprint.
+
+        Returns:
+            Session id, state, message counts, idle time and approximate bytes held
+        """
+        state = {
+            key: value for key, value in vars(self).items()
+            if key not in ("messages", "store", "question_prefetch", "pending_questions", "assessment", "_turn_lock")
+        }
+        return {
+            "session_id": self.session_id,
+            "state": self.conversation_state,
+            "messages": len(self.messages),
+            "in_memory_messages": len(self.messages.recent),
+            "spilled_messages": self.messages.spilled,
+            "evicted": self.evicted,
+            "idle_seconds": time.monotonic() - self.last_active,
+            "bytes": sys.getsizeof(self) + _deep_size(state) + self.messages.memory_bytes(),
+        }
+
+    def finish(self) -> None:
+        """Record the completed screening and start scoring the technical answers in the background."""
+        if self.store is not None:
+            self.store.mark_completed(self.session_id, self.candidate_info, self.questions_answered)
+        if self.tech_answers:
+            self.assessment = submit_grading(self.session_id, self.tech_answers, self.store)
+
+    async def handle(self, user_message: str) -> str:
+        """Run one conversation turn without blocking the event loop.
+
+        Args:
+            user_message: Message from the user
+
+        Returns:
+            The assistant's response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, self.respond, user_message)
+
+    def prefetch_technical_questions(self, technologies: List[str]) -> None:
+        """Start generating questions for a tentative tech stack ahead of the tech stack step.
+        
+        Only technologies the question bank doesn't cover need generating. A task
+        already running for the same technologies is kept; one for different
+        technologies is cancelled and replaced.
+        
+        Args:
+            technologies: Canonical technology names signalled so far
+        """
+        _, technologies = question_bank.split_coverage(technologies)
+        if not technologies:
+            return
+        self.question_prefetch = submit_speculative(
+            self.question_prefetch,
+            tuple(sorted(technologies)),
+            generate_questions_speculatively,
+            ", ".join(technologies)
+        )
+
+    def prefetch_from_candidate_info(self) -> None:
+        """Speculate on the tech stack from what has been collected so far."""
+        if self.candidate_info["tech_stack"]:
+            self.prefetch_technical_questions(split_tech_stack(self.candidate_info["tech_stack"]))
+        elif self.candidate_info["desired_position"]:
+            self.prefetch_technical_questions(detect_technologies(self.candidate_info["desired_position"]))
+
+    def get_next_intake_state(self) -> Optional[str]:
+        """Find the first intake state whose candidate field is still empty.
+        
+        Returns:
+            Conversation state to collect next, or None if every field is filled
+        """
+        for state, _, field in COLLECTION_STEPS:
+            if not self.candidate_info.get(field):
+                return state
+        return None
+
+    def start_technical_questions(
+        self,
+        tech_stack: str,
+        acknowledgement: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """Assemble technical questions and build the response asking the first one.
+        
+        Args:
+            tech_stack: Candidate's technology stack
+            acknowledgement: Sentence acknowledging the candidate's last message
+            on_token: Optional callback receiving a partial response while questions stream in
+        
+        Returns:
+            Dictionary with next state and response message
+        """
+        intro = f"{acknowledgement} Based on your tech stack, I'd like to ask you a few technical questions to assess your proficiency.\n\nFirst question: "
+        
+        # When the bank covers none of the stack, the first generated question is asked as soon as it's written
+        show_first = (lambda question: on_token(intro + question)) if on_token is not None else None
+        self.tech_questions = assemble_technical_questions(
+            tech_stack,
+            self.candidate_info["experience"],
+            self.candidate_info["desired_position"],
+            self.question_prefetch,
+            lambda stack: self.generate_until_first_question(stack, show_first),
+        )
+        self.question_prefetch = None
+        if self.tech_questions:
+            return {
+                "next_state": STATES["asking_tech_questions"],
+                "response": intro + self.tech_questions[0]
+            }
+        else:
+            return {
+                "next_state": STATES["conversation_end"],
+                "response": FIXED_RESPONSES["no_questions"]
+            }
+
+    def generate_until_first_question(
+        self,
+        tech_stack: str,
+        on_first: Optional[Callable[[str], None]] = None
+    ) -> List[str]:
+        """Generate questions for the whole stack, returning once the first one is complete.
+        
+        The first question is all the response needs, so when the rest are still
+        streaming in they are left to finish in the background as
+        `pending_questions` and taken in by resolve_pending_questions.
+        
+        Args:
+            tech_stack: Candidate's technology stack
+            on_first: Optional callback receiving the first question as soon as it is complete
+        
+        Returns:
+            Every question if generation finished first, otherwise just the
+            first; empty if generation failed
+        """
+        first_question: List[str] = []
+        first_ready = threading.Event()
+        
+        def on_question(questions: List[str]):
+            if not first_question:
+                first_question.extend(questions[:1])
+                first_ready.set()
+        
+        task = submit_speculative(
+            None, canonicalize_tech_stack(tech_stack), generate_technical_questions, tech_stack, on_question,
+            executor=_question_executor
+        )
+        task.future.add_done_callback(lambda _: first_ready.set())
+        with rerun_profiler.llm_wait():
+            first_ready.wait()
+            if task.future.done() or not first_question:
+                questions = task.future.result()
+                return questions if questions != QUESTION_ERROR_FALLBACK else []
+        # Called from this thread, which may be the one allowed to render
+        if on_first is not None:
+            on_first(first_question[0])
+        self.pending_questions = task
+        return first_question
+    
+    def resolve_pending_questions(self) -> None:
+        """Wait for questions still being generated after the first one was asked and add them."""
+        if self.pending_questions is None:
+            return
+        task, self.pending_questions = self.pending_questions, None
+        try:
+            with rerun_profiler.llm_wait():
+                questions = task.future.result()
+        except Exception as e:
+            print(f"Error generating remaining questions: {e}")
+            return
+        if questions == QUESTION_ERROR_FALLBACK:
+            return
+        first = self.tech_questions[0]
+        remaining = [question for question in questions if question != first][:MAX_TECH_QUESTIONS - 1]
+        self.tech_questions = [first] + remaining
+        recent_questions.add(remaining)
+    
+    def advance_intake(self, acknowledgement: str, on_token: Optional[Callable[[str], None]] = None) -> Dict:
+        """Move to the next unfilled intake state, skipping any already satisfied.
+        
+        Args:
+            acknowledgement: Sentence acknowledging the candidate's last message
+            on_token: Optional callback receiving a partial response while questions stream in
+        
+        Returns:
+            Dictionary with next state and response message
+        """
+        next_state = self.get_next_intake_state()
+        if next_state is None:
+            return self.start_technical_questions(self.candidate_info["tech_stack"], acknowledgement, on_token)
+        
+        # Get a head start on the questions while the remaining intake steps run
+        self.prefetch_from_candidate_info()
+        return {
+            "next_state": next_state,
+            "response": f"{acknowledgement} {STATE_PROMPTS[next_state]}"
+        }
+
+    def handle_multi_field_message(self, user_message: str, on_token: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
+        """Fill every intake field found in a message and skip past satisfied states.
+        
+        Args:
+            user_message: User's message
+            on_token: Optional callback receiving a partial response while questions stream in
+        
+        Returns:
+            Dictionary with next state and response message, or None if no new field was found
+        """
+        extracted = {
+            field: value
+            for field, value in extract_all_information(user_message).items()
+            if not self.candidate_info.get(field)
+        }
+        if not extracted:
+            return None
+        
+        labels = [FIELD_LABELS[field] for _, _, field in COLLECTION_STEPS if field in extracted]
+        for field, value in extracted.items():
+            self.update_candidate_info(field, value)
+        
+        noted = labels[0] if len(labels) == 1 else f"{', '.join(labels[:-1])} and {labels[-1]}"
+        return self.advance_intake(f"Thanks, I've noted your {noted}.", on_token)
+
+    def current_prompt(self, current_state: str) -> str:
+        """Return what the candidate is currently being asked, to repeat after a side question."""
+        if current_state == STATES["asking_tech_questions"]:
+            return f"Current question: {self.tech_questions[self.current_question_idx]}"
+        return STATE_PROMPTS.get(current_state, "")
+
+    def handle_intent(self, intent: str, current_state: str) -> Dict:
+        """Answer a message classified locally by utils.intents.
+        
+        Args:
+            intent: Intent returned by classify_intent
+            current_state: Current conversation state
+        
+        Returns:
+            Dictionary with next state and response message
+        """
+        if intent == "exit":
+            return {
+                "next_state": STATES["conversation_end"],
+                "response": FIXED_RESPONSES["exit"]
+            }
+        
+        if intent == "restart":
+            self.reset()
+            # respond() records the greeting as this turn's response
+            self.messages.clear()
+            return {
+                "next_state": STATES["collecting_name"],
+                "response": GREETING_MESSAGE
+            }
+        
+        if intent == "clarification":
+            if current_state == STATES["asking_tech_questions"]:
+                response = f"Of course. Here is the question again: {self.tech_questions[self.current_question_idx]} There's no single right answer; describe how you would approach it in your own words."
+            elif current_state in STATE_CLARIFICATIONS:
+                response = f"{STATE_CLARIFICATIONS[current_state]} {STATE_PROMPTS[current_state]}"
+            else:
+                response = "Our team has received your information and will contact you about next steps. Is there anything else you'd like to know?"
+        elif intent == "help":
+            response = f"I'm TalentScout's Hiring Assistant. I'll collect a few details about you (name, contact details, experience, desired position, location and tech stack), then ask up to {MAX_TECH_QUESTIONS} technical questions about your tech stack. Type \"restart\" to start over or \"exit\" to end the interview at any time. {self.current_prompt(current_state)}"
+        else:
+            response = f"I'm only able to help with your TalentScout screening. {self.current_prompt(current_state)}"
+        return {
+            "next_state": current_state,
+            "response": response.strip()
+        }
+
+    def get_next_state_response(
+        self,
+        current_state: str,
+        user_message: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """Determine the next state and appropriate response based on current state and user input.
+        
+        Args:
+            current_state: Current conversation state
+            user_message: User's message
+            on_token: Optional callback receiving a partial response while LLM-generated
+                text streams in
+        
+        Returns:
+            Dictionary with next state and response message
+        """
+        # Requests to leave, restart, get help and the like are answered without an LLM call
+        intent = classify_intent(user_message, current_state)
+        if intent is not None:
+            return self.handle_intent(intent, current_state)
+        
+        # Candidates often answer several intake questions at once; extract them all in one call
+        if current_state in STATE_PROMPTS and current_state != STATES["collecting_tech_stack"]:
+            if looks_like_multi_field(user_message, current_state):
+                result = self.handle_multi_field_message(user_message, on_token)
+                if result:
+                    return result
+        
+        # Handle each state in the conversation flow
+        if current_state == STATES["collecting_name"]:
+            name = extract_information(user_message, "name")
+            if name:
+                self.update_candidate_info("full_name", name)
+                return self.advance_intake(f"Nice to meet you, {name}!", on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["collecting_email"]:
+            email = extract_information(user_message, "email")
+            if email:
+                self.update_candidate_info("email", email)
+                return self.advance_intake(STATE_ACKNOWLEDGEMENTS[current_state], on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["collecting_phone"]:
+            phone = extract_information(user_message, "phone")
+            if phone:
+                self.update_candidate_info("phone", phone)
+                return self.advance_intake(STATE_ACKNOWLEDGEMENTS[current_state], on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["collecting_experience"]:
+            experience = extract_information(user_message, "experience")
+            if experience:
+                self.update_candidate_info("experience", experience)
+                return self.advance_intake(STATE_ACKNOWLEDGEMENTS[current_state], on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["collecting_position"]:
+            position = extract_information(user_message, "position")
+            if position:
+                self.update_candidate_info("desired_position", position)
+                return self.advance_intake(STATE_ACKNOWLEDGEMENTS[current_state], on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["collecting_location"]:
+            location = extract_information(user_message, "location")
+            if location:
+                self.update_candidate_info("location", location)
+                return self.advance_intake(STATE_ACKNOWLEDGEMENTS[current_state], on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["collecting_tech_stack"]:
+            # Start on the questions for any technologies recognised locally while the extraction runs
+            self.prefetch_technical_questions(detect_technologies(user_message))
+            tech_stack = extract_information(user_message, "tech_stack")
+            if tech_stack:
+                self.update_candidate_info("tech_stack", tech_stack)
+                return self.advance_intake(STATE_ACKNOWLEDGEMENTS[current_state], on_token)
+            else:
+                return {
+                    "next_state": current_state,
+                    "response": STATE_RETRY_PROMPTS[current_state]
+                }
+        
+        elif current_state == STATES["asking_tech_questions"]:
+            # Store the answer to the current question; it is scored once the interview ends
+            current_question = self.tech_questions[self.current_question_idx]
+            self.tech_answers.append({"question": current_question, "answer": user_message})
+            if self.store is not None:
+                self.store.save_answers(self.session_id, self.tech_answers)
+            self.questions_answered += 1
+            
+            # Move to the next question or end conversation
+            self.resolve_pending_questions()
+            self.current_question_idx += 1
+            if self.current_question_idx < len(self.tech_questions):
+                next_question = self.tech_questions[self.current_question_idx]
+                return {
+                    "next_state": STATES["asking_tech_questions"],
+                    "response": f"Thanks for your answer. Next question: {next_question}"
+                }
+            else:
+                return {
+                    "next_state": STATES["conversation_end"],
+                    "response": FIXED_RESPONSES["questions_done"]
+                }
+        
+        elif current_state == STATES["conversation_end"]:
+            return {
+                "next_state": STATES["conversation_end"],
+                "response": FIXED_RESPONSES["after_end"]
+            }
+        
+        # Fallback for unexpected states
+        return {
+            "next_state": current_state,
+            "response": FIXED_RESPONSES["not_understood"]
+        }
+
+def evict_idle_sessions(idle_timeout: float = SESSION_IDLE_TIMEOUT) -> int:
+    """Evict every session idle for longer than the timeout.
+
+    Sessions in the middle of a turn are skipped.
+
+    Args:
+        idle_timeout: Seconds without a turn or render after which a session is evicted
+
+    Returns:
+        Number of sessions evicted
+    """
+    evicted = 0
+    now = time.monotonic()
+    for session in list(_live_sessions):
+        if session.evicted or now - session.last_active < idle_timeout:
+            continue
+        if session._turn_lock.acquire(blocking=False):
+            try:
+                session.evict()
+                evicted += 1
+            finally:
+                session._turn_lock.release()
+    return evicted
+
+def _sweep_idle_sessions() -> None:
+    while True:
+        time.sleep(SESSION_SWEEP_INTERVAL)
+        evict_idle_sessions()
+
+def start_idle_sweeper() -> None:
+    """Start the background thread evicting idle sessions, once per process."""
+    global _sweeper
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_idle_sessions, name="session-sweeper", daemon=True)
+            _sweeper.start()
+
+def memory_report() -> Dict[str, Any]:
+    """Report the memory held by every live session.
+
+    Returns:
+        Per-session usage from ScreeningSession.memory_usage, totals, and the
+        bytes of assistant responses shared by all sessions
+    """
+    sessions = [session.memory_usage() for session in list(_live_sessions)]
+    total = sum(session["bytes"] for session in sessions)
+    return {
+        "sessions": sessions,
+        "session_count": len(sessions),
+        "total_bytes": total,
+        "mean_bytes": total / len(sessions) if sessions else 0,
+        "shared_response_bytes": shared_response_bytes(),
+    }
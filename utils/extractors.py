@@ -0,0 +1,185 @@
+"""Deterministic local extractors that run ahead of the LLM.
+
+These handle the fields that have a well-defined shape (email, phone and
+years of experience). When they find a single unambiguous match the LLM
+round trip is skipped entirely; otherwise they return None and the caller
+falls back to the model.
+"""
+
+import re
+from typing import Dict, Optional
+
+from utils.constants import COLLECTION_STEPS, EMAIL_REGEX, PHONE_REGEX
+
+# Unanchored variant of EMAIL_REGEX for searching inside free text
+EMAIL_SEARCH_REGEX = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# A run of digits with the usual separators, optionally prefixed with + or 00
+PHONE_SEARCH_REGEX = re.compile(r'(?:\+|\b00)?\d[\d\s().\-/]{6,22}\d')
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+    "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20,
+    "a": 1, "an": 1,
+}
+
+_NUMBER = r'(\d{1,2}(?:\.\d)?|' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r')'
+_YEARS = r'(?:years?|yrs?)'
+
+EXPERIENCE_RANGE_REGEX = re.compile(
+    rf'\b{_NUMBER}\s*(?:-|–|to)\s*{_NUMBER}\s*\+?\s*{_YEARS}\b', re.IGNORECASE
+)
+EXPERIENCE_SINGLE_REGEX = re.compile(rf'\b{_NUMBER}\s*(\+)?\s*{_YEARS}\b', re.IGNORECASE)
+EXPERIENCE_BARE_REGEX = re.compile(r'^\s*(\d{1,2}(?:\.\d)?)\s*(\+)?\s*\.?\s*$')
+# Wording around a number of years that makes it something other than experience
+# ("25 years old", "5 years ago") or not a whole number of them ("less than a year",
+# "half a year"); such messages are left to the LLM
+EXPERIENCE_QUALIFIER_REGEX = re.compile(
+    r'\b(?:old|ago|aged?|less than|fewer than|under|half)\b', re.IGNORECASE
+)
+NO_EXPERIENCE_REGEX = re.compile(r'\b(?:fresher|no (?:prior |professional )?experience)\b', re.IGNORECASE)
+
+def _parse_number(token: str) -> Optional[float]:
+    """Convert a numeric or spelled-out number token into a float."""
+    token = token.lower()
+    if token in NUMBER_WORDS:
+        return float(NUMBER_WORDS[token])
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+def _format_years(value: float) -> str:
+    """Format a number of years the same way the LLM extraction prompt does."""
+    text = str(int(value)) if value == int(value) else str(value)
+    return f"{text} year" if value == 1 else f"{text} years"
+
+def extract_email(message: str) -> Optional[str]:
+    """Extract a single email address from free text.
+
+    Args:
+        message: User message to search
+
+    Returns:
+        The email address, or None if there is not exactly one candidate
+    """
+    matches = {match.rstrip('.') for match in EMAIL_SEARCH_REGEX.findall(message)}
+    if len(matches) != 1:
+        return None
+    email = matches.pop()
+    return email if re.match(EMAIL_REGEX, email) else None
+
+def extract_phone(message: str) -> Optional[str]:
+    """Extract a single phone number from free text, normalized to E.164-style digits.
+
+    Args:
+        message: User message to search
+
+    Returns:
+        The phone number as an optional "+" followed by digits, or None if
+        there is not exactly one plausible candidate
+    """
+    # Email addresses can contain digit runs that look like phone numbers
+    text = EMAIL_SEARCH_REGEX.sub(" ", message)
+
+    candidates = set()
+    for match in PHONE_SEARCH_REGEX.findall(text):
+        match = match.strip()
+        prefix = "+" if match.startswith(("+", "00")) else ""
+        digits = re.sub(r'\D', '', match)
+        if match.startswith("00"):
+            digits = digits[2:]
+        phone = prefix + digits
+        if re.match(PHONE_REGEX, phone):
+            candidates.add(phone)
+
+    return candidates.pop() if len(candidates) == 1 else None
+
+def extract_experience(message: str) -> Optional[str]:
+    """Extract years of experience as a number or range from free text.
+
+    Handles digits ("5 years", "2.5 yrs", "6+ years"), ranges ("3-5 years",
+    "three to five years"), spelled-out numbers ("five years") and a bare
+    number sent on its own as an answer. Ages, dates and fractions of a
+    year ("25 years old", "2 years ago", "less than a year") are left to the
+    LLM.
+
+    Args:
+        message: User message to search
+
+    Returns:
+        Normalized experience such as "5 years" or "3-5 years", or None if
+        there is not exactly one candidate
+    """
+    if EXPERIENCE_QUALIFIER_REGEX.search(message):
+        return None
+
+    ranges = EXPERIENCE_RANGE_REGEX.findall(message)
+    if len(ranges) == 1:
+        low, high = (_parse_number(token) for token in ranges[0])
+        if low is not None and high is not None and low < high:
+            low_text, high_text = _format_years(low).split()[0], _format_years(high).split()[0]
+            return f"{low_text}-{high_text} years"
+        return None
+    if ranges:
+        return None
+
+    singles = EXPERIENCE_SINGLE_REGEX.findall(message)
+    if not singles:
+        bare = EXPERIENCE_BARE_REGEX.match(message)
+        singles = [bare.groups()] if bare else []
+
+    values = {(_parse_number(token), plus) for token, plus in singles}
+    if len(values) == 1:
+        value, plus = values.pop()
+        if value is None or value > 60:
+            return None
+        years = _format_years(value)
+        return years.replace(" ", "+ ", 1) if plus else years
+    if values:
+        return None
+
+    if NO_EXPERIENCE_REGEX.search(message):
+        return _format_years(0)
+
+    return None
+
+# Local extractors by info_type, tried before any LLM call
+LOCAL_EXTRACTORS = {
+    "email": extract_email,
+    "phone": extract_phone,
+    "experience": extract_experience,
+}
+
+def extract_locally(user_message: str, info_type: str) -> Optional[str]:
+    """Try to extract information without calling the LLM.
+
+    Args:
+        user_message: User message to extract information from
+        info_type: Type of information to extract
+
+    Returns:
+        Extracted information if a confident local match was found, None otherwise
+    """
+    extractor = LOCAL_EXTRACTORS.get(info_type)
+    if extractor is None:
+        return None
+    return extractor(user_message)
+
+def extract_all_locally(user_message: str) -> Dict[str, str]:
+    """Run every local extractor over a message.
+
+    Args:
+        user_message: User message to extract information from
+
+    Returns:
+        Confident local matches keyed by candidate_info field
+    """
+    found = {}
+    for _, info_type, field in COLLECTION_STEPS:
+        value = extract_locally(user_message, info_type)
+        if value:
+            found[field] = value
+    return found
@@ -0,0 +1,49 @@
+"""Background scoring of candidates' technical answers.
+
+Scoring runs on a small shared thread pool after a candidate's last answer, so
+it never adds latency to a chat turn. All of a candidate's answers are scored
+in one batched LLM call, which the scheduler admits after any waiting chat
+calls, and the result is written to the candidate record.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from utils.constants import GRADING_MAX_WORKERS
+from utils.llm_handler import score_technical_answers
+from utils.scheduler import background_context
+from utils.storage import CandidateStore
+
+# Shared by all sessions in the process
+_executor = ThreadPoolExecutor(max_workers=GRADING_MAX_WORKERS, thread_name_prefix="grading")
+
+def grade_answers(session_id: str, answers: List[Dict[str, str]], store: Optional[CandidateStore]) -> Optional[Dict]:
+    """Score answers and save the assessment to the candidate record.
+
+    Args:
+        session_id: Screening session the answers belong to
+        answers: Dictionaries with "question" and "answer", in the order asked
+        store: Candidate store receiving the assessment, if any
+
+    Returns:
+        The assessment from score_technical_answers, or None if scoring failed
+    """
+    assessment = score_technical_answers(answers)
+    if assessment is not None and store is not None:
+        store.save_assessment(session_id, assessment["answers"], assessment["overall_score"])
+    return assessment
+
+def submit_grading(session_id: str, answers: List[Dict[str, str]], store: Optional[CandidateStore]) -> Future:
+    """Score answers in the background.
+
+    Args:
+        session_id: Screening session the answers belong to
+        answers: Dictionaries with "question" and "answer"; copied before submission
+        store: Candidate store receiving the assessment, if any
+
+    Returns:
+        Future resolving to the assessment, or None if scoring failed
+    """
+    # Run in a copy of the caller's context so metrics keep the conversation state
+    context = background_context()
+    return _executor.submit(context.run, grade_answers, session_id, [dict(entry) for entry in answers], store)
@@ -0,0 +1,197 @@
+"""Compact, size-bounded chat history.
+
+Messages are stored as `__slots__` records with interned roles, and the
+canned assistant responses every candidate receives word for word (the
+greeting, intake prompts and fixed replies) are shared across sessions, so
+they exist once per process instead of once per session. Personalized and
+generated responses are never shared.
+Each history keeps at most HISTORY_MAX_MESSAGES messages (and
+HISTORY_MAX_BYTES of text) in memory; older messages are appended to a
+per-session JSONL log and read back only when they are shown again.
+"""
+
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterator, List, Optional, Union
+
+from utils.constants import (
+    HISTORY_MAX_MESSAGES,
+    HISTORY_MAX_BYTES,
+    HISTORY_SPILL_DIR,
+    GREETING_MESSAGE,
+    STATE_PROMPTS,
+    STATE_CLARIFICATIONS,
+    STATE_RETRY_PROMPTS,
+    STATE_ACKNOWLEDGEMENTS,
+    FIXED_RESPONSES,
+)
+
+def _canned_responses() -> List[str]:
+    """Every response the engine sends without anything candidate-specific in it."""
+    acknowledged = [
+        f"{acknowledgement} {prompt}"
+        for acknowledgement in set(STATE_ACKNOWLEDGEMENTS.values())
+        for prompt in STATE_PROMPTS.values()
+    ]
+    clarified = [f"{STATE_CLARIFICATIONS[state]} {STATE_PROMPTS[state]}" for state in STATE_CLARIFICATIONS]
+    return [
+        GREETING_MESSAGE,
+        *STATE_PROMPTS.values(),
+        *STATE_RETRY_PROMPTS.values(),
+        *FIXED_RESPONSES.values(),
+        *acknowledged,
+        *clarified,
+    ]
+
+# One copy of each canned response, shared by every session; fixed at import, so it never grows
+_shared_responses: Dict[str, str] = {text: text for text in _canned_responses()}
+
+def share_response(text: str) -> str:
+    """Return the process-wide copy of a canned response, or the text itself for any other."""
+    return _shared_responses.get(text, text)
+
+def shared_response_bytes() -> int:
+    """Memory held by the shared responses."""
+    return sum(sys.getsizeof(text) for text in list(_shared_responses.values()))
+
+def is_shared(text: str) -> bool:
+    return _shared_responses.get(text) is text
+
+class ChatMessage:
+    """One chat message."""
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str):
+        self.role = sys.intern(role)
+        self.content = share_response(content) if self.role == "assistant" else content
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+class ChatHistory:
+    """Chat history that keeps its most recent messages in memory and older ones on disk.
+
+    Supports len(), iteration, indexing and slicing like a list of ChatMessage.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        spill_dir: Optional[str] = None,
+        max_messages: int = HISTORY_MAX_MESSAGES,
+        max_bytes: int = HISTORY_MAX_BYTES,
+    ):
+        """Create an empty history.
+
+        Args:
+            session_id: Session the history belongs to; names the spill file
+            spill_dir: Directory of spill files; defaults to TALENTSCOUT_HISTORY_DIR or HISTORY_SPILL_DIR
+            max_messages: Messages kept in memory
+            max_bytes: Message text (in characters) kept in memory
+        """
+        spill_dir = spill_dir or os.getenv("TALENTSCOUT_HISTORY_DIR", HISTORY_SPILL_DIR)
+        self.spill_path = os.path.join(spill_dir, f"{session_id}.jsonl")
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.recent: List[ChatMessage] = []
+        self.spilled = 0
+        self._recent_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.recent)
+
+    def __iter__(self) -> Iterator[ChatMessage]:
+        return iter(self[:])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ChatMessage, List[ChatMessage]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            with self._lock:
+                messages = self._read_spilled(start, min(stop, self.spilled)) if start < self.spilled else []
+                messages += self.recent[max(start - self.spilled, 0):max(stop - self.spilled, 0)]
+            return messages[::step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chat history index out of range")
+        return self[index:index + 1][0]
+
+    def append(self, role: str, content: str) -> None:
+        """Add a message, spilling the oldest ones to disk when over the memory limits."""
+        message = ChatMessage(role, content)
+        with self._lock:
+            self.recent.append(message)
+            self._recent_bytes += len(content)
+            # Always keep the latest exchange in memory
+            excess = 0
+            excess_bytes = self._recent_bytes
+            while len(self.recent) - excess > 2 and (
+                len(self.recent) - excess > self.max_messages or excess_bytes > self.max_bytes
+            ):
+                excess_bytes -= len(self.recent[excess].content)
+                excess += 1
+            if excess:
+                # Spill half the limit at a time so the file is appended to in batches
+                self._spill(max(excess, min(self.max_messages // 2, len(self.recent) - 2)))
+
+    def spill_all(self) -> None:
+        """Move every in-memory message to disk, e.g. when the session goes idle."""
+        with self._lock:
+            if self.recent:
+                self._spill(len(self.recent))
+
+    def restore(self) -> None:
+        """Bring the most recent spilled messages back into memory after spill_all."""
+        with self._lock:
+            if self.recent or not self.spilled:
+                return
+            count = min(self.spilled, self.max_messages)
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            with open(self.spill_path, "w", encoding="utf-8") as f:
+                f.writelines(lines[:-count])
+            self.recent = [ChatMessage(**json.loads(line)) for line in lines[-count:]]
+            self._recent_bytes = sum(len(message.content) for message in self.recent)
+            self.spilled -= count
+
+    def clear(self) -> None:
+        """Drop every message, including those on disk."""
+        with self._lock:
+            self.recent = []
+            self._recent_bytes = 0
+            self.spilled = 0
+            if os.path.exists(self.spill_path):
+                os.remove(self.spill_path)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the in-memory messages, excluding shared responses."""
+        with self._lock:
+            size = sys.getsizeof(self) + sys.getsizeof(self.recent)
+            for message in self.recent:
+                size += sys.getsizeof(message)
+                if not is_shared(message.content):
+                    size += sys.getsizeof(message.content)
+            return size
+
+    def _spill(self, count: int) -> None:
+        os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for message in self.recent[:count]:
+                f.write(json.dumps(message.to_dict()) + "\n")
+        self._recent_bytes -= sum(len(message.content) for message in self.recent[:count])
+        self.recent = self.recent[count:]
+        self.spilled += count
+
+    def _read_spilled(self, start: int, stop: int) -> List[ChatMessage]:
+        messages = []
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for index, line in enumerate(f):
+                if index >= stop:
+                    break
+                if index >= start:
+                    messages.append(ChatMessage(**json.loads(line)))
+        return messages
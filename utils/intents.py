@@ -0,0 +1,147 @@
+"""Local intent classification for candidate messages.
+
+Messages asking to leave, start over, get help or have something clarified,
+and obviously off-topic messages, are recognised locally so they can be
+answered without an LLM call. All intent phrases are compiled into one
+Aho-Corasick automaton over words, so a message is matched against every
+phrase in a single pass and only whole words match ("Backend" never matches
+"end").
+"""
+
+import re
+from collections import deque
+from typing import Collection, Dict, Iterator, List, Optional, Set, Tuple
+
+from utils.constants import (
+    INTENT_PHRASES, INTENT_PRIORITY, INTENT_FILLER_WORDS, INTENT_MAX_WORDS, INTENT_STANDALONE_PHRASES,
+    INTENT_STANDALONE_STATES,
+)
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words, keeping contractions such as "don't" whole."""
+    return re.findall(r"[a-z0-9]+(?:'[a-z]+)?", text.casefold().replace("’", "'"))
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton whose alphabet is words rather than characters."""
+
+    def __init__(self, phrases: Dict[str, List[str]]):
+        """Compile the automaton.
+
+        Args:
+            phrases: Phrases keyed by the label reported when they match
+        """
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.outputs: List[List[Tuple[str, int]]] = [[]]
+        self.fail: List[int] = [0]
+
+        for label, label_phrases in phrases.items():
+            for phrase in label_phrases:
+                words = tokenize(phrase)
+                state = 0
+                for word in words:
+                    if word not in self.transitions[state]:
+                        self.transitions.append({})
+                        self.outputs.append([])
+                        self.fail.append(0)
+                        self.transitions[state][word] = len(self.transitions) - 1
+                    state = self.transitions[state][word]
+                self.outputs[state].append((label, len(words)))
+
+        # Breadth-first over the trie: each state's failure link is the longest
+        # proper suffix of its phrase prefix that is also a prefix in the trie
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self.transitions[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.transitions[fallback].get(word, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def search(self, words: List[str]) -> Iterator[Tuple[str, int, int]]:
+        """Find every phrase occurrence in a word sequence.
+
+        Args:
+            words: Tokenized text
+
+        Yields:
+            (label, start, end) for each match, with end exclusive
+        """
+        state = 0
+        for end, word in enumerate(words, 1):
+            while state and word not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(word, 0)
+            for label, length in self.outputs[state]:
+                yield label, end - length, end
+
+class IntentClassifier:
+    """Classify short messages into the intents of INTENT_PHRASES."""
+
+    def __init__(
+        self,
+        phrases: Dict[str, List[str]] = INTENT_PHRASES,
+        priority: List[str] = INTENT_PRIORITY,
+        filler_words: Set[str] = INTENT_FILLER_WORDS,
+        max_words: int = INTENT_MAX_WORDS,
+        standalone_phrases: List[str] = INTENT_STANDALONE_PHRASES,
+    ):
+        self.automaton = PhraseAutomaton(phrases)
+        self.standalone_phrases = {tuple(tokenize(phrase)) for phrase in standalone_phrases}
+        self.priority = priority
+        self.filler_words = filler_words
+        self.max_words = max_words
+
+    def classify(self, message: str, standalone_intents: Collection[str] = ()) -> Optional[str]:
+        """Find the intent of a message.
+
+        A multi-word phrase marks its intent anywhere in the message. A single
+        keyword or standalone phrase only does when every other word is a
+        keyword or filler, so "stop please" is an exit but "I'd stop the
+        worker thread" is not. Messages longer than max_words are answers and
+        never get an intent.
+
+        Args:
+            message: Candidate's message
+            standalone_intents: Intents all of whose phrases count as standalone
+
+        Returns:
+            The highest-priority intent found, or None
+        """
+        words = tokenize(message)
+        if not words or len(words) > self.max_words:
+            return None
+
+        matched = set()
+        keyword_intents = set()
+        covered = [False] * len(words)
+        for intent, start, end in self.automaton.search(words):
+            covered[start:end] = [True] * (end - start)
+            if end - start == 1 or intent in standalone_intents or tuple(words[start:end]) in self.standalone_phrases:
+                keyword_intents.add(intent)
+            else:
+                matched.add(intent)
+
+        if keyword_intents and all(is_covered or word in self.filler_words for word, is_covered in zip(words, covered)):
+            matched |= keyword_intents
+        return next((intent for intent in self.priority if intent in matched), None)
+
+# Compiled once for the process
+intent_classifier = IntentClassifier()
+
+def classify_intent(message: str, current_state: Optional[str] = None) -> Optional[str]:
+    """Classify a message with the process-wide classifier.
+
+    Args:
+        message: Candidate's message
+        current_state: Conversation state the message was sent in; in states
+            listed in INTENT_STANDALONE_STATES those intents need the whole
+            message to be the request
+
+    Returns:
+        "exit", "restart", "help", "clarification", "off_topic", or None for
+        messages that should go through the normal conversation flow
+    """
+    return intent_classifier.classify(message, INTENT_STANDALONE_STATES.get(current_state, ()))
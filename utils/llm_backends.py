@@ -0,0 +1,517 @@
+"""Pluggable LLM backends.
+
+Every LLM call in the app goes through an `LLMBackend`. Three implementations
+are provided:
+
+- `GroqBackend`: the real Groq API
+- `StubBackend`: deterministic local responses with configurable latency, for
+  running, profiling and load-testing the flow offline
+- `CassetteBackend`: records responses from another backend to a JSONL file
+  and replays them later, so real conversations can be re-run offline
+
+The active backend is chosen with the TALENTSCOUT_LLM_BACKEND environment
+variable ("groq", "stub", "record" or "replay") or set explicitly with
+`set_backend`.
+
+Nothing heavy happens at import: the backend, the Groq SDK (with httpx and
+pydantic) and the shared HTTP connection pool are only loaded when the first
+LLM call needs them, or in the background via `warm_backend`.
+"""
+
+import hashlib
+import importlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.constants import (
+    COLLECTION_STEPS,
+    DEFAULT_LLM_BACKEND,
+    CASSETTE_PATH,
+    STUB_LATENCY,
+    STUB_SEED,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE,
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP_CONNECT_TIMEOUT,
+    LLM_HTTP_READ_TIMEOUT,
+)
+from utils.extractors import extract_all_locally, extract_locally
+from utils.tokens import count_tokens
+
+class LLMResponse:
+    """Text completion returned by a backend, with token usage."""
+
+    def __init__(self, content: str, model: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.content = content
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    def to_dict(self) -> Dict:
+        return {
+            "content": self.content,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+class LLMBackend:
+    """Interface for chat completion backends."""
+
+    name = "base"
+
+    def complete(self, messages: List[Dict], model: str, temperature: float, max_tokens: int, **options) -> LLMResponse:
+        """Return the full completion for the chat messages.
+
+        Args:
+            messages: Chat messages with "role" and "content"
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+            **options: Extra request options such as response_format, or timeout
+                (seconds) after which the call fails with a timeout error
+
+        Returns:
+            The completion
+        """
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict], model: str, temperature: float, max_tokens: int, **options) -> Iterator[str]:
+        """Yield the completion in text deltas as it is generated.
+
+        Backends without native streaming yield the full completion at once.
+        """
+        yield self.complete(messages, model, temperature, max_tokens, **options).content
+
+class ConnectionPoolStats:
+    """Counts HTTP requests and how many of them had to open a new connection."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def on_request(self, request) -> None:
+        """httpx request hook: count the request and trace its connection setup."""
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event_name: str, info: Dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+
+    def snapshot(self) -> Dict:
+        """Return the counts and the share of requests that reused a pooled connection."""
+        with self._lock:
+            requests, connections = self.requests, self.connections
+        return {
+            "requests": requests,
+            "connections": connections,
+            "reuse_rate": 1 - connections / requests if requests else None,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.connections = 0
+
+http_pool_stats = ConnectionPoolStats()
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client():
+    """Return the process-wide keep-alive HTTP client shared by all Groq clients, creating it on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            import httpx
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(LLM_HTTP_READ_TIMEOUT, connect=LLM_HTTP_CONNECT_TIMEOUT),
+                follow_redirects=True,
+                event_hooks={"request": [http_pool_stats.on_request]},
+            )
+        return _http_client
+
+class GroqBackend(LLMBackend):
+    """Backend calling the Groq chat completions API."""
+
+    name = "groq"
+
+    def __init__(self, client=None):
+        if client is None:
+            import groq
+            # Retries are handled by the shared LLM scheduler
+            client = groq.Client(api_key=os.getenv("GROQ_API_KEY"), max_retries=0, http_client=get_http_client())
+        self.client = client
+
+    def complete(self, messages, model, temperature, max_tokens, **options) -> LLMResponse:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **options
+        )
+        usage = response.usage
+        return LLMResponse(
+            response.choices[0].message.content.strip(),
+            response.model or model,
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0,
+        )
+
+    def stream(self, messages, model, temperature, max_tokens, **options) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **options
+        )
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+def parse_latency_spec(spec: str) -> Callable[[random.Random], float]:
+    """Build a latency sampler from a spec string.
+
+    Supported specs: "fixed:<s>", "uniform:<min>:<max>", "normal:<mean>:<stddev>"
+    and "lognormal:<median>:<sigma>", all in seconds.
+
+    Args:
+        spec: Latency distribution spec
+
+    Returns:
+        Function drawing a non-negative latency from a random generator
+    """
+    kind, *params = spec.split(":")
+    values = [float(param) for param in params]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Invalid latency spec: {spec}")
+
+# Question shapes used by the stub backend, one per generated question
+STUB_QUESTION_TEMPLATES = [
+    "How would you approach a real-world problem using {}?",
+    "What are common performance pitfalls in {} and how do you avoid them?",
+    "Explain how you would test and debug a component built with {}.",
+    "Describe a design trade-off you have made when working with {}.",
+    "How do you keep a {} codebase maintainable as it grows?",
+]
+
+# Introductions the stub strips from a stated name or location
+STUB_INTRO_RE = re.compile(r"^(?:my name is|i'm based in|i live in|i work with|i am|i'm)\s+", re.IGNORECASE)
+
+# Words marking part of a multi-field message as the desired position
+STUB_POSITION_RE = re.compile(r'\b(?:developer|engineer|designer|scientist|analyst|architect|devops)\b', re.IGNORECASE)
+
+def stub_extract_all(user_message: str) -> Dict[str, Optional[str]]:
+    """Answer the multi-field extraction prompt for a comma separated message.
+
+    Parts the local extractors recognise give the email, phone and
+    experience. Of the other parts, the first is the name, one naming a role
+    is the desired position and the rest is the location.
+
+    Args:
+        user_message: Candidate's message
+
+    Returns:
+        Every candidate_info field, None where the message doesn't state it
+    """
+    found: Dict[str, Optional[str]] = dict(extract_all_locally(user_message))
+    rest = [part.strip(" .") for part in user_message.split(",")]
+    rest = [part for part in rest if part and not extract_all_locally(part)]
+    if rest:
+        found["full_name"] = STUB_INTRO_RE.sub("", rest.pop(0))
+    position = next((part for part in rest if STUB_POSITION_RE.search(part)), None)
+    if position:
+        found["desired_position"] = position
+        rest.remove(position)
+    if rest:
+        found["location"] = STUB_INTRO_RE.sub("", ", ".join(rest))
+    return {field: found.get(field) for _, _, field in COLLECTION_STEPS}
+
+def stub_responder(messages: List[Dict]) -> str:
+    """Produce a plausible, deterministic response to the app's own prompts.
+
+    Args:
+        messages: Chat messages sent to the backend
+
+    Returns:
+        Response text shaped like the real model's output for the prompt
+    """
+    prompt = messages[-1]["content"]
+
+    tech_stack = re.search(r'TECH STACK:\s*(.+)', prompt)
+    if tech_stack:
+        technologies = [tech.strip() for tech in tech_stack.group(1).split(",") if tech.strip()] or ["software"]
+        questions = [
+            template.format(technologies[i % len(technologies)]) for i, template in enumerate(STUB_QUESTION_TEMPLATES)
+        ]
+        if "JSON" in prompt:
+            return json.dumps({"questions": questions})
+        return "\n".join(f"{i + 1}. {question}" for i, question in enumerate(questions))
+
+    answers = re.search(r'ANSWERS:\s*(.*)\Z', prompt, re.DOTALL)
+    if answers:
+        # Longer answers score higher, which is enough to exercise the grading pipeline
+        scored = re.findall(r'^A\d+:(.*)$', answers.group(1), re.MULTILINE)
+        return json.dumps({"scores": [
+            {"score": min(10, len(answer.split())), "feedback": "Stub feedback."} for answer in scored
+        ]})
+
+    user_message = re.search(r'USER MESSAGE:\s*(.*)\Z', prompt, re.DOTALL)
+    user_message = user_message.group(1).strip() if user_message else ""
+
+    if "JSON object" in prompt:
+        return json.dumps(stub_extract_all(user_message))
+
+    info_type = re.search(r'Extract the (\w+) from', prompt)
+    info_type = info_type.group(1) if info_type else ""
+    if info_type in ("email", "phone", "experience"):
+        return extract_locally(user_message, info_type) or "NOT_FOUND"
+
+    answer = STUB_INTRO_RE.sub("", user_message)
+    return answer.strip(" .") or "NOT_FOUND"
+
+class StubBackend(LLMBackend):
+    """Deterministic offline backend with a configurable latency distribution."""
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency: str = STUB_LATENCY,
+        seed: int = STUB_SEED,
+        responder: Callable[[List[Dict]], str] = stub_responder,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Create a stub backend.
+
+        Args:
+            latency: Latency distribution spec, see parse_latency_spec
+            seed: Seed for the latency generator so runs are repeatable
+            responder: Function producing the response text for the messages
+            sleep: Function used to wait out the sampled latency
+        """
+        self.sample_latency = parse_latency_spec(latency)
+        self.responder = responder
+        self.sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _latency(self) -> float:
+        with self._lock:
+            return self.sample_latency(self._rng)
+
+    def _wait(self, latency: float, timeout: Optional[float]) -> None:
+        """Sleep for the sampled latency, failing like a client-side timeout if it is too long."""
+        if timeout is not None and latency > timeout:
+            self.sleep(timeout)
+            raise TimeoutError(f"Stub request timed out after {timeout}s")
+        self.sleep(latency)
+
+    def complete(self, messages, model, temperature, max_tokens, **options) -> LLMResponse:
+        self._wait(self._latency(), options.get("timeout"))
+        content = self.responder(messages)
+        return LLMResponse(
+            content,
+            model,
+            sum(count_tokens(message["content"]) for message in messages),
+            count_tokens(content),
+        )
+
+    def stream(self, messages, model, temperature, max_tokens, **options) -> Iterator[str]:
+        words = self.responder(messages).split(" ")
+        latency = self._latency()
+        timeout = options.get("timeout")
+        if timeout is not None and latency > timeout:
+            self._wait(latency, timeout)
+        delay = latency / max(len(words), 1)
+        for i, word in enumerate(words):
+            self.sleep(delay)
+            yield word if i == 0 else " " + word
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when a request was never recorded."""
+
+class CassetteBackend(LLMBackend):
+    """Record responses from another backend to disk, or replay them offline."""
+
+    name = "cassette"
+
+    def __init__(self, path: str = CASSETTE_PATH, mode: str = "replay", inner: Optional[LLMBackend] = None):
+        """Open a cassette file.
+
+        Args:
+            path: JSONL file holding one recorded request/response per line
+            mode: "record" to call `inner` and save responses, "replay" to serve saved ones
+            inner: Backend used for recording
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("Recording requires an inner backend")
+        self.path = path
+        self.mode = mode
+        self.inner = inner
+        self._responses: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def request_key(messages, model, temperature, max_tokens, **options) -> str:
+        """Hash the request parameters that determine a response (the timeout does not)."""
+        options = {name: value for name, value in options.items() if name != "timeout"}
+        payload = json.dumps(
+            {"messages": messages, "model": model, "temperature": temperature, "max_tokens": max_tokens, "options": options},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def complete(self, messages, model, temperature, max_tokens, **options) -> LLMResponse:
+        key = self.request_key(messages, model, temperature, max_tokens, **options)
+        if self.mode == "replay":
+            return self._replay(key)
+        response = self.inner.complete(messages, model, temperature, max_tokens, **options)
+        self._record(key, response)
+        return response
+
+    def stream(self, messages, model, temperature, max_tokens, **options) -> Iterator[str]:
+        key = self.request_key(messages, model, temperature, max_tokens, **options)
+        if self.mode == "replay":
+            yield self._replay(key).content
+            return
+        chunks = []
+        for delta in self.inner.stream(messages, model, temperature, max_tokens, **options):
+            chunks.append(delta)
+            yield delta
+        content = "".join(chunks)
+        self._record(key, LLMResponse(
+            content,
+            model,
+            sum(count_tokens(message["content"]) for message in messages),
+            count_tokens(content),
+        ))
+
+    def _replay(self, key: str) -> LLMResponse:
+        recorded = self._responses.get(key)
+        if recorded is None:
+            raise CassetteMissError(f"No recorded response for request {key[:12]} in {self.path}")
+        return LLMResponse(**recorded)
+
+    def _record(self, key: str, response: LLMResponse) -> None:
+        with self._lock:
+            self._responses[key] = response.to_dict()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "response": response.to_dict()}) + "\n")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses[entry["key"]] = entry["response"]
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+def create_backend(kind: Optional[str] = None) -> LLMBackend:
+    """Create a backend by name.
+
+    Args:
+        kind: "groq", "stub", "record" (Groq, saved to the cassette) or "replay";
+            defaults to the TALENTSCOUT_LLM_BACKEND environment variable
+
+    Returns:
+        The backend
+    """
+    kind = kind or os.getenv("TALENTSCOUT_LLM_BACKEND", DEFAULT_LLM_BACKEND)
+    cassette_path = os.getenv("TALENTSCOUT_CASSETTE", CASSETTE_PATH)
+    if kind == "groq":
+        return GroqBackend()
+    if kind == "stub":
+        return StubBackend(latency=os.getenv("TALENTSCOUT_STUB_LATENCY", STUB_LATENCY))
+    if kind == "record":
+        return CassetteBackend(cassette_path, mode="record", inner=GroqBackend())
+    if kind == "replay":
+        return CassetteBackend(cassette_path, mode="replay")
+    raise ValueError(f"Unknown LLM backend: {kind}")
+
+_environment_loaded = False
+
+def load_environment() -> None:
+    """Load settings from a .env file into the environment, once per process."""
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+def get_backend() -> LLMBackend:
+    """Return the process-wide backend, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            load_environment()
+            _backend = create_backend()
+        return _backend
+
+_warm_thread: Optional[threading.Thread] = None
+
+def _warm() -> None:
+    try:
+        get_backend()
+    except Exception:
+        # Left to surface, and be handled, on the first real LLM call
+        pass
+    # Loaded lazily by question parsing and diversity selection; load them before a candidate waits on them
+    importlib.import_module("numpy")
+    importlib.import_module("pydantic")
+
+def warm_backend() -> None:
+    """Create the backend on a background thread, once per process.
+
+    Called after the first page render so neither the render nor the
+    candidate's first LLM call waits for the SDK imports and client setup,
+    or for the NumPy and pydantic imports question handling needs.
+    """
+    global _warm_thread
+    with _backend_lock:
+        if _warm_thread is not None or _backend is not None:
+            return
+        _warm_thread = threading.Thread(target=_warm, name="backend-warmup", daemon=True)
+    _warm_thread.start()
+
+def set_backend(backend: LLMBackend) -> None:
+    """Replace the process-wide backend, e.g. with a stub for benchmarks."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -1,38 +1,222 @@
-import os
-import time
+import asyncio
+import functools
+import json
 import re
-import streamlit as st
-from typing import Dict, List, Optional
-import groq
-from dotenv import load_dotenv
-from utils.constants import STATES, EXIT_KEYWORDS, EMAIL_REGEX, PHONE_REGEX, MAX_TECH_QUESTIONS
-from utils.session_state import update_candidate_info, set_conversation_state, get_conversation_state
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from utils.constants import (
+    EMAIL_REGEX,
+    PHONE_REGEX,
+    MAX_TECH_QUESTIONS,
+    COLLECTION_STEPS,
+    FIELD_LABELS,
+    DEFAULT_MODEL,
+    MODEL_ROUTES,
+    MODEL_TIMEOUTS,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_TTL,
+    EXTRACTION_CACHE_CASELESS_TYPES,
+    QUESTION_FANOUT_MIN_TECHNOLOGIES,
+    QUESTION_FANOUT_TIMEOUT,
+    QUESTION_FANOUT_MAX_WORKERS,
+    QUESTION_FANOUT_TOKENS_PER_QUESTION,
+)
+from utils.cache import LRUTTLCache, QuestionCache
+from utils.llm_backends import get_backend
+from utils.metrics import llm_metrics
+from utils.profiler import rerun_profiler
+from utils.scheduler import background_context, get_scheduler, is_timeout
+from utils.extractors import extract_locally, extract_all_locally, extract_phone
+from utils.intents import classify_intent
+from utils.question_diversity import deduplicate
+from utils.question_parsing import QuestionStreamParser, has_questions, parse_questions
 from utils.prompt_templates import (
+    PROMPT_TEMPLATE_VERSION,
     SYSTEM_PROMPT,
     get_information_extraction_prompt,
-    get_technical_questions_prompt
+    get_multi_field_extraction_prompt,
+    get_technical_questions_prompt,
+    get_technology_questions_prompt,
+    get_answer_scoring_prompt
 )
+from utils.tech_stack import canonicalize_tech_stack, split_tech_stack
+from utils.tokens import count_tokens
+
+# Generated questions shared across sessions, keyed by canonical tech stack
+question_cache = QuestionCache()
+
+# Runs the per-technology branches of fanned-out question generation, apart
+# from the prefetch and grading pools so a fan-out never queues behind them
+_fanout_executor = ThreadPoolExecutor(max_workers=QUESTION_FANOUT_MAX_WORKERS, thread_name_prefix="question-fanout")
 
-# Load environment variables
-load_dotenv()
+# Raw extraction completions shared across sessions, keyed by
+# (prompt template version, info_type, normalized message)
+extraction_cache = LRUTTLCache(EXTRACTION_CACHE_MAX_ENTRIES, EXTRACTION_CACHE_TTL)
 
-# Initialize Groq client
-client = groq.Client(api_key=os.getenv("GROQ_API_KEY"))
+llm_metrics.register_cache("questions", question_cache)
+llm_metrics.register_cache("extraction", extraction_cache)
+
+# Returned by generate_technical_questions when the LLM call fails
+QUESTION_ERROR_FALLBACK = ["Error generating questions. Please try again later."]
+
+def get_model_route(call_site: str, info_type: Optional[str] = None) -> List[str]:
+    """Look up the model cascade for a call.
+
+    Args:
+        call_site: Name of the calling feature
+        info_type: Field being extracted, if any
+
+    Returns:
+        Models to try in order, from MODEL_ROUTES or just DEFAULT_MODEL
+    """
+    if info_type and f"{call_site}:{info_type}" in MODEL_ROUTES:
+        return MODEL_ROUTES[f"{call_site}:{info_type}"]
+    return MODEL_ROUTES.get(call_site, [DEFAULT_MODEL])
+
+class ModelTimeoutError(Exception):
+    """Raised when a model in a cascade takes longer than its MODEL_TIMEOUTS entry."""
+
+def call_llm(
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    call_site: str,
+    info_type: Optional[str] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    accept: Optional[Callable[[str], bool]] = None,
+    **options
+) -> str:
+    """Send a prompt along the call's model cascade and record metrics for every attempt.
+    
+    Models are tried in the order given by MODEL_ROUTES. An answer is used unless
+    it is NOT_FOUND, fails `accept`, or the model errors or runs past its
+    MODEL_TIMEOUTS entry, in which case the next model is tried; the last model's
+    answer is always used. Each attempt is admitted by the shared scheduler,
+    which applies rate limits and retries, so this may block while other
+    sessions' calls go first.
+    
+    Args:
+        prompt: User prompt, sent after SYSTEM_PROMPT
+        temperature: Sampling temperature
+        max_tokens: Maximum completion tokens
+        call_site: Name of the calling feature, used for routing and to label metrics
+        info_type: Field being extracted, if any, used for routing and to label metrics
+        on_token: Optional callback receiving the accumulated completion text while
+            it streams in; when omitted the completion is requested in one piece
+        accept: Optional check of a completion; rejected completions escalate to the next model
+        **options: Extra request options such as response_format
+        
+    Returns:
+        The completion text
+    """
+    backend = get_backend()
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    
+    def request(model: str, timeout: Optional[float]):
+        request_options = dict(options, timeout=timeout) if timeout is not None else options
+        started = time.perf_counter()
+        try:
+            if on_token is None:
+                response = backend.complete(messages, model, temperature, max_tokens, **request_options)
+                completion = response.content
+                prompt_tokens, completion_tokens = response.prompt_tokens, response.completion_tokens
+            else:
+                completion = ""
+                for delta in backend.stream(messages, model, temperature, max_tokens, **request_options):
+                    completion += delta
+                    on_token(completion)
+                completion = completion.strip()
+                prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+                completion_tokens = count_tokens(completion)
+        except Exception as e:
+            llm_metrics.record(call_site, info_type, model, "error", time.perf_counter() - started, error=str(e))
+            # Escalate instead of letting the scheduler retry the same slow model
+            if timeout is not None and is_timeout(e):
+                raise ModelTimeoutError(f"{model} timed out after {timeout}s") from e
+            raise
+        
+        outcome = "not_found" if completion == "NOT_FOUND" else "ok"
+        llm_metrics.record(
+            call_site, info_type, model, outcome, time.perf_counter() - started, prompt_tokens, completion_tokens
+        )
+        return completion
+    
+    # All calls share the process-wide rate limits, concurrency cap and retry policy
+    estimated_tokens = sum(count_tokens(message["content"]) for message in messages) + max_tokens
+    models = get_model_route(call_site, info_type)
+    with rerun_profiler.llm_wait():
+        for model in models[:-1]:
+            try:
+                completion = get_scheduler().run(
+                    functools.partial(request, model, MODEL_TIMEOUTS.get(model)), call_site, estimated_tokens
+                )
+            except ModelTimeoutError:
+                reason = "timeout"
+            except Exception:
+                reason = "error"
+            else:
+                if completion == "NOT_FOUND":
+                    reason = "not_found"
+                elif accept is not None and not accept(completion):
+                    reason = "invalid"
+                else:
+                    return completion
+            llm_metrics.record_escalation(call_site, info_type, model, reason)
+        return get_scheduler().run(functools.partial(request, models[-1], None), call_site, estimated_tokens)
 
 def check_exit_keywords(message: str) -> bool:
-    """Check if the message contains exit keywords.
+    """Check if the message asks to end the conversation.
     
     Args:
         message: User message to check
         
     Returns:
-        True if exit keywords found, False otherwise
+        True if the message's intent is to exit, False otherwise
     """
-    return any(keyword in message.lower() for keyword in EXIT_KEYWORDS)
+    return classify_intent(message) == "exit"
+
+def normalize_message(user_message: str, casefold: bool = True) -> str:
+    """Normalize a message for use in cache keys (whitespace collapsed, optionally case-folded)."""
+    if casefold:
+        user_message = user_message.casefold()
+    return " ".join(user_message.split()).rstrip(".!")
+
+def is_valid_extraction(extracted_info: str, info_type: str) -> bool:
+    """Check an extracted value against the validation rules for its info type.
+    
+    Args:
+        extracted_info: Value returned by the LLM
+        info_type: Type of information extracted
+        
+    Returns:
+        False if the value is malformed for its type, True otherwise
+    """
+    if info_type == "email":
+        return bool(re.match(EMAIL_REGEX, extracted_info))
+    if info_type == "phone":
+        return bool(re.match(PHONE_REGEX, extracted_info))
+    return True
+
+def is_json_object(response: str) -> bool:
+    """Check whether a completion is a JSON object."""
+    try:
+        return isinstance(json.loads(response), dict)
+    except ValueError:
+        return False
 
 def extract_information(user_message: str, info_type: str) -> Optional[str]:
     """Extract specific information from user message using LLM.
     
+    Well-structured fields (email, phone, experience) are first tried with the
+    local extractors, and the LLM is only called when they find no confident match.
+    LLM answers are memoized across sessions, so common replies such as
+    "Software Engineer" or "3 years" only reach the model once.
+    
     Args:
         user_message: User message to extract information from
         info_type: Type of information to extract
@@ -40,26 +224,31 @@ def extract_information(user_message: str, info_type: str) -> Optional[str]:
     Returns:
         Extracted information or None if not found
     """
+    local_info = extract_locally(user_message, info_type)
+    if local_info:
+        return local_info
+    
     prompt = get_information_extraction_prompt(user_message, info_type)
     
     try:
-        response = client.chat.completions.create(
-            model="llama3-70b-8192",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            max_tokens=100
+        cache_key = (
+            PROMPT_TEMPLATE_VERSION,
+            info_type,
+            normalize_message(user_message, casefold=info_type in EXTRACTION_CACHE_CASELESS_TYPES),
         )
+        extracted_info = extraction_cache.get(cache_key)
+        if extracted_info is None:
+            extracted_info = call_llm(
+                prompt,
+                temperature=0.2,
+                max_tokens=100,
+                call_site="extract_information",
+                info_type=info_type,
+                accept=lambda answer: is_valid_extraction(answer, info_type)
+            )
+            extraction_cache.set(cache_key, extracted_info)
         
-        extracted_info = response.choices[0].message.content.strip()
-        
-        # Handle specific validation for different info types
-        if info_type == "email" and not re.match(EMAIL_REGEX, extracted_info):
-            return None
-        
-        if info_type == "phone" and not re.match(PHONE_REGEX, extracted_info):
+        if extracted_info == "NOT_FOUND" or not is_valid_extraction(extracted_info, info_type):
             return None
             
         return extracted_info
@@ -67,245 +256,327 @@ def extract_information(user_message: str, info_type: str) -> Optional[str]:
         print(f"Error extracting information: {e}")
         return None
 
-def generate_technical_questions(tech_stack: str) -> List[str]:
-    """Generate technical questions based on the candidate's tech stack.
+def looks_like_multi_field(user_message: str, current_state: str) -> bool:
+    """Check whether a message likely contains more than the field being asked for.
     
     Args:
-        tech_stack: Candidate's technology stack
+        user_message: User message to check
+        current_state: Current conversation state
         
     Returns:
-        List of technical questions
+        True if a local extractor finds a field other than the current one, or
+        the message is a list of several comma, semicolon or line separated parts
     """
-    prompt = get_technical_questions_prompt(tech_stack)
+    current_fields = [field for state, _, field in COLLECTION_STEPS if state == current_state]
+    if set(extract_all_locally(user_message)) - set(current_fields):
+        return True
+    segments = [segment for segment in re.split(r'[,;\n]', user_message) if segment.strip()]
+    return len(segments) >= 3
+
+def extract_all_information(user_message: str) -> Dict[str, str]:
+    """Extract every candidate field present in a message with a single LLM call.
     
-    try:
-        response = client.chat.completions.create(
-            model="llama3-70b-8192",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1024
-        )
-        
-        questions_text = response.choices[0].message.content.strip()
-        
-        # Extract individual questions (assuming they're numbered)
-        questions = []
-        for line in questions_text.split('\n'):
-            line = line.strip()
-            if re.match(r'^[\d\.\)\-]+', line) and len(line) > 5:
-                # Remove numbering and trim
-                clean_question = re.sub(r'^[\d\.\)\-]+\s*', '', line).strip()
-                if clean_question:
-                    questions.append(clean_question)
+    Args:
+        user_message: User message to extract information from
         
-        # Limit to MAX_TECH_QUESTIONS
-        return questions[:MAX_TECH_QUESTIONS]
+    Returns:
+        Extracted values keyed by candidate_info field; missing fields are omitted
+    """
+    found = extract_all_locally(user_message)
+    prompt = get_multi_field_extraction_prompt(user_message)
+    
+    try:
+        # Keyed as written: the answer carries the name and location
+        cache_key = (PROMPT_TEMPLATE_VERSION, "all", normalize_message(user_message, casefold=False))
+        response = extraction_cache.get(cache_key)
+        if response is None:
+            response = call_llm(
+                prompt,
+                temperature=0.2,
+                max_tokens=300,
+                call_site="extract_all_information",
+                accept=is_json_object,
+                response_format={"type": "json_object"}
+            )
+            extraction_cache.set(cache_key, response)
+        extracted = json.loads(response)
+        for field, value in extracted.items():
+            if field not in FIELD_LABELS or field in found or not isinstance(value, str):
+                continue
+            value = value.strip()
+            if not value or value == "NOT_FOUND":
+                continue
+            
+            # Apply the same validation as single-field extraction
+            if field == "email" and not re.match(EMAIL_REGEX, value):
+                continue
+            if field == "phone":
+                value = extract_phone(value)
+                if not value:
+                    continue
+                
+            found[field] = value
     except Exception as e:
-        print(f"Error generating technical questions: {e}")
-        return ["Error generating questions. Please try again later."]
+        print(f"Error extracting information: {e}")
+    
+    return found
 
-def get_next_state_response(current_state: str, user_message: str) -> Dict:
-    """Determine the next state and appropriate response based on current state and user input.
+def allocate_questions(technologies: List[str], total: int) -> List[Tuple[str, int]]:
+    """Share question slots evenly across technologies, earlier ones first.
     
     Args:
-        current_state: Current conversation state
-        user_message: User's message
+        technologies: Technologies in the order the candidate listed them
+        total: Number of questions to ask
         
     Returns:
-        Dictionary with next state and response message
+        (technology, question count) pairs; technologies beyond `total` get none and are left out
     """
-    if check_exit_keywords(user_message):
-        return {
-            "next_state": STATES["conversation_end"],
-            "response": "Thank you for your time! Your information has been recorded and our team will be in touch soon. Have a great day!"
-        }
+    technologies = technologies[:total]
+    base, extra = divmod(total, len(technologies))
+    return [(technology, base + (1 if i < extra else 0)) for i, technology in enumerate(technologies)]
+
+def merge_questions(branches: List[List[str]], total: int) -> List[str]:
+    """Merge per-technology questions round-robin so every technology is covered early.
     
-    # Handle each state in the conversation flow
-    if current_state == STATES["collecting_name"]:
-        name = extract_information(user_message, "name")
-        if name:
-            update_candidate_info("full_name", name)
-            return {
-                "next_state": STATES["collecting_email"],
-                "response": f"Nice to meet you, {name}! Could you please provide your email address?"
-            }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "I didn't catch your full name. Could you please provide it again?"
-            }
-            
-    elif current_state == STATES["collecting_email"]:
-        email = extract_information(user_message, "email")
-        if email:
-            update_candidate_info("email", email)
-            return {
-                "next_state": STATES["collecting_phone"],
-                "response": "Thank you! Now, could you please share your phone number?"
-            }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "That doesn't look like a valid email address. Could you please provide it in the format example@domain.com?"
-            }
-            
-    elif current_state == STATES["collecting_phone"]:
-        phone = extract_information(user_message, "phone")
-        if phone:
-            update_candidate_info("phone", phone)
-            return {
-                "next_state": STATES["collecting_experience"],
-                "response": "Great! How many years of experience do you have in your field?"
-            }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "I couldn't recognize that as a valid phone number. Could you please provide it again?"
-            }
-            
-    elif current_state == STATES["collecting_experience"]:
-        experience = extract_information(user_message, "experience")
-        if experience:
-            update_candidate_info("experience", experience)
-            return {
-                "next_state": STATES["collecting_position"],
-                "response": "Thank you! What position(s) are you interested in applying for?"
-            }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "I didn't catch your years of experience. Could you please provide it as a number or range?"
-            }
-            
-    elif current_state == STATES["collecting_position"]:
-        position = extract_information(user_message, "position")
-        if position:
-            update_candidate_info("desired_position", position)
-            return {
-                "next_state": STATES["collecting_location"],
-                "response": "Excellent! Where are you currently located?"
-            }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "I didn't understand which position you're interested in. Could you please specify again?"
-            }
-            
-    elif current_state == STATES["collecting_location"]:
-        location = extract_information(user_message, "location")
-        if location:
-            update_candidate_info("location", location)
-            return {
-                "next_state": STATES["collecting_tech_stack"],
-                "response": "Thanks! Now, please list your tech stack - the programming languages, frameworks, databases, and tools you're proficient in."
-            }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "I didn't catch your location. Could you please specify your city and country?"
-            }
-            
-    elif current_state == STATES["collecting_tech_stack"]:
-        tech_stack = extract_information(user_message, "tech_stack")
-        if tech_stack:
-            update_candidate_info("tech_stack", tech_stack)
-            # Generate technical questions based on tech stack
-            st.session_state.tech_questions = generate_technical_questions(tech_stack)
-            if st.session_state.tech_questions:
-                return {
-                    "next_state": STATES["asking_tech_questions"],
-                    "response": f"Great! Based on your tech stack, I'd like to ask you a few technical questions to assess your proficiency.\n\nFirst question: {st.session_state.tech_questions[0]}"
-                }
-            else:
-                return {
-                    "next_state": STATES["conversation_end"],
-                    "response": "Thank you for providing your information. Unfortunately, I couldn't generate technical questions at this time. Our team will review your profile and get back to you soon!"
-                }
-        else:
-            return {
-                "next_state": current_state,
-                "response": "I didn't catch your tech stack. Please list programming languages, frameworks, databases, and tools you're proficient in."
-            }
-            
-    elif current_state == STATES["asking_tech_questions"]:
-        # Store the answer to the current question in session state
-        current_question = st.session_state.tech_questions[st.session_state.current_question_idx]
-        st.session_state.questions_answered += 1
+    Each branch drops its own near-duplicates. Across branches only exact
+    repeats are dropped: questions about different technologies written from
+    the same pattern look alike word for word, but aren't duplicates.
+    
+    Args:
+        branches: Questions per technology, in allocation order; failed branches are empty
+        total: Maximum number of questions
         
-        # Move to the next question or end conversation
-        st.session_state.current_question_idx += 1
-        if st.session_state.current_question_idx < len(st.session_state.tech_questions):
-            next_question = st.session_state.tech_questions[st.session_state.current_question_idx]
-            return {
-                "next_state": STATES["asking_tech_questions"],
-                "response": f"Thanks for your answer. Next question: {next_question}"
-            }
-        else:
-            return {
-                "next_state": STATES["conversation_end"],
-                "response": "Thank you for answering all the technical questions! We've collected all the necessary information for now. Our recruitment team will review your profile and get back to you shortly if there's a good match. Do you have any questions for us?"
-            }
-            
-    elif current_state == STATES["conversation_end"]:
-        return {
-            "next_state": STATES["conversation_end"],
-            "response": "Our team has received your information and will be in touch soon. Have a great day!"
-        }
+    Returns:
+        Up to `total` questions
+    """
+    merged = [question for round_questions in zip_longest(*branches) for question in round_questions if question]
+    return list(dict.fromkeys(merged))[:total]
+
+def generate_technology_questions(technology: str, count: int) -> List[str]:
+    """Generate a few questions about one technology, as one branch of a fan-out.
+    
+    Args:
+        technology: Canonical technology name
+        count: Number of questions
         
-    # Fallback for unexpected states
-    return {
-        "next_state": current_state,
-        "response": "I apologize, but I didn't understand that. Could you please try again or rephrase your message?"
-    }
+    Returns:
+        Up to `count` questions
+        
+    Raises:
+        Exception: Errors from the LLM call, left to the fan-out to handle
+    """
+    cache_key = (f"fanout:{count}", technology)
+    cached_questions = question_cache.get(cache_key)
+    if cached_questions:
+        return cached_questions
+    
+    questions_text = call_llm(
+        get_technology_questions_prompt(technology, count),
+        temperature=0.7,
+        max_tokens=QUESTION_FANOUT_TOKENS_PER_QUESTION * count,
+        call_site="generate_technology_questions",
+        accept=has_questions,
+        response_format={"type": "json_object"},
+    )
+    questions = deduplicate(parse_questions(questions_text))[:count]
+    question_cache.put(cache_key, questions)
+    return questions
 
-def process_user_message(user_message: str, message_placeholder):
-    """Process user message and determine the appropriate response.
+async def generate_questions_fanout(
+    technologies: List[str],
+    total: int = MAX_TECH_QUESTIONS,
+    timeout: float = QUESTION_FANOUT_TIMEOUT
+) -> Tuple[List[str], bool]:
+    """Generate questions with one concurrent request per technology and merge them.
+    
+    Branches still running after `timeout` are abandoned (they keep filling the
+    cache in the background) and the merge uses the branches that finished. If
+    none has finished by then, the first one to succeed is waited for.
     
     Args:
-        user_message: Message from the user
-        message_placeholder: Streamlit placeholder for typing effect
+        technologies: Canonical technology names
+        total: Number of questions wanted
+        timeout: Seconds to wait for all branches
+        
+    Returns:
+        Up to `total` questions with balanced coverage (empty if every branch
+        failed), and whether every branch succeeded in time
     """
-    # Get current conversation state
-    current_state = get_conversation_state()
+    loop = asyncio.get_running_loop()
+    allocation = allocate_questions(technologies, total)
+    branches = [
+        # Each branch runs in a copy of the caller's context so metrics keep the conversation state
+        loop.run_in_executor(_fanout_executor, background_context().run, generate_technology_questions, technology, count)
+        for technology, count in allocation
+    ]
     
-    # Get next state and response
-    result = get_next_state_response(current_state, user_message)
-    next_state = result["next_state"]
-    response = result["response"]
+    done, pending = await asyncio.wait(branches, timeout=timeout)
+    while pending and not any(branch.exception() is None for branch in done):
+        finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        done |= finished
+    for branch in pending:
+        branch.cancel()
     
-    # Update conversation state
-    set_conversation_state(next_state)
+    results = []
+    for (technology, _), branch in zip(allocation, branches):
+        if branch in done and branch.exception() is not None:
+            print(f"Error generating questions for {technology}: {branch.exception()}")
+        results.append(branch.result() if branch in done and branch.exception() is None else [])
+    return merge_questions(results, total), all(results)
+
+def generate_technical_questions(
+    tech_stack: str,
+    on_question: Optional[Callable[[List[str]], None]] = None
+) -> List[str]:
+    """Generate technical questions based on the candidate's tech stack.
     
-    # Display response with typing effect
-    display_message_with_typing_effect(response, message_placeholder)
+    Question sets are cached by canonical tech stack, so candidates listing the
+    same technologies (in any order or spelling) are served without an LLM call.
+    Stacks of QUESTION_FANOUT_MIN_TECHNOLOGIES or more technologies are fanned
+    out into concurrent per-technology requests, so the wait is bounded by the
+    slowest small request rather than one long generation. Must not be called
+    from a thread running an event loop.
     
-    # Store the assistant's response in chat history
-    st.session_state.messages.append({"role": "assistant", "content": response})
+    Args:
+        tech_stack: Candidate's technology stack
+        on_question: Optional callback receiving the questions completed so far
+            each time another one finishes streaming in; when omitted (or when
+            fanning out) the completion is requested in one piece in JSON mode
+        
+    Returns:
+        List of technical questions
+    """
+    cache_key = canonicalize_tech_stack(tech_stack)
+    cached_questions = question_cache.get(cache_key)
+    if cached_questions:
+        return cached_questions
+    
+    try:
+        technologies = split_tech_stack(tech_stack)
+        complete = True
+        if len(technologies) >= QUESTION_FANOUT_MIN_TECHNOLOGIES:
+            questions, complete = asyncio.run(generate_questions_fanout(technologies))
+            if not questions:
+                raise RuntimeError("no question branch succeeded")
+        elif on_question is not None:
+            # JSON mode can't be combined with streaming, so the format is only asked for in the prompt
+            parser = QuestionStreamParser()
+            def on_token(completion: str):
+                if parser.feed(completion):
+                    on_question(list(parser.questions))
+            
+            questions_text = call_llm(
+                get_technical_questions_prompt(tech_stack),
+                temperature=0.7,
+                max_tokens=1024,
+                call_site="generate_technical_questions",
+                on_token=on_token,
+                accept=has_questions
+            )
+            questions = deduplicate(parse_questions(questions_text))
+        else:
+            questions_text = call_llm(
+                get_technical_questions_prompt(tech_stack),
+                temperature=0.7,
+                max_tokens=1024,
+                call_site="generate_technical_questions",
+                accept=has_questions,
+                response_format={"type": "json_object"}
+            )
+            questions = deduplicate(parse_questions(questions_text))
+        
+        # Limit to MAX_TECH_QUESTIONS
+        questions = questions[:MAX_TECH_QUESTIONS]
+        if not questions:
+            raise ValueError("no questions in the completion")
+        # A merge missing branches that failed or timed out is used once but not cached for the stack
+        if complete:
+            question_cache.put(cache_key, questions)
+        return questions
+    except Exception as e:
+        print(f"Error generating technical questions: {e}")
+        return list(QUESTION_ERROR_FALLBACK)
 
-def display_message_with_typing_effect(message: str, placeholder):
-    """Display message with typing effect.
+def complete_technical_questions(
+    questions: List[str],
+    covered: Sequence[str],
+    missing: Sequence[str],
+    total: int = MAX_TECH_QUESTIONS
+) -> List[str]:
+    """Complete questions generated for part of a tech stack with questions for the rest.
     
     Args:
-        message: Message to display
-        placeholder: Streamlit placeholder to update
+        questions: Questions generated for the covered technologies
+        covered: Technologies the questions were generated for
+        missing: Technologies of the final stack they don't cover
+        total: Number of questions wanted
+        
+    Returns:
+        Up to `total` questions, the missing technologies getting their share of
+        them; just the given questions if generating the rest failed
     """
-    # Display typing indicator
-    placeholder.markdown("▌")
-    time.sleep(0.5)
+    generated = generate_technical_questions(", ".join(missing))
+    if generated == QUESTION_ERROR_FALLBACK:
+        return questions[:total]
+    share = max(1, round(total * len(missing) / (len(covered) + len(missing))))
+    return merge_questions([questions[:total - share], generated[:share]], total)
+
+def generate_questions_speculatively(tech_stack: str) -> Optional[List[str]]:
+    """Generate technical questions in the background for a tentative tech stack.
     
-    # Split message into words for more natural typing effect
-    words = message.split()
-    displayed_message = ""
+    Args:
+        tech_stack: Tentative technology stack
+        
+    Returns:
+        List of technical questions, or None if generation failed
+    """
+    questions = generate_technical_questions(tech_stack)
+    return questions if questions != QUESTION_ERROR_FALLBACK else None
+
+def score_technical_answers(answers: List[Dict[str, str]]) -> Optional[Dict]:
+    """Score a candidate's answers to the technical questions with one LLM call.
+    
+    Args:
+        answers: Dictionaries with "question" and "answer", in the order asked
+        
+    Returns:
+        Dictionary with "answers" (each entry extended with "score" from 0 to 10
+        and "feedback") and "overall_score" (the mean score), or None if scoring failed
+    """
+    if not answers:
+        return None
     
-    for i, word in enumerate(words):
-        displayed_message += word + " "
-        placeholder.markdown(displayed_message + "▌")
-        # Random typing speed for more natural effect
-        delay = min(0.1, 0.02 + (len(word) * 0.005))
-        time.sleep(delay)
+    prompt = get_answer_scoring_prompt(answers)
     
-    # Final message without cursor
-    placeholder.markdown(message)
\ No newline at end of file
+    try:
+        response = call_llm(
+            prompt,
+            temperature=0.0,
+            max_tokens=60 * len(answers) + 50,
+            call_site="score_technical_answers",
+            accept=is_json_object,
+            response_format={"type": "json_object"}
+        )
+        scores = json.loads(response).get("scores")
+        if not isinstance(scores, list) or len(scores) != len(answers):
+            print("Error scoring technical answers: expected one score per answer")
+            return None
+        
+        scored = []
+        for entry, result in zip(answers, scores):
+            score = result.get("score") if isinstance(result, dict) else None
+            if not isinstance(score, (int, float)):
+                print("Error scoring technical answers: missing score")
+                return None
+            scored.append({
+                **entry,
+                "score": max(0.0, min(10.0, float(score))),
+                "feedback": str(result.get("feedback") or ""),
+            })
+        return {
+            "answers": scored,
+            "overall_score": round(sum(entry["score"] for entry in scored) / len(scored), 2),
+        }
+    except Exception as e:
+        print(f"Error scoring technical answers: {e}")
+        return None
@@ -0,0 +1,244 @@
+"""Instrumentation for LLM calls.
+
+Every call made through `llm_handler.call_llm` is recorded with its wall time,
+token usage, model, call site, info_type, conversation state and outcome
+("ok", "error" or "not_found"), and escalations of the model cascade are
+counted. Calls are aggregated into histograms exposed in the Prometheus text
+format (optionally served over HTTP) and appended to a rotating JSONL log.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.constants import (
+    LATENCY_BUCKETS,
+    TOKEN_BUCKETS,
+    METRICS_LOG_PATH,
+    METRICS_LOG_MAX_BYTES,
+    METRICS_LOG_BACKUP_COUNT,
+)
+
+# Conversation state of the turn making LLM calls, set by the engine
+conversation_state_var: contextvars.ContextVar[str] = contextvars.ContextVar("conversation_state", default="none")
+
+LABEL_NAMES = ("call_site", "info_type", "state", "model", "outcome")
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+class LLMMetrics:
+    """Thread-safe registry of LLM call histograms keyed by label values."""
+
+    def __init__(self, log_path: Optional[str] = METRICS_LOG_PATH):
+        """Create an empty registry.
+
+        Args:
+            log_path: Rotating JSONL log receiving one record per call, or None to disable it
+        """
+        self.latency: Dict[Tuple[str, ...], Histogram] = {}
+        self.prompt_tokens: Dict[Tuple[str, ...], Histogram] = {}
+        self.completion_tokens: Dict[Tuple[str, ...], Histogram] = {}
+        self.caches: Dict[str, Any] = {}
+        self.escalations: Dict[Tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+        self._logger = self._create_logger(log_path) if log_path else None
+
+    @staticmethod
+    def _create_logger(log_path: str) -> logging.Logger:
+        directory = os.path.dirname(log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        logger = logging.getLogger(f"talentscout.llm_calls.{os.path.abspath(log_path)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(
+                log_path, maxBytes=METRICS_LOG_MAX_BYTES, backupCount=METRICS_LOG_BACKUP_COUNT, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        return logger
+
+    def record(
+        self,
+        call_site: str,
+        info_type: Optional[str],
+        model: str,
+        outcome: str,
+        duration: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record one LLM call.
+
+        Args:
+            call_site: Function or feature making the call, e.g. "extract_information"
+            info_type: Field being extracted, if any
+            model: Model that served the call
+            outcome: "ok", "error" or "not_found"
+            duration: Wall time in seconds
+            prompt_tokens: Prompt tokens used
+            completion_tokens: Completion tokens generated
+            error: Error message for failed calls
+        """
+        state = conversation_state_var.get()
+        labels = (call_site, info_type or "", state, model, outcome)
+        with self._lock:
+            self.latency.setdefault(labels, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.prompt_tokens.setdefault(labels, Histogram(TOKEN_BUCKETS)).observe(prompt_tokens)
+            self.completion_tokens.setdefault(labels, Histogram(TOKEN_BUCKETS)).observe(completion_tokens)
+
+        if self._logger:
+            record = dict(zip(LABEL_NAMES, labels))
+            record.update({
+                "timestamp": time.time(),
+                "duration": round(duration, 6),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            })
+            if error:
+                record["error"] = error
+            self._logger.info(json.dumps(record))
+
+    def record_escalation(self, call_site: str, info_type: Optional[str], model: str, reason: str) -> None:
+        """Record a model cascade moving past a model.
+
+        Args:
+            call_site: Function or feature making the call
+            info_type: Field being extracted, if any
+            model: Model whose answer was not used
+            reason: "not_found", "invalid", "timeout" or "error"
+        """
+        labels = (call_site, info_type or "", model, reason)
+        with self._lock:
+            self.escalations[labels] = self.escalations.get(labels, 0) + 1
+
+    def route_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize calls, latency and escalations per route and model, for tuning MODEL_ROUTES.
+
+        Returns:
+            Statistics keyed by "<call_site>:<info_type>:<model>"
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for (call_site, info_type, _, model, _), histogram in self.latency.items():
+                route = summary.setdefault(
+                    f"{call_site}:{info_type}:{model}", {"calls": 0, "total_seconds": 0.0, "escalations": {}}
+                )
+                route["calls"] += histogram.count
+                route["total_seconds"] += histogram.sum
+            for (call_site, info_type, model, reason), count in self.escalations.items():
+                route = summary.setdefault(
+                    f"{call_site}:{info_type}:{model}", {"calls": 0, "total_seconds": 0.0, "escalations": {}}
+                )
+                route["escalations"][reason] = count
+        for route in summary.values():
+            route["mean_seconds"] = route["total_seconds"] / route["calls"] if route["calls"] else 0.0
+            route["escalation_rate"] = sum(route["escalations"].values()) / route["calls"] if route["calls"] else 0.0
+        return dict(sorted(summary.items()))
+
+    def render_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, help_text, histograms in [
+                ("talentscout_llm_request_duration_seconds", "Wall time of LLM calls.", self.latency),
+                ("talentscout_llm_prompt_tokens", "Prompt tokens per LLM call.", self.prompt_tokens),
+                ("talentscout_llm_completion_tokens", "Completion tokens per LLM call.", self.completion_tokens),
+            ]:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(histograms.items()):
+                    label_text = ",".join(f'{key}="{value}"' for key, value in zip(LABEL_NAMES, labels))
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+            name = "talentscout_llm_escalations_total"
+            lines.append(f"# HELP {name} Model cascade escalations past a model.")
+            lines.append(f"# TYPE {name} counter")
+            for labels, count in sorted(self.escalations.items()):
+                label_text = ",".join(
+                    f'{key}="{value}"' for key, value in zip(("call_site", "info_type", "model", "reason"), labels)
+                )
+                lines.append(f"{name}{{{label_text}}} {count}")
+            for name, attribute in [("talentscout_cache_hits_total", "hits"), ("talentscout_cache_misses_total", "misses")]:
+                lines.append(f"# TYPE {name} counter")
+                for cache_name, cache in sorted(self.caches.items()):
+                    lines.append(f'{name}{{cache="{cache_name}"}} {getattr(cache, attribute)}')
+        return "\n".join(lines) + "\n"
+
+    def register_cache(self, name: str, cache: Any) -> None:
+        """Export a cache's `hits` and `misses` counters with the LLM metrics."""
+        with self._lock:
+            self.caches[name] = cache
+
+    def reset(self) -> None:
+        """Drop all recorded calls."""
+        with self._lock:
+            self.latency.clear()
+            self.prompt_tokens.clear()
+            self.completion_tokens.clear()
+            self.escalations.clear()
+
+# Process-wide registry used by llm_handler
+llm_metrics = LLMMetrics(log_path=os.getenv("TALENTSCOUT_METRICS_LOG", METRICS_LOG_PATH) or None)
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> None:
+    """Serve the metrics at /metrics on a background thread, once per process.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+    """
+    global _server
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = llm_metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"Error starting metrics server: {e}")
+            return
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
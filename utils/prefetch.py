@@ -0,0 +1,99 @@
+"""Speculative background execution of slow LLM work."""
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from utils.constants import PREFETCH_MAX_WORKERS, PREFETCH_MIN_COVERAGE
+from utils.scheduler import background_context
+
+# Shared by all sessions in the process
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch")
+
+class SpeculativeTask:
+    """A background computation started before its exact input is known."""
+
+    def __init__(self, key: Tuple[str, ...], future: Future):
+        self.key = key
+        self.future = future
+
+    def cancel(self) -> None:
+        """Cancel the task if it has not started running yet."""
+        self.future.cancel()
+
+def submit_speculative(
+    current: Optional[SpeculativeTask],
+    key: Tuple[str, ...],
+    fn: Callable[..., Any],
+    *args: Any,
+    executor: Optional[Executor] = None
+) -> SpeculativeTask:
+    """Start fn(*args) in the background unless a task for the same key is already running.
+
+    Args:
+        current: Previously submitted task, if any
+        key: Canonical key describing the speculative input
+        fn: Function to run
+        *args: Arguments for fn
+        executor: Executor to run fn on (defaults to the shared prefetch pool)
+
+    Returns:
+        The task now responsible for the key
+    """
+    if current is not None:
+        if current.key == key:
+            return current
+        current.cancel()
+    # Run in a copy of the caller's context so metrics keep the conversation state
+    context = background_context()
+    return SpeculativeTask(key, (executor or _executor).submit(context.run, fn, *args))
+
+def resolve_speculative(
+    task: Optional[SpeculativeTask],
+    key: Tuple[str, ...],
+    fill: Optional[Callable[[Any, Tuple[str, ...], Tuple[str, ...]], Any]] = None
+) -> Optional[Any]:
+    """Reconcile a speculative task with the final input.
+
+    The result is used as is when the speculative key is the final key. When
+    it covers only part of it (every speculative item is in the final key and
+    they make up at least PREFETCH_MIN_COVERAGE of it), `fill` completes the
+    result for the missing items. Otherwise, or if the task hasn't started
+    yet, it is cancelled.
+
+    Args:
+        task: Previously submitted task, if any
+        key: Canonical key of the final input
+        fill: Function completing a partial result, called with the result,
+            the speculative key and the missing items; without it only an
+            exact match is used
+
+    Returns:
+        The task's result, waiting for it if still running, or None if there is
+        no usable task, it never started or it failed
+    """
+    if task is None:
+        return None
+
+    speculative, final = set(task.key), set(key)
+    missing = tuple(item for item in key if item not in speculative)
+    if (
+        not final
+        or not speculative <= final
+        or len(speculative) / len(final) < PREFETCH_MIN_COVERAGE
+        or (missing and fill is None)
+    ):
+        task.cancel()
+        return None
+    # Still queued behind other sessions' work in the shared pool: generating
+    # directly is quicker than waiting for a worker to free up
+    if task.future.cancel():
+        return None
+
+    try:
+        result = task.future.result()
+    except Exception as e:
+        print(f"Error in speculative task: {e}")
+        return None
+    if missing and result is not None:
+        return fill(result, task.key, missing)
+    return result
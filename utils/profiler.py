@@ -0,0 +1,238 @@
+"""Opt-in profiler for Streamlit reruns.
+
+Enabled with TALENTSCOUT_PROFILE=1. Every rerun of the script (a full run of
+`app.main` or a rerun of the conversation fragment) is timed phase by phase,
+and the time it spent waiting on the LLM (calls made during the rerun,
+including queueing in the scheduler, and waits on questions generated in
+the background) is measured separately. That splits a slow turn into LLM
+time and everything else (rendering and local work). The last
+PROFILE_WINDOW reruns are kept for rolling percentiles.
+
+With TALENTSCOUT_PROFILE_DUMPS=N, every rerun also runs under cProfile and
+the N slowest are kept as .prof files in TALENTSCOUT_PROFILE_DIR. Open them
+with `python -m pstats`, snakeviz, or flameprof for a flame graph.
+"""
+
+import contextlib
+import contextvars
+import cProfile
+import heapq
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.constants import PROFILE_WINDOW, PROFILE_DUMP_DIR
+
+class RerunRecord:
+    """Timings of one rerun."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.llm_wait = 0.0
+        self.phases: Dict[str, float] = {}
+        self._llm_intervals: List[Tuple[float, float]] = []
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_llm_interval(self, start: float, end: float) -> None:
+        """Record a span of LLM waiting; LLM work ending after the rerun finished is not counted."""
+        with self._lock:
+            if not self._finished:
+                self._llm_intervals.append((start, end))
+
+    def finish(self) -> None:
+        """Stop the clock and merge overlapping LLM waits (e.g. concurrent fan-out branches)."""
+        ended = time.perf_counter()
+        with self._lock:
+            self._finished = True
+            intervals = sorted(self._llm_intervals)
+        self.total = ended - self.started
+        covered_until = self.started
+        for start, end in intervals:
+            start, end = max(start, covered_until), min(end, ended)
+            if end > start:
+                self.llm_wait += end - start
+                covered_until = end
+
+    @property
+    def render(self) -> float:
+        """Time not spent waiting on the LLM."""
+        return self.total - self.llm_wait
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+class RerunProfiler:
+    """Collects rerun timings for the whole process.
+
+    Configured from the environment the first time a rerun starts. When
+    disabled, every method is a cheap no-op.
+    """
+
+    def __init__(self, window: int = PROFILE_WINDOW):
+        self.window = window
+        self.enabled: Optional[bool] = None
+        self.dumps = 0
+        self.dump_dir = PROFILE_DUMP_DIR
+        self.records: "deque[RerunRecord]" = deque(maxlen=window)
+        self._slowest: List[Tuple[float, str]] = []
+        self._current: contextvars.ContextVar[Optional[RerunRecord]] = contextvars.ContextVar("rerun", default=None)
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, dumps: int = 0, dump_dir: Optional[str] = None) -> None:
+        """Turn profiling on or off.
+
+        Args:
+            enabled: Whether to time reruns
+            dumps: Number of slowest reruns to keep cProfile dumps of (0 for none)
+            dump_dir: Directory of the dumps
+        """
+        self.enabled = enabled
+        self.dumps = dumps if enabled else 0
+        self.dump_dir = dump_dir or PROFILE_DUMP_DIR
+
+    def configure_from_env(self) -> None:
+        """Configure from TALENTSCOUT_PROFILE, TALENTSCOUT_PROFILE_DUMPS and TALENTSCOUT_PROFILE_DIR."""
+        self.configure(
+            os.getenv("TALENTSCOUT_PROFILE", "").lower() in ("1", "true", "yes"),
+            int(os.getenv("TALENTSCOUT_PROFILE_DUMPS", "0")),
+            os.getenv("TALENTSCOUT_PROFILE_DIR"),
+        )
+
+    @contextlib.contextmanager
+    def rerun(self, kind: str) -> Iterator[None]:
+        """Time a rerun of the given kind; inside another rerun it is timed as a phase of it."""
+        if self.enabled is None:
+            self.configure_from_env()
+        if not self.enabled:
+            yield
+            return
+        if self._current.get() is not None:
+            with self.phase(kind):
+                yield
+            return
+
+        record = RerunRecord(kind)
+        token = self._current.set(record)
+        profile = cProfile.Profile() if self.dumps else None
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._current.reset(token)
+            record.finish()
+            with self._lock:
+                self.records.append(record)
+            if profile is not None:
+                self._keep_if_slowest(record, profile)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the current rerun."""
+        record = self._current.get()
+        if record is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.add_phase(name, time.perf_counter() - started)
+
+    @contextlib.contextmanager
+    def llm_wait(self) -> Iterator[None]:
+        """Attribute the time inside the block to waiting on the LLM.
+
+        Works from any thread running in a copy of the rerun's context, such
+        as fan-out branches; overlapping waits count once.
+        """
+        record = self._current.get()
+        if record is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.add_llm_interval(started, time.perf_counter())
+
+    def _keep_if_slowest(self, record: RerunRecord, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if len(self._slowest) >= self.dumps and record.total <= self._slowest[0][0]:
+                return
+            os.makedirs(self.dump_dir, exist_ok=True)
+            path = os.path.join(
+                self.dump_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{record.kind}-{record.total * 1000:.0f}ms.prof"
+            )
+            profile.dump_stats(path)
+            heapq.heappush(self._slowest, (record.total, path))
+            if len(self._slowest) > self.dumps:
+                _, evicted = heapq.heappop(self._slowest)
+                with contextlib.suppress(OSError):
+                    os.remove(evicted)
+
+    def summary(self) -> Dict:
+        """Rolling percentiles over the reruns in the window.
+
+        Returns:
+            Rerun counts by kind, the share of time spent waiting on the LLM,
+            rows of p50/p95/p99/max milliseconds (total, LLM wait, the rest,
+            then each phase) and the kept dumps, slowest first
+        """
+        with self._lock:
+            records = list(self.records)
+            dumps = [path for _, path in sorted(self._slowest, reverse=True)]
+        if not records:
+            return {"reruns": 0, "kinds": {}, "llm_share": 0.0, "rows": [], "dumps": dumps}
+
+        series: Dict[str, List[float]] = {
+            "total": [record.total for record in records],
+            "llm_wait": [record.llm_wait for record in records],
+            "render": [record.render for record in records],
+        }
+        for record in records:
+            for name, seconds in record.phases.items():
+                series.setdefault(f"phase:{name}", []).append(seconds)
+
+        rows = [
+            {
+                "name": name,
+                "count": len(values),
+                "p50_ms": percentile(values, 0.5) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+                "max_ms": max(values) * 1000,
+            }
+            for name, values in series.items()
+        ]
+        kinds: Dict[str, int] = {}
+        for record in records:
+            kinds[record.kind] = kinds.get(record.kind, 0) + 1
+        total = sum(series["total"])
+        return {
+            "reruns": len(records),
+            "kinds": kinds,
+            "llm_share": sum(series["llm_wait"]) / total if total else 0.0,
+            "rows": rows,
+            "dumps": dumps,
+        }
+
+    def reset(self) -> None:
+        """Forget every recorded rerun (kept dumps stay on disk)."""
+        with self._lock:
+            self.records.clear()
+            self._slowest = []
+
+rerun_profiler = RerunProfiler()
@@ -1,110 +1,270 @@
-"""Prompt templates for LLM interactions."""
+"""Prompt templates for LLM interactions.
+
+Templates are compiled once at import: whitespace is normalized, the fixed
+parameters (such as the info_type) are filled in, and the token count of the
+fixed text is computed. Rendering only inserts the variable input, truncated
+to fit the call's token budget.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from utils.constants import PROMPT_TOKEN_BUDGETS, GRADING_ANSWER_TOKEN_LIMIT, MAX_TECH_QUESTIONS
+from utils.tokens import count_tokens, truncate_to_tokens
+
+# Bump whenever a prompt changes so cached LLM answers to the old prompts are not reused
+PROMPT_TEMPLATE_VERSION = 3
+
+def compact(text: str) -> str:
+    """Normalize prompt whitespace: strip every line, drop blank lines and collapse runs of spaces."""
+    lines = (re.sub(r'[ \t]+', ' ', line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
 
 # System prompt to guide the model's behavior
-SYSTEM_PROMPT = """
+SYSTEM_PROMPT = compact("""
 You are an AI assistant for TalentScout, a recruitment agency specializing in technology placements.
-Your role is to assist in the initial screening of candidates by gathering essential information and 
+Your role is to assist in the initial screening of candidates by gathering essential information and
 asking relevant technical questions based on the candidate's declared tech stack.
-
-Be professional, concise, and friendly in your responses. 
+Be professional, concise, and friendly in your responses.
 Focus on extracting accurate information for the recruitment process.
-"""
+""")
+
+SYSTEM_PROMPT_TOKENS = count_tokens(SYSTEM_PROMPT)
+
+class PromptTemplate:
+    """A compiled prompt with a single variable slot."""
+
+    def __init__(self, name: str, text: str, slot: str, call_site: str):
+        """Compile a template.
+
+        Args:
+            name: Template name used in reports
+            text: Template text containing "{<slot>}" exactly once
+            slot: Name of the variable input
+            call_site: Call site whose token budget applies to the rendered prompt
+        """
+        self.name = name
+        self.slot = slot
+        self.call_site = call_site
+        self.prefix, self.suffix = compact(text).split("{" + slot + "}")
+        self.fixed_tokens = count_tokens(self.prefix + self.suffix)
+
+    def render(self, value: str, budget: Optional[int] = None) -> str:
+        """Fill in the slot, truncating the value so the prompt fits the token budget.
+
+        Args:
+            value: Variable input, e.g. the user message
+            budget: Token budget for the system prompt plus this prompt; defaults
+                to the call site's entry in PROMPT_TOKEN_BUDGETS
+
+        Returns:
+            The rendered prompt
+        """
+        if budget is None:
+            budget = PROMPT_TOKEN_BUDGETS.get(self.call_site)
+        value = compact(value)
+        if budget is not None:
+            value = truncate_to_tokens(value, max(budget - SYSTEM_PROMPT_TOKENS - self.fixed_tokens, 1))
+        return self.prefix + value + self.suffix
+
+# Field-specific guidance appended to the extraction instructions
+EXTRACTION_INSTRUCTIONS = {
+    "name": """
+        Extract the person's full name; if only a first name is given, return just that.
+        Example: "My name is John Smith" -> "John Smith".
+    """,
+    "email": """
+        Extract a valid email address (username@domain.com).
+        Example: "You can reach me at john.smith@example.com" -> "john.smith@example.com".
+    """,
+    "phone": """
+        Extract a valid phone number in any format, including international ones.
+        Example: "My number is +1-555-123-4567" -> "+15551234567".
+    """,
+    "experience": """
+        Extract the years of experience as a number or range.
+        Examples: "I have been working for 5 years" -> "5 years"; "I have 3-5 years of experience" -> "3-5 years".
+    """,
+    "position": """
+        Extract the position or role the candidate wants; separate several with commas.
+        Example: "I'd like to apply for the Software Engineer position" -> "Software Engineer".
+    """,
+    "location": """
+        Extract the candidate's current location, preferably as city and country.
+        Example: "I'm currently based in New York, USA" -> "New York, USA".
+    """,
+    "tech_stack": """
+        Extract every programming language, framework, database and tool mentioned, separated by commas.
+        Example: "I work with Python, Django, PostgreSQL, and Docker" -> "Python, Django, PostgreSQL, Docker".
+    """,
+}
+
+def _compile_extraction_template(info_type: str) -> PromptTemplate:
+    return PromptTemplate(
+        f"extract_information:{info_type}",
+        f"""
+        Extract the {info_type} from the user message below.
+        Return ONLY the extracted {info_type}, without any other text, explanation or formatting.
+        If there is no valid {info_type}, respond with "NOT_FOUND".
+        {EXTRACTION_INSTRUCTIONS.get(info_type, "")}
+        USER MESSAGE: {{user_message}}
+        """,
+        "user_message",
+        "extract_information",
+    )
+
+EXTRACTION_TEMPLATES: Dict[str, PromptTemplate] = {
+    info_type: _compile_extraction_template(info_type) for info_type in EXTRACTION_INSTRUCTIONS
+}
+
+MULTI_FIELD_EXTRACTION_TEMPLATE = PromptTemplate(
+    "extract_all_information",
+    """
+    Extract the candidate details stated in the user message below.
+    Return ONLY a JSON object with exactly these keys:
+    "full_name": full name
+    "email": valid email address
+    "phone": phone number, digits with an optional leading "+"
+    "experience": years of experience as a number or range, e.g. "5 years" or "3-5 years"
+    "desired_position": position(s) wanted, comma separated
+    "location": current location, preferably city and country
+    "tech_stack": languages, frameworks, databases and tools, comma separated
+    Use null for any detail not clearly stated. Do not guess.
+    Example: "I'm Jane Doe, a backend developer in Berlin" -> {"full_name": "Jane Doe", "email": null, "phone": null, "experience": null, "desired_position": "Backend Developer", "location": "Berlin, Germany", "tech_stack": null}
+    USER MESSAGE: {user_message}
+    """,
+    "user_message",
+    "extract_all_information",
+)
+
+TECHNICAL_QUESTIONS_TEMPLATE = PromptTemplate(
+    "generate_technical_questions",
+    """
+    Generate 5 technical questions to assess a candidate's proficiency in this tech stack.
+    TECH STACK: {tech_stack}
+    Guidelines:
+    1. Assess practical knowledge and problem-solving ability.
+    2. Mix basic and advanced concepts for each technology.
+    3. Focus on real-world applications and common challenges.
+    4. Avoid yes/no questions.
+    5. Keep questions specific to the technologies listed.
+    Return ONLY a JSON object with the questions in order, without numbering:
+    {"questions": ["<question 1>", "<question 2>", "<question 3>", "<question 4>", "<question 5>"]}
+    Do not provide answers.
+    """,
+    "tech_stack",
+    "generate_technical_questions",
+)
+
+def _compile_technology_questions_template(count: int) -> PromptTemplate:
+    return PromptTemplate(
+        f"generate_technology_questions:{count}",
+        f"""
+        Generate {count} technical question{"s" if count > 1 else ""} to assess a candidate's proficiency in one technology.
+        TECH STACK: {{tech_stack}}
+        Assess practical knowledge and problem-solving on real-world applications; avoid yes/no questions.
+        Return ONLY a JSON object with the questions in order, without numbering:
+        {{"questions": ["<question>"{', ...' if count > 1 else ''}]}}
+        Do not provide answers.
+        """,
+        "tech_stack",
+        "generate_technology_questions",
+    )
+
+# Per-technology templates for fanned-out question generation, keyed by question count
+TECHNOLOGY_QUESTIONS_TEMPLATES: Dict[int, PromptTemplate] = {
+    count: _compile_technology_questions_template(count) for count in range(1, MAX_TECH_QUESTIONS + 1)
+}
+
+ANSWER_SCORING_TEMPLATE = PromptTemplate(
+    "score_technical_answers",
+    """
+    Score each of the candidate's answers to the technical questions below from 0 (wrong or missing)
+    to 10 (complete and correct), with one sentence of feedback.
+    Return ONLY a JSON object with one entry per answer, in order:
+    {"scores": [{"score": <0-10>, "feedback": "<one sentence>"}]}
+    ANSWERS:
+    {answers}
+    """,
+    "answers",
+    "score_technical_answers",
+)
 
-def get_information_extraction_prompt(user_message: str, info_type: str) -> str:
+def get_information_extraction_prompt(user_message: str, info_type: str, budget: Optional[int] = None) -> str:
     """Generate a prompt for extracting specific information from user message.
-    
+
     Args:
         user_message: User message to extract information from
         info_type: Type of information to extract
-        
+        budget: Optional token budget overriding PROMPT_TOKEN_BUDGETS
+
     Returns:
         Prompt for the LLM
     """
-    # Base prompt structure
-    base_prompt = f"""
-    Extract the {info_type} from the following message:
-    
-    USER MESSAGE: {user_message}
-    
-    Return ONLY the extracted {info_type} without any additional text, explanations, or formatting.
-    If you cannot find a valid {info_type}, respond with "NOT_FOUND".
-    """
-    
-    # Add specific instructions based on info type
-    if info_type == "name":
-        base_prompt += """
-        Extract the full name of the person. If only a first name is provided, return just that.
-        Example: For "My name is John Smith", return "John Smith".
-        """
-    
-    elif info_type == "email":
-        base_prompt += """
-        Extract a valid email address in the format username@domain.com.
-        Example: For "You can reach me at john.smith@example.com", return "john.smith@example.com".
-        """
-    
-    elif info_type == "phone":
-        base_prompt += """
-        Extract a valid phone number. Accept various formats including international formats.
-        Example: For "My number is +1-555-123-4567", return "+15551234567".
-        """
-    
-    elif info_type == "experience":
-        base_prompt += """
-        Extract the years of experience as a number or range.
-        Example: For "I have been working for 5 years", return "5 years".
-        For "I have 3-5 years of experience", return "3-5 years".
-        """
-    
-    elif info_type == "position":
-        base_prompt += """
-        Extract the desired position or role the candidate is interested in.
-        Example: For "I'd like to apply for the Software Engineer position", return "Software Engineer".
-        For multiple positions, list them all separated by commas.
-        """
-    
-    elif info_type == "location":
-        base_prompt += """
-        Extract the current location of the candidate, preferably as city and country.
-        Example: For "I'm currently based in New York, USA", return "New York, USA".
-        """
-    
-    elif info_type == "tech_stack":
-        base_prompt += """
-        Extract the technology stack mentioned, including programming languages, frameworks, databases, and tools.
-        Example: For "I work with Python, Django, PostgreSQL, and Docker", return "Python, Django, PostgreSQL, Docker".
-        List all technologies mentioned, separated by commas.
-        """
-    
-    return base_prompt
+    template = EXTRACTION_TEMPLATES.get(info_type) or _compile_extraction_template(info_type)
+    return template.render(user_message, budget)
 
-def get_technical_questions_prompt(tech_stack: str) -> str:
+def get_technical_questions_prompt(tech_stack: str, budget: Optional[int] = None) -> str:
     """Generate a prompt for creating technical questions based on tech stack.
-    
+
     Args:
         tech_stack: Candidate's technology stack
-        
+        budget: Optional token budget overriding PROMPT_TOKEN_BUDGETS
+
     Returns:
         Prompt for the LLM
     """
-    return f"""
-    Based on the following technology stack, generate 5 relevant technical questions to assess a candidate's proficiency.
-    
-    TECH STACK: {tech_stack}
-    
-    Guidelines for questions:
-    1. Questions should assess practical knowledge and problem-solving abilities.
-    2. Include a mix of basic and advanced concepts for each technology.
-    3. Focus on real-world applications and common challenges.
-    4. Avoid questions that can be answered with a simple yes/no.
-    5. Make sure questions are specific to the technologies mentioned.
-    
-    Format each question as a numbered list:
-    1. [Question text]
-    2. [Question text]
-    3. [Question text]
-    4. [Question text]
-    5. [Question text]
-    
-    Do not provide answers to the questions.
-    """
\ No newline at end of file
+    return TECHNICAL_QUESTIONS_TEMPLATE.render(tech_stack, budget)
+
+def get_technology_questions_prompt(technology: str, count: int, budget: Optional[int] = None) -> str:
+    """Generate a prompt for a few technical questions about one technology.
+
+    Args:
+        technology: Technology to ask about
+        count: Number of questions, from 1 to MAX_TECH_QUESTIONS
+        budget: Optional token budget overriding PROMPT_TOKEN_BUDGETS
+
+    Returns:
+        Prompt for the LLM
+    """
+    template = TECHNOLOGY_QUESTIONS_TEMPLATES.get(count) or _compile_technology_questions_template(count)
+    return template.render(technology, budget)
+
+def get_multi_field_extraction_prompt(user_message: str, budget: Optional[int] = None) -> str:
+    """Generate a prompt for extracting every candidate field from one message.
+
+    Args:
+        user_message: User message to extract information from
+        budget: Optional token budget overriding PROMPT_TOKEN_BUDGETS
+
+    Returns:
+        Prompt for the LLM
+    """
+    return MULTI_FIELD_EXTRACTION_TEMPLATE.render(user_message, budget)
+
+def get_answer_scoring_prompt(answers: List[Dict[str, str]], budget: Optional[int] = None) -> str:
+    """Generate a prompt for scoring a candidate's answers to the technical questions.
+
+    Args:
+        answers: Dictionaries with "question" and "answer"
+        budget: Optional token budget overriding PROMPT_TOKEN_BUDGETS
+
+    Returns:
+        Prompt for the LLM
+    """
+    lines = []
+    for i, entry in enumerate(answers, 1):
+        lines.append(f"Q{i}: {' '.join(entry['question'].split())}")
+        lines.append(f"A{i}: {truncate_to_tokens(' '.join(entry['answer'].split()), GRADING_ANSWER_TOKEN_LIMIT)}")
+    return ANSWER_SCORING_TEMPLATE.render("\n".join(lines), budget)
+
+def all_templates() -> Dict[str, PromptTemplate]:
+    """Return every compiled template keyed by name."""
+    templates = [
+        *EXTRACTION_TEMPLATES.values(),
+        MULTI_FIELD_EXTRACTION_TEMPLATE,
+        TECHNICAL_QUESTIONS_TEMPLATE,
+        *TECHNOLOGY_QUESTIONS_TEMPLATES.values(),
+        ANSWER_SCORING_TEMPLATE,
+    ]
+    return {template.name: template for template in templates}
@@ -0,0 +1,315 @@
+"""Curated technical question bank with an inverted index over technologies.
+
+The bank (`question_bank.json`) holds question pools per canonical technology,
+seeded from TECH_STACK_EXAMPLES, and per position from TECH_POSITIONS, each
+question tagged with a difficulty from 1 (basic) to 3 (advanced). An inverted
+index maps technology names, their synonyms and position keywords to pools,
+so a candidate's questions can be assembled locally, spread across their
+stack and pitched at their experience. Only technologies the bank doesn't
+cover need the LLM.
+
+The bank can be expanded offline with LLM-generated questions:
+
+    python -m utils.question_bank expand "Kotlin, GraphQL" --difficulty 2
+    python -m utils.question_bank stats
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+
+from utils.constants import (
+    MAX_TECH_QUESTIONS,
+    TECH_SYNONYMS,
+    DIFFICULTY_EXPERIENCE_YEARS,
+    QUESTION_DIVERSITY_CANDIDATES,
+)
+from utils.question_diversity import drop_similar, select_diverse
+from utils.tech_stack import canonicalize_technology, split_tech_stack
+
+QUESTION_BANK_PATH = os.getenv(
+    "TALENTSCOUT_QUESTION_BANK", os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.json")
+)
+
+# Longest phrase (in words) looked up in the index when a mention doesn't match as a whole
+MAX_PHRASE_WORDS = 3
+
+def experience_to_difficulty(experience: Optional[str]) -> int:
+    """Map stated experience to a question difficulty.
+
+    Args:
+        experience: Experience as collected, e.g. "5 years" or "3-5 years"
+
+    Returns:
+        1 (basic), 2 (intermediate) or 3 (advanced); 2 when the experience is unknown
+    """
+    years = re.findall(r'\d+(?:\.\d+)?', experience or "")
+    if not years:
+        return 2
+    # Use the lower end of a range so candidates aren't over-assessed
+    lower = float(years[0])
+    junior, senior = DIFFICULTY_EXPERIENCE_YEARS
+    return 1 if lower < junior else 2 if lower < senior else 3
+
+def _phrases(text: str) -> List[str]:
+    """Split text into word n-grams (longest first) for index lookups."""
+    words = re.findall(r'[\w#+./-]+', text.casefold())
+    return [
+        " ".join(words[start:start + size])
+        for size in range(min(MAX_PHRASE_WORDS, len(words)), 0, -1)
+        for start in range(len(words) - size + 1)
+    ]
+
+class QuestionPlan:
+    """Questions assembled from the bank plus the technologies left for the LLM.
+
+    `uncovered` holds the technologies the LLM generates questions for: those
+    the bank doesn't cover, plus the covered ones when their pools ran short.
+    """
+
+    def __init__(self, bank_questions: List[str], uncovered: List[str], total: int):
+        self.bank_questions = bank_questions
+        self.uncovered = uncovered
+        self.total = total
+
+    def merge(self, generated: Optional[List[str]]) -> List[str]:
+        """Combine the bank questions with LLM questions for the uncovered technologies.
+
+        Args:
+            generated: Questions generated for the uncovered technologies, if any
+
+        Returns:
+            Up to `total` questions, bank questions first, leaving out generated
+            questions that nearly duplicate a bank question
+        """
+        return (self.bank_questions + drop_similar(list(generated or []), self.bank_questions))[:self.total]
+
+class QuestionBank:
+    """Question pools per technology and position with an inverted index."""
+
+    def __init__(self, technologies: Dict[str, List[Dict]], positions: Dict[str, Dict]):
+        """Create a bank and index it.
+
+        Args:
+            technologies: Questions ({"question", "difficulty"}) keyed by canonical technology
+            positions: {"keywords", "questions"} keyed by position name
+        """
+        self.technologies = technologies
+        self.positions = positions
+        self.index: Dict[str, str] = {}
+        self._build_index()
+
+    @classmethod
+    def load(cls, path: str = QUESTION_BANK_PATH) -> "QuestionBank":
+        """Load a bank from JSON; a missing file gives an empty bank."""
+        if not os.path.exists(path):
+            return cls({}, {})
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("technologies", {}), data.get("positions", {}))
+
+    def save(self, path: str = QUESTION_BANK_PATH) -> None:
+        """Write the bank to JSON atomically."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"technologies": self.technologies, "positions": self.positions}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(temp_path, path)
+
+    def _build_index(self) -> None:
+        """Map technology names, synonyms and position keywords to pool keys."""
+        self.index.clear()
+        for position, pool in self.positions.items():
+            for keyword in [position, *pool.get("keywords", [])]:
+                self.index[keyword.casefold()] = f"position:{position}"
+        for technology in self.technologies:
+            self.index[technology] = f"technology:{technology}"
+        for alias, technology in TECH_SYNONYMS.items():
+            if technology in self.technologies:
+                self.index[alias] = f"technology:{technology}"
+
+    def _pool(self, key: str) -> List[Dict]:
+        kind, name = key.split(":", 1)
+        return self.technologies[name] if kind == "technology" else self.positions[name]["questions"]
+
+    def lookup_technology(self, mention: str) -> Optional[str]:
+        """Find the technology pool for a tech stack mention.
+
+        The whole mention is tried first (after synonym merging), then its
+        phrases, longest first, so "Django REST framework" finds "django".
+        Position keywords are skipped, so "Backend Python" finds "python".
+
+        Args:
+            mention: One technology as written by the candidate
+
+        Returns:
+            Pool key, or None if the bank doesn't cover the technology
+        """
+        lookups = [canonicalize_technology(mention), *_phrases(mention)]
+        return next(
+            (key for key in map(self.index.get, lookups) if key is not None and key.startswith("technology:")), None
+        )
+
+    def lookup_position(self, desired_position: Optional[str]) -> Optional[str]:
+        """Find the position pool matching a desired position, if any."""
+        for phrase in _phrases(desired_position or ""):
+            key = self.index.get(phrase)
+            if key and key.startswith("position:"):
+                return key
+        return None
+
+    def split_coverage(self, technologies: List[str]) -> Tuple[List[str], List[str]]:
+        """Split technologies into bank pools and technologies the bank doesn't cover.
+
+        Args:
+            technologies: Technology mentions, e.g. from split_tech_stack
+
+        Returns:
+            Covered pool keys and uncovered technologies, both without duplicates
+        """
+        covered, uncovered = [], []
+        for technology in technologies:
+            key = self.lookup_technology(technology)
+            if key is None:
+                if technology not in uncovered:
+                    uncovered.append(technology)
+            elif key not in covered:
+                covered.append(key)
+        return covered, uncovered
+
+    def select(self, keys: List[str], count: int, difficulty: int, rng: random.Random) -> List[str]:
+        """Pick questions round-robin across pools, closest to the target difficulty first.
+
+        Args:
+            keys: Pool keys in order of preference
+            count: Number of questions wanted
+            difficulty: Target difficulty from 1 to 3
+            rng: Random generator for varying questions between candidates
+
+        Returns:
+            Up to `count` distinct questions
+        """
+        candidates = {}
+        for key in keys:
+            pool = list(self._pool(key))
+            rng.shuffle(pool)
+            pool.sort(key=lambda entry: abs(entry["difficulty"] - difficulty))
+            candidates[key] = [entry["question"] for entry in pool]
+
+        selected: List[str] = []
+        while len(selected) < count and any(candidates.values()):
+            for key in keys:
+                if candidates[key] and len(selected) < count:
+                    question = candidates[key].pop(0)
+                    if question not in selected:
+                        selected.append(question)
+        return selected
+
+    def plan(
+        self,
+        tech_stack: str,
+        experience: Optional[str] = None,
+        desired_position: Optional[str] = None,
+        total: int = MAX_TECH_QUESTIONS,
+        rng: Optional[random.Random] = None,
+    ) -> QuestionPlan:
+        """Assemble questions for a candidate from the bank.
+
+        Question slots are shared between covered and uncovered technologies in
+        proportion to their number; the bank's share is spread across the covered
+        technologies and topped up from the position pool when they run short;
+        slots the bank still can't fill go to the LLM. A few more bank questions
+        than needed are drawn, and the share is picked from them by max marginal
+        relevance, steering away from questions asked recently so candidates
+        with popular stacks don't all get the same set.
+
+        Args:
+            tech_stack: Candidate's technology stack
+            experience: Candidate's stated experience, used to pick the difficulty
+            desired_position: Candidate's desired position, used to top up questions
+            total: Number of questions to ask
+            rng: Random generator (defaults to a fresh unseeded one)
+
+        Returns:
+            Bank questions and the technologies that still need LLM questions:
+            the uncovered ones, or the whole stack when the bank ran short
+        """
+        rng = rng or random.Random()
+        technologies = split_tech_stack(tech_stack)
+        covered, uncovered = self.split_coverage(technologies)
+        if not covered:
+            return QuestionPlan([], uncovered, total)
+
+        llm_slots = round(total * len(uncovered) / (len(covered) + len(uncovered)))
+        if uncovered:
+            llm_slots = max(llm_slots, 1)
+        bank_slots = total - llm_slots
+
+        difficulty = experience_to_difficulty(experience)
+        wanted = bank_slots + QUESTION_DIVERSITY_CANDIDATES
+        candidates = self.select(covered, wanted, difficulty, rng)
+        position = self.lookup_position(desired_position)
+        if len(candidates) < wanted and position:
+            extra = self.select([position], wanted - len(candidates), difficulty, rng)
+            candidates += [question for question in extra if question not in candidates]
+        bank_questions = select_diverse(candidates, bank_slots)
+        if len(bank_questions) < bank_slots:
+            # The pools ran short: the LLM fills the remaining slots, for the covered technologies too
+            uncovered = uncovered + [technology for technology in technologies if technology not in uncovered]
+        return QuestionPlan(bank_questions, uncovered, total)
+
+    def add_questions(self, technology: str, questions: List[str], difficulty: int) -> int:
+        """Add questions to a technology's pool, skipping ones already present.
+
+        Args:
+            technology: Technology name; canonicalized before use
+            questions: Question texts
+            difficulty: Difficulty from 1 to 3 for all of them
+
+        Returns:
+            Number of questions added
+        """
+        pool = self.technologies.setdefault(canonicalize_technology(technology), [])
+        existing = {entry["question"] for entry in pool}
+        added = 0
+        for question in questions:
+            if question not in existing:
+                pool.append({"question": question, "difficulty": difficulty})
+                existing.add(question)
+                added += 1
+        self._build_index()
+        return added
+
+# Process-wide bank used by the engine
+question_bank = QuestionBank.load()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    expand = subparsers.add_parser("expand", help="generate questions for technologies with the LLM and add them")
+    expand.add_argument("technologies", help="comma separated technologies")
+    expand.add_argument("--difficulty", type=int, choices=[1, 2, 3], default=2, help="difficulty to tag the questions with")
+    subparsers.add_parser("stats", help="show the number of questions per pool")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        for technology, pool in sorted(question_bank.technologies.items()):
+            print(f"{technology:<24} {len(pool)}")
+        for position, pool in sorted(question_bank.positions.items()):
+            print(f"{'position: ' + position:<24} {len(pool['questions'])}")
+        return
+
+    from utils.llm_handler import generate_questions_speculatively
+    for technology in split_tech_stack(args.technologies):
+        questions = generate_questions_speculatively(technology)
+        if not questions:
+            print(f"{technology}: generation failed")
+            continue
+        print(f"{technology}: added {question_bank.add_questions(technology, questions, args.difficulty)} questions")
+    question_bank.save()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Near-duplicate detection and diversity selection for technical questions.
+
+Questions are embedded locally as hashed n-gram vectors: character 4-grams
+and words (minus stopwords) are hashed into QUESTION_EMBEDDING_DIM signed
+buckets and L2-normalized, so the cosine similarity of two embeddings
+measures how much wording two questions share. It catches near-copies and
+light rewordings, not paraphrases with different vocabulary.
+
+Recently asked questions are remembered in a RecentQuestionIndex as
+SimHash signatures (the signs of random projections of their embeddings),
+compared against new questions by Hamming distance, which estimates their
+cosine similarity at a few bytes per question. Repeats are penalized less
+the longer ago they were asked, so a small pool of questions is rotated
+rather than every question in it counting as equally stale. Since the
+penalty halves every QUESTION_REPEAT_HALF_LIFE questions, the index only
+remembers as many questions as a repeat could still be penalized by
+QUESTION_REPEAT_MIN_PENALTY for, and a search compares against all of them.
+
+NumPy is only imported when the first question is embedded, keeping it out
+of the app's cold start.
+"""
+
+import math
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from utils.constants import (
+    QUESTION_EMBEDDING_DIM,
+    QUESTION_EMBEDDING_CACHE_SIZE,
+    QUESTION_DUPLICATE_THRESHOLD,
+    QUESTION_REPEAT_HALF_LIFE,
+    QUESTION_REPEAT_MIN_PENALTY,
+    QUESTION_MMR_LAMBDA,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+NGRAM_SIZE = 4
+SIGNATURE_WORDS = 2  # 64-bit words per SimHash signature
+SIGNATURE_BITS = 64 * SIGNATURE_WORDS
+
+STOPWORDS = frozenset("""
+a an and are as at be between by can could describe do does explain for from how
+i in is it its of on or our the this to use used using what when where which
+while why with would you your
+""".split())
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Random hyperplanes shared by every signature, created on first use
+_hyperplanes = None
+_hyperplanes_lock = threading.Lock()
+
+_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+def _features(text: str) -> List[str]:
+    words = [word for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+    joined = f" {' '.join(words)} "
+    return words + [joined[i:i + NGRAM_SIZE] for i in range(len(joined) - NGRAM_SIZE + 1)]
+
+def _embed_uncached(texts: Sequence[str]) -> "np.ndarray":
+    import numpy as np
+    rows, hashes = [], []
+    for row, text in enumerate(texts):
+        features = _features(text)
+        rows.extend([row] * len(features))
+        hashes.extend(zlib.crc32(feature.encode("utf-8")) for feature in features)
+
+    hashes = np.asarray(hashes, dtype=np.uint32)
+    # Low bits pick the bucket, the top bit the sign, so colliding features tend to cancel
+    buckets = (hashes % QUESTION_EMBEDDING_DIM).astype(np.intp)
+    signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+    vectors = np.zeros((len(texts), QUESTION_EMBEDDING_DIM), dtype=np.float32)
+    np.add.at(vectors, (np.asarray(rows, dtype=np.intp), buckets), signs)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def embed(texts: Sequence[str]) -> "np.ndarray":
+    """Embed questions as L2-normalized hashed n-gram vectors.
+
+    Embeddings of the last QUESTION_EMBEDDING_CACHE_SIZE distinct texts are
+    cached, so recurring questions (such as those from the bank) are free.
+
+    Args:
+        texts: Question texts
+
+    Returns:
+        float32 array of shape (len(texts), QUESTION_EMBEDDING_DIM)
+    """
+    import numpy as np
+    vectors = np.empty((len(texts), QUESTION_EMBEDDING_DIM), dtype=np.float32)
+    missing = []
+    with _embedding_cache_lock:
+        for i, text in enumerate(texts):
+            cached = _embedding_cache.get(text)
+            if cached is None:
+                missing.append(i)
+            else:
+                _embedding_cache.move_to_end(text)
+                vectors[i] = cached
+    if not missing:
+        return vectors
+
+    computed = _embed_uncached([texts[i] for i in missing])
+    vectors[missing] = computed
+    with _embedding_cache_lock:
+        for i, vector in zip(missing, computed):
+            _embedding_cache[texts[i]] = vector
+        while len(_embedding_cache) > QUESTION_EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+    return vectors
+
+def _get_hyperplanes() -> "np.ndarray":
+    global _hyperplanes
+    with _hyperplanes_lock:
+        if _hyperplanes is None:
+            import numpy as np
+            # Seeded so signatures are stable across processes
+            rng = np.random.default_rng(0)
+            _hyperplanes = rng.standard_normal((QUESTION_EMBEDDING_DIM, SIGNATURE_BITS)).astype(np.float32)
+        return _hyperplanes
+
+def signatures(vectors: "np.ndarray") -> "np.ndarray":
+    """SimHash signatures of embeddings, as rows of SIGNATURE_WORDS uint64 words."""
+    import numpy as np
+    bits = (vectors @ _get_hyperplanes()) > 0
+    return np.packbits(bits, axis=1, bitorder="little").view(np.uint64)
+
+class RecentQuestionIndex:
+    """Fixed-capacity index of recently asked questions, searched by estimated cosine similarity.
+
+    Signatures live in a ring buffer holding the questions recent enough to
+    still be penalized, so once full the oldest questions are forgotten
+    first. Searching compares every query against every signature in one
+    vectorized pass.
+    """
+
+    def __init__(
+        self,
+        half_life: float = QUESTION_REPEAT_HALF_LIFE,
+        threshold: float = QUESTION_DUPLICATE_THRESHOLD,
+        min_penalty: float = QUESTION_REPEAT_MIN_PENALTY,
+    ):
+        """Create an empty index.
+
+        Args:
+            half_life: Questions asked since a repeat after which its penalty halves
+            threshold: Estimated cosine similarity from which a remembered question is a repeat
+            min_penalty: Penalty below which repeats are ignored; sets how many
+                questions are remembered
+        """
+        self.half_life = half_life
+        # Repeats asked longer ago than this are penalized less than min_penalty
+        self.capacity = math.ceil(half_life * math.log2(1 / min_penalty))
+        # Hamming distance up to which two signatures are estimated to be at least `threshold` similar
+        self.max_distance = int(SIGNATURE_BITS * math.acos(threshold) / math.pi)
+        # One contiguous array per signature word, allocated with the first question
+        self._signatures: Optional["np.ndarray"] = None
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, questions: Sequence[str]) -> None:
+        """Remember questions that were asked."""
+        if not questions:
+            return
+        import numpy as np
+        new_signatures = signatures(embed(questions))[-self.capacity:]
+        with self._lock:
+            if self._signatures is None:
+                self._signatures = np.zeros((SIGNATURE_WORDS, self.capacity), dtype=np.uint64)
+            slots = (self._next + np.arange(len(new_signatures))) % self.capacity
+            self._signatures[:, slots] = new_signatures.T
+            self._next = int(slots[-1] + 1) % self.capacity
+            self._size = min(self._size + len(new_signatures), self.capacity)
+
+    def repeat_similarity(self, vectors: "np.ndarray") -> "np.ndarray":
+        """How much each embedding repeats a remembered question, fading with its age.
+
+        Args:
+            vectors: Embeddings from embed()
+
+        Returns:
+            One value per row of `vectors`: the estimated cosine similarity of the
+            closest repeat, halved for every `half_life` questions asked since the
+            most recent one; 0 when nothing remembered is a repeat
+        """
+        import numpy as np
+        with self._lock:
+            if not self._size:
+                return np.zeros(len(vectors), dtype=np.float32)
+            # Newest first, so a signature's column is its age
+            slots = (self._next - 1 - np.arange(self._size)) % self.capacity
+            recent = self._signatures[:, slots]
+        queries = signatures(vectors)
+
+        distance = np.zeros((len(queries), len(slots)), dtype=np.uint8)
+        for word in range(SIGNATURE_WORDS):
+            distance += np.bitwise_count(recent[word] ^ queries[:, word, None])
+        matches = distance <= self.max_distance
+        age = matches.argmax(axis=1)
+        closest = np.where(matches, distance, SIGNATURE_BITS).min(axis=1)
+        # The angle between two vectors is proportional to the share of hyperplanes separating them
+        similarity = np.cos(np.pi * closest / SIGNATURE_BITS) * 0.5 ** (age / self.half_life)
+        return np.where(matches.any(axis=1), similarity, 0.0).astype(np.float32)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._next = 0
+
+recent_questions = RecentQuestionIndex()
+
+def deduplicate(questions: Sequence[str], threshold: float = QUESTION_DUPLICATE_THRESHOLD) -> List[str]:
+    """Drop questions too similar to an earlier one in the list.
+
+    Args:
+        questions: Questions in order of preference
+        threshold: Cosine similarity from which a question counts as a duplicate
+
+    Returns:
+        The questions that are not near-duplicates of an earlier one, in order
+    """
+    if len(questions) < 2:
+        return list(questions)
+    vectors = embed(questions)
+    similarity = vectors @ vectors.T
+    kept: List[int] = []
+    for i in range(len(questions)):
+        if not kept or similarity[i, kept].max() < threshold:
+            kept.append(i)
+    return [questions[i] for i in kept]
+
+def drop_similar(
+    questions: Sequence[str], existing: Sequence[str], threshold: float = QUESTION_DUPLICATE_THRESHOLD
+) -> List[str]:
+    """Drop questions too similar to any of `existing`.
+
+    Args:
+        questions: Questions to filter
+        existing: Questions already chosen
+        threshold: Cosine similarity from which a question counts as a duplicate
+
+    Returns:
+        The questions that are not near-duplicates of an existing one, in order
+    """
+    if not questions or not existing:
+        return list(questions)
+    similarity = embed(questions) @ embed(existing).T
+    return [question for question, row in zip(questions, similarity) if row.max() < threshold]
+
+def select_diverse(
+    candidates: Sequence[str],
+    count: int,
+    index: Optional[RecentQuestionIndex] = None,
+    mmr_lambda: float = QUESTION_MMR_LAMBDA,
+) -> List[str]:
+    """Pick a diverse subset of candidate questions by max marginal relevance.
+
+    Candidates are taken as ordered by relevance (earlier is better, which
+    keeps the coverage order of the bank and the fan-out). Each pick maximizes
+    relevance minus the similarity to the closest question already picked or
+    its repeat similarity to recently asked ones, weighted by `mmr_lambda`.
+    Near-duplicates are dropped first.
+
+    Args:
+        candidates: Candidate questions, most relevant first
+        count: Number of questions wanted
+        index: Recently asked questions to steer away from (defaults to recent_questions)
+        mmr_lambda: Weight of relevance against redundancy, from 0 to 1
+
+    Returns:
+        Up to `count` questions, in the order they were picked
+    """
+    index = recent_questions if index is None else index
+    candidates = deduplicate(candidates)
+    if len(candidates) <= count and not len(index):
+        return candidates
+
+    import numpy as np
+    vectors = embed(candidates)
+    relevance = 1.0 - np.arange(len(candidates), dtype=np.float32) / len(candidates)
+    redundancy = index.repeat_similarity(vectors)
+    similarity = vectors @ vectors.T
+    available = np.ones(len(candidates), dtype=bool)
+
+    picked: List[int] = []
+    for _ in range(min(count, len(candidates))):
+        scores = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+    return [candidates[i] for i in picked]
@@ -0,0 +1,162 @@
+"""Parsing of generated technical questions.
+
+Question prompts ask for a JSON object, {"questions": ["...", ...]}, which is
+validated with pydantic. While a completion streams in, QuestionStreamParser
+picks out each question as soon as its JSON string is closed, so the first
+question can be shown while the rest are still being written. Completions
+that aren't valid JSON (models ignoring the format, answers recorded before
+it) fall back to reading one question per line, numbered or not.
+
+pydantic is only imported when the first completion is validated, keeping it
+out of the app's cold start.
+"""
+
+import json
+import re
+import threading
+from typing import List
+
+# Numbering or bullet in front of a question, e.g. "1.", "2)", "-", "*"
+LIST_MARKER_RE = re.compile(r'^\s*(?:\d+\s*[\.\):]|[-*•])\s*')
+_ARRAY_START_RE = re.compile(r'"questions"\s*:\s*\[')
+
+def clean_question(text: str) -> str:
+    """Normalize a question: drop list markers and collapse whitespace."""
+    return " ".join(LIST_MARKER_RE.sub("", text).split())
+
+_question_set = None
+_question_set_lock = threading.Lock()
+
+def get_question_set_model():
+    """Return the pydantic model of the question prompts' output, defining it on first use."""
+    global _question_set
+    with _question_set_lock:
+        if _question_set is None:
+            from pydantic import BaseModel, field_validator
+
+            class QuestionSet(BaseModel):
+                """Structured output of the question generation prompts."""
+
+                questions: List[str]
+
+                @field_validator("questions")
+                @classmethod
+                def clean_questions(cls, questions: List[str]) -> List[str]:
+                    cleaned = [question for question in map(clean_question, questions) if question]
+                    if not cleaned:
+                        raise ValueError("no questions")
+                    return cleaned
+
+            _question_set = QuestionSet
+        return _question_set
+
+def parse_question_lines(questions_text: str) -> List[str]:
+    """Extract questions from plain text with one question per line.
+
+    Numbered and bulleted lines are questions; unmarked lines count only if
+    they end with a question mark, which skips preambles such as "Here are
+    five questions:".
+
+    Args:
+        questions_text: LLM output
+
+    Returns:
+        List of questions with list markers removed
+    """
+    questions = []
+    for line in questions_text.split('\n'):
+        line = line.strip()
+        if len(line) <= 5:
+            continue
+        if LIST_MARKER_RE.match(line) or line.endswith("?"):
+            question = clean_question(line)
+            if question:
+                questions.append(question)
+    return questions
+
+def parse_questions(questions_text: str) -> List[str]:
+    """Extract questions from a completion, preferring the structured JSON format.
+
+    Args:
+        questions_text: LLM output, ideally a JSON object with a "questions" list
+
+    Returns:
+        List of questions; empty if none could be found
+    """
+    # Tolerate code fences or text around the object
+    start, end = questions_text.find("{"), questions_text.rfind("}")
+    if start != -1 and end > start:
+        from pydantic import ValidationError
+        try:
+            return get_question_set_model().model_validate_json(questions_text[start:end + 1]).questions
+        except ValidationError:
+            pass
+    return parse_question_lines(questions_text)
+
+def has_questions(questions_text: str) -> bool:
+    """Check whether a completion contains at least one question."""
+    return bool(parse_questions(questions_text))
+
+class QuestionStreamParser:
+    """Incremental parser emitting questions from a streaming JSON completion.
+
+    Feed it the accumulated completion text after every token; each character
+    is scanned once. Only the strings of the "questions" array are decoded,
+    each as soon as its closing quote arrives.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything parsed so far."""
+        self.text = ""
+        self.questions: List[str] = []
+        self._position = None
+        self._string_start = None
+        self._escaped = False
+        self._done = False
+
+    def feed(self, text: str) -> List[str]:
+        """Parse the completion so far.
+
+        Args:
+            text: Accumulated completion text; text that doesn't extend the
+                previous call's (a new completion, e.g. from a fallback model)
+                starts the parse over
+
+        Returns:
+            Questions completed since the previous call
+        """
+        if not text.startswith(self.text):
+            self.reset()
+        self.text = text
+        if self._position is None:
+            match = _ARRAY_START_RE.search(text)
+            if not match:
+                return []
+            self._position = match.end()
+
+        completed = []
+        while self._position < len(text) and not self._done:
+            char = text[self._position]
+            if self._string_start is None:
+                if char == '"':
+                    self._string_start = self._position
+                elif char == "]":
+                    self._done = True
+            elif self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                try:
+                    question = clean_question(json.loads(text[self._string_start:self._position + 1], strict=False))
+                except ValueError:
+                    question = ""
+                self._string_start = None
+                if question:
+                    self.questions.append(question)
+                    completed.append(question)
+            self._position += 1
+        return completed
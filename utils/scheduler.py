@@ -0,0 +1,240 @@
+"""Process-wide scheduler shared by all LLM calls.
+
+Streamlit runs each browser session on its own thread, so without
+coordination every session calls the LLM API independently and bursts past
+the provider's rate limits. `LLMScheduler` admits calls in priority order
+(cheap extraction before question generation, FIFO within a priority) under:
+
+- token buckets for requests per minute and tokens per minute
+- a cap on concurrent in-flight calls
+- exponential backoff with jitter when the provider answers 429 or 5xx
+
+Callers that have to wait are told their position in the queue instead of
+failing.
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from utils.constants import (
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+    LLM_CALL_PRIORITIES,
+)
+
+# Called with the caller's 1-based queue position while it waits for admission
+queue_position_callback: contextvars.ContextVar[Optional[Callable[[int], None]]] = contextvars.ContextVar(
+    "queue_position_callback", default=None
+)
+
+@contextlib.contextmanager
+def queue_position_listener(callback: Callable[[int], None]) -> Iterator[None]:
+    """Report queue positions of LLM calls made inside the block to the callback."""
+    token = queue_position_callback.set(callback)
+    try:
+        yield
+    finally:
+        queue_position_callback.reset(token)
+
+def background_context() -> contextvars.Context:
+    """Copy the current context for work handed to another thread.
+
+    The queue position callback is cleared in the copy: it renders into the
+    caller's page, which only the caller's thread may do.
+    """
+    context = contextvars.copy_context()
+    context.run(queue_position_callback.set, None)
+    return context
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity. Not thread-safe on its own."""
+
+    def __init__(self, per_minute: Optional[float]):
+        """Create a full bucket.
+
+        Args:
+            per_minute: Refill rate and capacity, or None for no limit
+        """
+        self.capacity = per_minute
+        self.level = per_minute or 0.0
+        self.rate = (per_minute or 0.0) / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if available now)."""
+        if self.capacity is None:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Remove `amount` from the bucket; the level may go negative after adjustments."""
+        if self.capacity is not None:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+
+class LLMScheduler:
+    """Admission control, rate limiting and retries for LLM calls."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: Optional[float] = LLM_TOKENS_PER_MINUTE,
+        max_concurrency: Optional[int] = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+    ):
+        """Create a scheduler.
+
+        Args:
+            requests_per_minute: Request rate limit, or None for no limit
+            tokens_per_minute: Token rate limit (prompt plus max completion), or None for no limit
+            max_concurrency: Maximum calls in flight at once, or None for no limit
+            max_retries: Retries for rate-limited or failed calls before giving up
+            backoff_base: Initial backoff in seconds, doubled on every retry
+            backoff_max: Upper bound for a single backoff in seconds
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._waiting: list = []
+        self._in_flight = 0
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self.stats = {"admitted": 0, "queued": 0, "retries": 0, "failures": 0, "queue_wait_seconds": 0.0}
+
+    def run(self, fn: Callable[[], Any], call_site: str, estimated_tokens: int = 0) -> Any:
+        """Run an LLM call once admitted, retrying rate-limited and server errors.
+
+        Args:
+            fn: Function making the call
+            call_site: Name of the calling feature; sets the priority via LLM_CALL_PRIORITIES
+            estimated_tokens: Tokens charged against the tokens-per-minute limit
+
+        Returns:
+            Whatever fn returns
+        """
+        priority = LLM_CALL_PRIORITIES.get(call_site, max(LLM_CALL_PRIORITIES.values()) + 1)
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority, estimated_tokens)
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    with self._cond:
+                        self.stats["failures"] += 1
+                    raise
+                delay = retry_after(e) or min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                with self._cond:
+                    self.stats["retries"] += 1
+            finally:
+                self._release()
+            # Full jitter keeps retrying sessions from hitting the API in lockstep
+            time.sleep(random.uniform(delay / 2, delay))
+
+    def queue_length(self) -> int:
+        """Number of calls currently waiting for admission."""
+        with self._cond:
+            return len(self._waiting)
+
+    def _acquire(self, priority: int, tokens: int) -> None:
+        """Block until this call is first in line and within all limits."""
+        ticket = (priority, next(self._sequence))
+        callback = queue_position_callback.get()
+        reported_position = None
+        started = time.monotonic()
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                wait = None
+                if self._waiting[0] == ticket and (self.max_concurrency is None or self._in_flight < self.max_concurrency):
+                    wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+                    if wait <= 0:
+                        heapq.heappop(self._waiting)
+                        self._requests.take(1)
+                        self._tokens.take(tokens)
+                        self._in_flight += 1
+                        self.stats["admitted"] += 1
+                        self.stats["queue_wait_seconds"] += time.monotonic() - started
+                        if reported_position is not None:
+                            self.stats["queued"] += 1
+                        self._cond.notify_all()
+                        return
+
+                position = sum(1 for waiting in self._waiting if waiting < ticket) + 1
+                if callback is not None and position != reported_position:
+                    reported_position = position
+                    # Don't hold the scheduler lock while the caller updates its UI
+                    self._cond.release()
+                    try:
+                        callback(position)
+                    finally:
+                        self._cond.acquire()
+                    continue
+                reported_position = position
+
+                # Woken by admissions and releases; bucket refills need a timeout
+                self._cond.wait(timeout=wait)
+
+    def _release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an LLM API error is worth retrying (429, 5xx, connection problems)."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+def is_timeout(error: Exception) -> bool:
+    """Check whether an LLM call failed because it ran past its timeout."""
+    return isinstance(error, TimeoutError) or type(error).__name__ == "APITimeoutError"
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Read the Retry-After header from an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
+
+def set_scheduler(scheduler: LLMScheduler) -> None:
+    """Replace the process-wide scheduler, e.g. with different limits for benchmarks."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
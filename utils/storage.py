@@ -0,0 +1,257 @@
+"""Durable SQLite store for collected candidate information.
+
+Writes are queued and applied by a single background thread in batched
+transactions, so the chat thread never waits on disk I/O. The database runs in
+WAL mode, which lets recruiters' read queries proceed while screenings are
+being written.
+"""
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.constants import (
+    COLLECTION_STEPS,
+    CANDIDATE_DB_PATH,
+    CANDIDATE_DB_BATCH_SIZE,
+    CANDIDATE_DB_FLUSH_INTERVAL,
+)
+
+CANDIDATE_FIELDS = [field for _, _, field in COLLECTION_STEPS]
+
+# Columns added after the first release; created on existing databases at startup
+ADDED_COLUMNS = {
+    "technical_answers": "TEXT",  # JSON list of {"question", "answer"[, "score", "feedback"]}
+    "technical_score": "REAL",
+    "scored_at": "REAL",
+}
+
+# Columns save_fields may write besides the candidate fields
+WRITABLE_COLUMNS = set(CANDIDATE_FIELDS) | {"questions_answered", "technical_answers", "technical_score", "scored_at"}
+
+SCHEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS candidates (
+        session_id TEXT PRIMARY KEY,
+        {", ".join(f"{field} TEXT" for field in CANDIDATE_FIELDS)},
+        questions_answered INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        completed_at REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates (email)",
+    "CREATE INDEX IF NOT EXISTS idx_candidates_phone ON candidates (phone)",
+    "CREATE INDEX IF NOT EXISTS idx_candidates_position ON candidates (desired_position)",
+    "CREATE INDEX IF NOT EXISTS idx_candidates_completed_at ON candidates (completed_at)",
+]
+
+class CandidateStore:
+    """SQLite-backed candidate records with a batched background writer."""
+
+    def __init__(
+        self,
+        path: str = CANDIDATE_DB_PATH,
+        batch_size: int = CANDIDATE_DB_BATCH_SIZE,
+        flush_interval: float = CANDIDATE_DB_FLUSH_INTERVAL,
+    ):
+        """Open (and if needed create) the database and start the writer thread.
+
+        Args:
+            path: SQLite database file
+            batch_size: Maximum queued writes applied in one transaction
+            flush_interval: Seconds the writer waits to collect more writes into a batch
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Tuple[str, Tuple]]]" = queue.Queue()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            existing = {row["name"] for row in connection.execute("PRAGMA table_info(candidates)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE candidates ADD COLUMN {column} {column_type}")
+            connection.commit()
+        finally:
+            connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="candidate-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def save_field(self, session_id: str, field: str, value: Any) -> None:
+        """Queue an update of one candidate field.
+
+        Args:
+            session_id: Screening session the candidate belongs to
+            field: candidate_info field
+            value: Value to store
+        """
+        self.save_fields(session_id, {field: value})
+
+    def save_fields(self, session_id: str, values: Dict[str, Any], completed: bool = False) -> None:
+        """Queue an upsert of several columns for a candidate.
+
+        Args:
+            session_id: Screening session the candidate belongs to
+            values: Column values keyed by candidate_info field or another WRITABLE_COLUMNS entry
+            completed: Whether to stamp the screening's completion time
+        """
+        columns = [column for column in values if column in WRITABLE_COLUMNS]
+        now = time.time()
+        assignments = [f"{column} = excluded.{column}" for column in columns] + ["updated_at = excluded.updated_at"]
+        insert_columns = ["session_id", *columns, "created_at", "updated_at"]
+        params: List[Any] = [session_id, *(values[column] for column in columns), now, now]
+        if completed:
+            insert_columns.append("completed_at")
+            assignments.append("completed_at = excluded.completed_at")
+            params.append(now)
+
+        sql = (
+            f"INSERT INTO candidates ({', '.join(insert_columns)}) "
+            f"VALUES ({', '.join('?' for _ in insert_columns)}) "
+            f"ON CONFLICT(session_id) DO UPDATE SET {', '.join(assignments)}"
+        )
+        self._queue.put((sql, tuple(params)))
+
+    def mark_completed(self, session_id: str, candidate_info: Dict[str, Any], questions_answered: int) -> None:
+        """Queue the final record for a screening that reached the end of the conversation.
+
+        Args:
+            session_id: Screening session the candidate belongs to
+            candidate_info: All collected candidate information
+            questions_answered: Number of technical questions answered
+        """
+        self.save_fields(session_id, {**candidate_info, "questions_answered": questions_answered}, completed=True)
+
+    def save_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> None:
+        """Queue the candidate's technical answers so far.
+
+        Args:
+            session_id: Screening session the candidate belongs to
+            answers: Dictionaries with "question" and "answer"
+        """
+        self.save_fields(session_id, {"technical_answers": json.dumps(answers)})
+
+    def save_assessment(self, session_id: str, answers: List[Dict[str, Any]], overall_score: float) -> None:
+        """Queue the scored technical answers.
+
+        Args:
+            session_id: Screening session the candidate belongs to
+            answers: Answers extended with "score" and "feedback"
+            overall_score: Mean score from 0 to 10
+        """
+        self.save_fields(session_id, {
+            "technical_answers": json.dumps(answers),
+            "technical_score": overall_score,
+            "scored_at": time.time(),
+        })
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit outstanding writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while item is not None and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+
+                writes = [entry for entry in batch if entry is not None]
+                try:
+                    with connection:
+                        for sql, params in writes:
+                            connection.execute(sql, params)
+                except sqlite3.Error as e:
+                    print(f"Error writing candidate records: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+                if len(writes) < len(batch):
+                    return
+        finally:
+            connection.close()
+
+    # Read helpers for recruiters; each uses its own connection so reads never block the writer
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the record for a screening session."""
+        return self._query_one("SELECT * FROM candidates WHERE session_id = ?", (session_id,))
+
+    def find_by_email(self, email: str) -> List[Dict[str, Any]]:
+        """Return candidates with the given email address."""
+        return self._query("SELECT * FROM candidates WHERE email = ?", (email,))
+
+    def find_by_phone(self, phone: str) -> List[Dict[str, Any]]:
+        """Return candidates with the given phone number."""
+        return self._query("SELECT * FROM candidates WHERE phone = ?", (phone,))
+
+    def find_by_position(self, position: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return the most recently completed candidates whose desired position starts with `position`."""
+        return self._query(
+            "SELECT * FROM candidates WHERE desired_position LIKE ? ORDER BY completed_at DESC LIMIT ?",
+            (f"{position}%", limit),
+        )
+
+    def list_completed(self, since: float = 0.0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return screenings completed after `since` (a Unix timestamp), newest first."""
+        return self._query(
+            "SELECT * FROM candidates WHERE completed_at >= ? ORDER BY completed_at DESC LIMIT ?",
+            (since, limit),
+        )
+
+    def _query(self, sql: str, params: Tuple) -> List[Dict[str, Any]]:
+        connection = self._connect()
+        try:
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def _query_one(self, sql: str, params: Tuple) -> Optional[Dict[str, Any]]:
+        rows = self._query(sql, params)
+        return rows[0] if rows else None
+
+_store: Optional[CandidateStore] = None
+_store_lock = threading.Lock()
+
+def get_candidate_store() -> CandidateStore:
+    """Return the process-wide candidate store, opening it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CandidateStore(os.getenv("TALENTSCOUT_DB_PATH", CANDIDATE_DB_PATH))
+            atexit.register(_store.close)
+        return _store
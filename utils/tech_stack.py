@@ -0,0 +1,80 @@
+"""Tech stack parsing and canonicalization."""
+
+import re
+from typing import List, Tuple
+
+from utils.constants import TECH_STACK_EXAMPLES, TECH_SYNONYMS
+
+# Separators between technologies in a free-text tech stack
+TECH_SEPARATOR_REGEX = re.compile(r'\s*(?:,|;|\||/|&|\n|\band\b|\bplus\b)\s*', re.IGNORECASE)
+
+def canonicalize_technology(name: str) -> str:
+    """Normalize a single technology name.
+
+    Args:
+        name: Technology name as written by the candidate
+
+    Returns:
+        Case-folded canonical name with synonyms merged
+    """
+    name = re.sub(r'\s+', ' ', name.strip().casefold()).rstrip(' .')
+    return TECH_SYNONYMS.get(name, name)
+
+def split_tech_stack(tech_stack: str) -> List[str]:
+    """Split a free-text tech stack into canonical technology names.
+
+    Args:
+        tech_stack: Comma (or otherwise) separated technologies
+
+    Returns:
+        Canonical technology names in the order first mentioned, without duplicates
+    """
+    technologies = []
+    for part in TECH_SEPARATOR_REGEX.split(tech_stack or ""):
+        technology = canonicalize_technology(part)
+        if technology and technology not in technologies:
+            technologies.append(technology)
+    return technologies
+
+def canonicalize_tech_stack(tech_stack: str) -> Tuple[str, ...]:
+    """Build an order-insensitive canonical form of a tech stack.
+
+    Args:
+        tech_stack: Comma (or otherwise) separated technologies
+
+    Returns:
+        Sorted tuple of canonical technology names
+    """
+    return tuple(sorted(split_tech_stack(tech_stack)))
+
+# Technologies recognised in free text (e.g. a desired position), excluding
+# names that are also common English words
+KNOWN_TECHNOLOGIES = sorted(
+    (
+        {technology for example in TECH_STACK_EXAMPLES for technology in split_tech_stack(example)}
+        | set(TECH_SYNONYMS.values())
+        | set(TECH_SYNONYMS)
+    ) - {"go", "ts", "py", "node"},
+    key=len,
+    reverse=True,
+)
+KNOWN_TECHNOLOGY_REGEX = re.compile(
+    r'(?<![\w.#+])(' + '|'.join(re.escape(name) for name in KNOWN_TECHNOLOGIES) + r')(?![\w#+])',
+    re.IGNORECASE,
+)
+
+def detect_technologies(text: str) -> List[str]:
+    """Find known technologies mentioned anywhere in free text.
+
+    Args:
+        text: Free text such as a desired position or an unparsed message
+
+    Returns:
+        Canonical technology names in the order first mentioned, without duplicates
+    """
+    technologies = []
+    for match in KNOWN_TECHNOLOGY_REGEX.findall(text or ""):
+        technology = canonicalize_technology(match)
+        if technology not in technologies:
+            technologies.append(technology)
+    return technologies
@@ -0,0 +1,78 @@
+"""Local token counting and truncation for prompts.
+
+Counts approximate the Llama 3 tokenizer without loading it: text is split
+with the same kind of pre-tokenizer pattern BPE tokenizers use (words with
+their leading space, digit groups of up to three, punctuation runs,
+whitespace), and long pieces are charged one token per few characters since
+rare words break into several sub-word tokens.
+"""
+
+import math
+import re
+from typing import List
+
+# Pre-tokenizer pieces: contractions, words with an optional leading space,
+# up to three digits, punctuation runs, newlines and other whitespace
+_PIECE_REGEX = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\n+|\s+(?!\S)|\s+", re.IGNORECASE)
+
+# Characters per sub-word token for pieces too long to be a single token
+_CHARS_PER_TOKEN = 4
+_MAX_SINGLE_TOKEN_CHARS = 8
+
+def _piece_tokens(piece: str) -> int:
+    length = len(piece.strip()) or 1
+    if length <= _MAX_SINGLE_TOKEN_CHARS:
+        return 1
+    return math.ceil(length / _CHARS_PER_TOKEN)
+
+def _pieces(text: str) -> List[str]:
+    return _PIECE_REGEX.findall(text)
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens the model sees for a text.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Estimated token count (0 for empty text)
+    """
+    return sum(_piece_tokens(piece) for piece in _pieces(text)) if text else 0
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " [...] ") -> str:
+    """Shorten a text to a token budget, keeping its beginning and end.
+
+    The middle of the text is replaced by the marker; two thirds of the budget
+    go to the beginning, where candidates usually state the answer, and the
+    rest to the end.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget for the result, including the marker
+        marker: Text marking the elided part
+
+    Returns:
+        The text unchanged if it fits, otherwise its shortened form
+    """
+    pieces = _pieces(text)
+    costs = [_piece_tokens(piece) for piece in pieces]
+    if sum(costs) <= max_tokens:
+        return text
+
+    available = max(max_tokens - count_tokens(marker), 0)
+    head_budget = available * 2 // 3
+    tail_budget = available - head_budget
+
+    head_end, used = 0, 0
+    while head_end < len(pieces) and used + costs[head_end] <= head_budget:
+        used += costs[head_end]
+        head_end += 1
+
+    tail_start, used = len(pieces), 0
+    while tail_start > head_end and used + costs[tail_start - 1] <= tail_budget:
+        tail_start -= 1
+        used += costs[tail_start]
+
+    head = "".join(pieces[:head_end]).rstrip()
+    tail = "".join(pieces[tail_start:]).lstrip()
+    return f"{head}{marker}{tail}".strip()